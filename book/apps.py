@@ -1,11 +1,17 @@
 from django.apps import AppConfig
-from elasticsearch_dsl import connections
+from django.conf import settings
+from elasticsearch_dsl import async_connections
 
 class BookConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'book'
 
     def ready(self):
-        connections.create_connection(hosts=["http://localhost:9200"])
-        from book.signals import index_existing_books
-        # index_existing_books()
\ No newline at end of file
+        # ES 연결은 settings.ELASTICSEARCH_DSL 로 django_elasticsearch_dsl 이 구성
+        # 비동기 검색용 async 클라이언트도 같은 설정 사용 (첫 요청 때 이벤트 루프 안에서 생성됨)
+        async_connections.configure(**{
+            alias: {**options, 'connections_per_node': settings.BOOK_SEARCH_ASYNC_CONNECTIONS}
+            for alias, options in settings.ELASTICSEARCH_DSL.items()
+        })
+        from book import signals  # noqa: F401 (시그널 등록)
+        # 기존 데이터 인덱싱은 manage.py reindex_books 사용
@@ -0,0 +1,216 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+
+class GenerationalCache:
+    """
+    세대(generation) 번호로 무효화하는 응답 캐시
+    키에 현재 세대를 포함시키므로 bump() 한 번으로 이전 항목 전체가 무효화되고,
+    남은 항목은 TTL/캐시 백엔드의 크기 제한(LRU)에 따라 자연스럽게 정리됨
+    세대 번호도 같은 캐시에 저장하므로 프로세스 간 무효화에는 공유 캐시 백엔드가 필요 (LocMem 은 프로세스별, TTL 까지 이전 값)
+    """
+
+    stat_names = ('hits', 'misses')
+
+    def __init__(self, namespace, alias, timeout):
+        self.namespace = namespace
+        self.alias = alias
+        self.timeout = timeout
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def _key(self, suffix):
+        return f'{self.namespace}:{suffix}'
+
+    def generation(self):
+        key = self._key('generation')
+        value = self.cache.get(key)
+        if value is None:
+            # 세대 키가 퇴출되어도 이전 세대와 겹치지 않도록 현재 시각(ms)으로 시작
+            self.cache.add(key, int(time.time() * 1000), None)
+            value = self.cache.get(key)
+        return value
+
+    def bump(self):
+        """모든 항목 무효화"""
+        try:
+            self.cache.incr(self._key('generation'))
+        except ValueError:
+            self.generation()
+
+    def make_key(self, params, generation=None):
+        raw = json.dumps(params, sort_keys=True, default=str, separators=(',', ':'))
+        digest = hashlib.sha1(raw.encode('utf-8')).hexdigest()
+        return self._key(f'{generation or self.generation()}:{digest}')
+
+    def get(self, params):
+        value = self.cache.get(self.make_key(params))
+        self.count('hits' if value is not None else 'misses')
+        return value
+
+    def set(self, params, value):
+        self.cache.set(self.make_key(params), value, self.timeout)
+
+    # 비동기 뷰용: 세대 조회/통계 집계까지 여러 번의 캐시 호출을 스레드 한 번으로 실행 (네트워크 캐시여도 이벤트 루프를 막지 않음)
+    # DB 를 쓰지 않으므로 thread_sensitive=False (동기 뷰용 스레드를 기다리지 않음)
+    async def aget(self, params):
+        return await sync_to_async(self.get, thread_sensitive=False)(params)
+
+    async def aset(self, params, value):
+        await sync_to_async(self.set, thread_sensitive=False)(params, value)
+
+    def count(self, name, amount=1):
+        key = self._key(f'stats:{name}')
+        try:
+            self.cache.incr(key, amount)
+        except ValueError:
+            if not self.cache.add(key, amount, None):
+                self.cache.incr(key, amount)
+
+    def stats(self):
+        keys = {name: self._key(f'stats:{name}') for name in self.stat_names}
+        values = self.cache.get_many(list(keys.values()))
+        stats = {name: values.get(key, 0) for name, key in keys.items()}
+        hits = stats['hits'] + stats.get('stale_hits', 0)
+        total = hits + stats['misses']
+        stats['hit_ratio'] = round(hits / total, 4) if total else None
+        stats['generation'] = self.generation()
+        return stats
+
+
+class ListingCache(GenerationalCache):
+    """
+    공개 서적 목록 앞쪽 N 페이지 캐시 (커서/페이지 크기/응답 필드 기준)
+    - 첫 페이지(커서 없음)부터 캐시된 페이지의 next 커서를 따라 pages 번째 페이지까지만 저장
+    - 항목은 timeout 이 지나도 stale_timeout 동안 보관: 한 워커만 락을 잡고 재계산하고 나머지는 이전 값으로 응답
+    - 무효화 직후처럼 값이 아예 없으면 락을 잡은 워커가 계산하는 동안 최대 lock_timeout 초 대기 후 그 결과 사용
+    - refresh_ahead(0~1, 0이면 사용 안 함): timeout 의 이 비율이 지나면 응답은 그대로 하고 백그라운드에서 미리 재계산
+    """
+    stat_names = ('hits', 'stale_hits', 'misses', 'bypass', 'recomputes', 'recompute_us')
+    poll_interval = 0.05
+
+    def __init__(self, namespace, alias, timeout, pages, stale_timeout, lock_timeout, refresh_ahead=0):
+        super().__init__(namespace, alias, timeout)
+        self.pages = pages
+        self.stale_timeout = stale_timeout
+        self.lock_timeout = lock_timeout
+        self.refresh_ahead = refresh_ahead
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    def get_page(self, page, compute):
+        """page: {'cursor', 'page_size', 'fields'}, compute(): 목록 응답 dict ({'next', 'results'}) 계산"""
+        if not self.pages:
+            return compute()
+        generation = self.generation()
+        key, depth_key = self.make_key(page, generation), self.make_key({'depth': page}, generation)
+        values = self.cache.get_many([key, depth_key])
+        depth = 0 if page['cursor'] is None else values.get(depth_key)
+        if depth is None:
+            # 앞쪽 N 페이지 밖 (또는 이전 세대의 커서)
+            self.count('bypass')
+            return compute()
+
+        entry = values.get(key)
+        now = time.time()
+        if entry is not None:
+            if now < entry['expires_at']:
+                self.count('hits')
+                if self.refresh_ahead and now >= entry['refresh_at'] and self._lock(key):
+                    self._background().submit(self._refresh, key, page, depth, generation, compute)
+                return entry['data']
+            if not self._lock(key):
+                self.count('stale_hits')  # 다른 워커가 재계산 중
+                return entry['data']
+            self.count('misses')
+            return self._recompute(key, page, depth, generation, compute)
+
+        if self._lock(key):
+            self.count('misses')
+            return self._recompute(key, page, depth, generation, compute)
+
+        # 다른 워커가 계산 중이면 결과를 기다림 (락이 풀리지 않으면 직접 계산)
+        deadline = now + self.lock_timeout
+        while time.time() < deadline:
+            time.sleep(self.poll_interval)
+            entry = self.cache.get(key)
+            if entry is not None:
+                self.count('hits')
+                return entry['data']
+        self.count('misses')
+        return self._recompute(key, page, depth, generation, compute, locked=False)
+
+    def _lock(self, key):
+        return self.cache.add(f'{key}:lock', 1, self.lock_timeout)
+
+    def _recompute(self, key, page, depth, generation, compute, locked=True):
+        started = time.perf_counter()
+        try:
+            data = compute()
+            self._store(key, page, depth, generation, data)
+        finally:
+            if locked:
+                self.cache.delete(f'{key}:lock')
+        self.count('recomputes')
+        self.count('recompute_us', int((time.perf_counter() - started) * 1_000_000))
+        return data
+
+    def _store(self, key, page, depth, generation, data):
+        now = time.time()
+        entry = {
+            'data': data,
+            'expires_at': now + self.timeout,
+            'refresh_at': now + self.timeout * self.refresh_ahead,
+        }
+        values = {key: entry}
+        if data.get('next') and depth + 1 < self.pages:
+            # 다음 페이지도 캐시 대상으로 표시
+            values[self.make_key({'depth': {**page, 'cursor': data['next']}}, generation)] = depth + 1
+        self.cache.set_many(values, self.timeout + self.stale_timeout)
+
+    def _refresh(self, key, page, depth, generation, compute):
+        close_old_connections()
+        try:
+            self._recompute(key, page, depth, generation, compute)
+        except Exception:
+            logger.exception("목록 캐시 미리 갱신 실패: %s", page)
+        finally:
+            close_old_connections()
+
+    def _background(self):
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='listing-cache-refresh')
+        return self._executor
+
+    def stats(self):
+        stats = super().stats()
+        total_ms = stats.pop('recompute_us') / 1000
+        stats['recompute_ms_avg'] = round(total_ms / stats['recomputes'], 2) if stats['recomputes'] else None
+        return stats
+
+
+# 검색 결과 캐시 (정규화된 검색 파라미터 기준)
+search_cache = GenerationalCache('book-search', settings.BOOK_SEARCH_CACHE_ALIAS, settings.BOOK_SEARCH_CACHE_TIMEOUT)
+
+# 공개 서적 목록 앞쪽 페이지 캐시
+listing_cache = ListingCache(
+    'book-listing', settings.BOOK_LISTING_CACHE_ALIAS, settings.BOOK_LISTING_CACHE_TIMEOUT,
+    pages=settings.BOOK_LISTING_CACHE_PAGES,
+    stale_timeout=settings.BOOK_LISTING_CACHE_STALE_TIMEOUT,
+    lock_timeout=settings.BOOK_LISTING_CACHE_LOCK_TIMEOUT,
+    refresh_ahead=settings.BOOK_LISTING_CACHE_REFRESH_AHEAD,
+)
@@ -0,0 +1,120 @@
+import atexit
+import logging
+import threading
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import F
+from .models import Book
+
+logger = logging.getLogger(__name__)
+
+VIEW = 'view_count'
+INTEREST = 'interest_count'
+
+
+class CounterBuffer:
+    """
+    서적 조회수/관심 수 증가분을 프로세스 메모리에 합산해 두었다가 주기적으로 DB 에 일괄 반영
+    - 조회 요청마다 Book 행을 UPDATE 하지 않음 (가장 많이 읽히는 테이블의 행 락/쓰기 부하 방지)
+    - 반영은 (필드, 증가량)이 같은 서적끼리 묶어 UPDATE ... SET n = n + k WHERE id IN (...) 한 번씩
+    - 백그라운드 스레드는 서버 프로세스(config.asgi/wsgi)에서 start() 한 경우에만 실행,
+      그 외 프로세스는 max_pending 에 도달하면 호출한 스레드에서 반영
+    - 마지막 반영 이후 증가분은 프로세스가 비정상 종료되면 유실 (근사치 카운터)
+    """
+
+    def __init__(self, flush_interval, max_pending, chunk_size=500):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.chunk_size = chunk_size
+        self.enabled = False
+        self._pending = {}  # (필드, 서적 id) -> 증가량
+        self._lock = threading.Lock()
+        self._thread = None
+        self._thread_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+
+    def incr(self, book_id, field, amount=1):
+        with self._lock:
+            key = (field, book_id)
+            self._pending[key] = self._pending.get(key, 0) + amount
+            full = len(self._pending) >= self.max_pending
+        if self.enabled:
+            self._ensure_started()
+            if full:
+                self._wakeup.set()
+        elif full:
+            self.flush()
+
+    def view(self, book_id):
+        self.incr(book_id, VIEW)
+
+    def interest(self, book_id, amount=1):
+        self.incr(book_id, INTEREST, amount)
+
+    def flush(self):
+        """모인 증가분 반영, 반영한 (필드, 서적) 수 반환 - 실패한 묶음은 다음 반영 때 다시 시도"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        groups = {}
+        for (field, book_id), amount in pending.items():
+            if amount:
+                groups.setdefault((field, amount), []).append(book_id)
+
+        remaining = {key: amount for key, amount in pending.items() if amount}  # 아직 반영하지 않은 증가분
+        try:
+            for (field, amount), book_ids in groups.items():
+                for start in range(0, len(book_ids), self.chunk_size):
+                    chunk = book_ids[start:start + self.chunk_size]
+                    Book.all_objects.filter(pk__in=chunk).update(**{field: F(field) + amount})
+                    for book_id in chunk:
+                        del remaining[(field, book_id)]
+        except Exception:
+            with self._lock:
+                for key, amount in remaining.items():
+                    self._pending[key] = self._pending.get(key, 0) + amount
+            raise
+        return sum(len(book_ids) for book_ids in groups.values())
+
+    def start(self):
+        """서버 프로세스에서 호출: 이후 증가분을 백그라운드 스레드가 flush_interval 마다 반영"""
+        self.enabled = True
+        atexit.register(self.stop)
+
+    def _ensure_started(self):
+        # 포크된 워커 프로세스에서는 스레드가 없으므로 첫 증가 때 다시 시작
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='book-counters', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self._flush_in_background()
+        self._flush_in_background()  # 종료 시 남은 증가분
+
+    def _flush_in_background(self):
+        close_old_connections()
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("counter flush failed")
+        finally:
+            close_old_connections()
+
+    def stop(self, timeout=5):
+        """프로세스 종료 시 남은 증가분 반영"""
+        self._stopping.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+book_counters = CounterBuffer(
+    flush_interval=settings.BOOK_COUNTER_FLUSH_INTERVAL,
+    max_pending=settings.BOOK_COUNTER_MAX_PENDING,
+)
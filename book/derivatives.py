@@ -0,0 +1,85 @@
+import io
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from PIL import Image, ImageOps
+from .models import Book, BookImage
+from .signals import books_updated
+from .storage import get_s3_client, key_from_url, object_url
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.BOOK_DERIVATIVE_WORKERS, thread_name_prefix='image-derivative'
+                )
+    return _executor
+
+
+def schedule_derivatives(book_id):
+    """커밋 후 백그라운드에서 서적 이미지 파생본 생성 (요청은 기다리지 않음)"""
+    transaction.on_commit(lambda: get_executor().submit(process_book_images, book_id))
+
+
+def process_book_images(book_id):
+    """아직 파생본이 없는 서적 이미지를 처리"""
+    close_old_connections()
+    try:
+        for image in BookImage.objects.filter(book_id=book_id, thumbnail_url__isnull=True):
+            try:
+                process_image(image)
+            except Exception:
+                logger.exception("이미지 파생본 생성 실패: BookImage %s", image.pk)
+
+        # 응답 내용(이미지 URL/크기)이 바뀌었으므로 수정 시각 갱신 (조건부 GET 검증자)
+        Book.objects.filter(pk=book_id).update(updated_at=timezone.now())
+        # update()는 시그널을 보내지 않으므로 PATCH 와 같은 경로로 색인/메모리 인덱스/응답 캐시 갱신
+        books_updated([book_id])
+    finally:
+        close_old_connections()
+
+
+def process_image(image):
+    """원본을 내려받아 크기 기록 + WebP 썸네일/중간 크기 이미지 업로드"""
+    key = key_from_url(image.image_url)
+    if key is None:
+        logger.warning("버킷 외부 이미지는 건너뜀: %s", image.image_url)
+        return
+
+    s3 = get_s3_client()
+    body = s3.get_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=key)['Body'].read()
+    with Image.open(io.BytesIO(body)) as original:
+        original = ImageOps.exif_transpose(original)  # 휴대폰 사진 회전 정보 반영
+        width, height = original.size
+        if original.mode not in ('RGB', 'RGBA'):
+            original = original.convert('RGBA' if 'transparency' in original.info else 'RGB')
+
+        urls = {}
+        base = key.rsplit('.', 1)[0].replace('image/', 'image/derivatives/', 1)
+        for name, max_size in settings.BOOK_IMAGE_DERIVATIVES.items():
+            derivative = original.copy()
+            derivative.thumbnail((max_size, max_size), Image.LANCZOS)
+            buffer = io.BytesIO()
+            derivative.save(buffer, format='WEBP', quality=80, method=4)
+            buffer.seek(0)
+            derivative_key = f"{base}_{name}.webp"
+            s3.upload_fileobj(
+                buffer, Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=derivative_key,
+                ExtraArgs={'ContentType': 'image/webp', 'CacheControl': 'public, max-age=31536000, immutable'},
+            )
+            urls[name] = object_url(derivative_key)
+
+    BookImage.objects.filter(pk=image.pk).update(
+        width=width, height=height, thumbnail_url=urls.get('thumbnail'), medium_url=urls.get('medium'),
+    )
@@ -0,0 +1,166 @@
+import atexit
+import logging
+import queue
+import threading
+import time
+from django.conf import settings
+from django.db import close_old_connections
+from elasticsearch.helpers import bulk
+from .cache import search_cache
+from .search import BookDocument
+
+logger = logging.getLogger(__name__)
+deadletter_logger = logging.getLogger('book.indexer.deadletter')
+
+INDEX = 'index'
+DELETE = 'delete'
+
+
+class BookIndexer:
+    """
+    서적 인덱싱 요청을 프로세스 내 큐에 모았다가 백그라운드 스레드에서 bulk 로 전송
+    - 요청 스레드는 큐에 넣기만 하므로 ES 장애/지연과 무관
+    - 같은 서적에 대한 연속 변경은 마지막 동작 하나로 합침
+    - 실패 항목(요청 생성 실패 포함)은 지수 백오프로 재시도, 끝내 실패한 항목만 dead-letter 로그에 기록
+    """
+
+    def __init__(self, batch_size, flush_interval, max_retries, retry_backoff, queue_size):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+
+    def enqueue(self, action, book_id):
+        if not settings.BOOK_INDEXER_ENABLED:
+            return
+        self._ensure_started()
+        try:
+            self.queue.put_nowait((action, book_id))
+        except queue.Full:
+            deadletter_logger.error("indexer queue full: action=%s book_id=%s", action, book_id)
+
+    def index(self, book_id):
+        self.enqueue(INDEX, book_id)
+
+    def delete(self, book_id):
+        self.enqueue(DELETE, book_id)
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='book-indexer', daemon=True)
+                self._thread.start()
+                atexit.register(self.stop)
+
+    def _collect(self):
+        """batch_size 개가 모이거나 첫 항목 이후 flush_interval 이 지나면 반환"""
+        pending = {}
+        deadline = None
+        while len(pending) < self.batch_size:
+            # 대기 중에도 주기적으로 깨어나 종료 요청을 확인
+            timeout = self.flush_interval if deadline is None else deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            if self._stopping.is_set():
+                timeout = 0
+            try:
+                action, book_id = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            pending[book_id] = action  # 같은 서적은 마지막 요청으로 덮어씀
+            if deadline is None:
+                deadline = time.monotonic() + self.flush_interval
+        return pending
+
+    def _run(self):
+        while not (self._stopping.is_set() and self.queue.empty()):
+            pending = self._collect()
+            if not pending:
+                continue
+            try:
+                self.flush(pending)
+            except Exception:
+                logger.exception("indexer flush failed")
+                for book_id, action in pending.items():
+                    deadletter_logger.error("indexer flush failed: action=%s book_id=%s", action, book_id)
+            finally:
+                close_old_connections()
+
+    def build_actions(self, pending):
+        document = BookDocument()
+        index_name = document._index._name
+        index_ids = [book_id for book_id, action in pending.items() if action == INDEX]
+        books = {book.pk: book for book in document.get_queryset().filter(pk__in=index_ids)}
+
+        actions = []
+        for book_id, action in pending.items():
+            book = books.get(book_id)
+            if action == INDEX and book is not None:
+                actions.append({'_op_type': 'index', '_index': index_name, '_id': book_id, '_source': document.prepare(book)})
+            else:
+                # 삭제되었거나 인덱싱 전에 사라진 서적
+                actions.append({'_op_type': 'delete', '_index': index_name, '_id': book_id})
+        return actions
+
+    def send(self, client, pending):
+        """pending 한 번 전송 -> 실패한 {서적 id: 오류} (DB 조회/요청 생성 실패도 전체 실패로 반환)"""
+        try:
+            actions = self.build_actions(pending)
+        except Exception as e:
+            logger.warning("indexer build_actions failed: %s", e)
+            close_old_connections()  # 끊긴 DB 연결이면 다음 시도에서 다시 연결
+            return {book_id: str(e) for book_id in pending}
+        try:
+            _, errors = bulk(client, actions, raise_on_error=False, refresh='wait_for')
+        except Exception as e:
+            logger.warning("indexer bulk request failed: %s", e)
+            return {book_id: str(e) for book_id in pending}
+
+        failed = {}
+        for error in errors:
+            op_type, item = next(iter(error.items()))
+            if op_type == 'delete' and item.get('status') == 404:
+                continue  # 이미 없는 문서
+            failed[str(item.get('_id'))] = item.get('error') or item.get('status')
+        return {book_id: failed[str(book_id)] for book_id in pending if str(book_id) in failed}
+
+    def flush(self, pending):
+        """
+        실패한 서적만 지수 백오프로 재시도 (재시도마다 DB 에서 다시 읽어 요청 생성)
+        max_retries 후에도 실패한 서적만 dead-letter 로그에 기록
+        """
+        client = BookDocument._get_connection()
+        for attempt in range(self.max_retries + 1):
+            failed = self.send(client, pending)
+            if not failed:
+                break
+            pending = {book_id: pending[book_id] for book_id in failed}
+            if attempt < self.max_retries:
+                time.sleep(self.retry_backoff * (2 ** attempt))
+        else:
+            for book_id, error in failed.items():
+                deadletter_logger.error("indexing gave up: op=%s book_id=%s error=%s", pending[book_id], book_id, error)
+
+        # 인덱스 반영(refresh) 이후 검색 결과 캐시 무효화
+        search_cache.bump()
+
+    def stop(self, timeout=5):
+        """프로세스 종료 시 남은 항목 전송"""
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+book_indexer = BookIndexer(
+    batch_size=settings.BOOK_INDEXER_BATCH_SIZE,
+    flush_interval=settings.BOOK_INDEXER_FLUSH_INTERVAL,
+    max_retries=settings.BOOK_INDEXER_MAX_RETRIES,
+    retry_backoff=settings.BOOK_INDEXER_RETRY_BACKOFF,
+    queue_size=settings.BOOK_INDEXER_QUEUE_SIZE,
+)
@@ -0,0 +1,19 @@
+import statistics
+
+
+def percentile(samples, pct):
+    """정렬된 표본에서 pct(0~100) 백분위 값"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize_ms(samples):
+    """초 단위 표본 -> p50/p99/mean (ms)"""
+    return {
+        'p50': percentile(samples, 50) * 1000,
+        'p99': percentile(samples, 99) * 1000,
+        'mean': statistics.fmean(samples) * 1000 if samples else 0.0,
+    }
@@ -0,0 +1,54 @@
+from unittest import mock
+from django.db import connection, transaction
+from django.core.management.base import BaseCommand
+from django.test.utils import CaptureQueriesContext
+from book.indexer import book_indexer
+from book.models import Book, BookImage
+from book.serializers import BookCreateSerializer
+from users.models import User
+
+
+class Rollback(Exception):
+    pass
+
+
+def legacy_create(data, seller, image_urls):
+    """기존 방식: 서적 INSERT 후 이미지마다 INSERT (트랜잭션 없음)"""
+    book = Book.objects.create(seller=seller, **data)
+    for url in image_urls:
+        BookImage.objects.create(book=book, image_url=url)
+
+
+def bulk_create(data, seller, image_urls):
+    """현재 방식: BookCreateSerializer (단일 트랜잭션 + bulk INSERT)"""
+    serializer = BookCreateSerializer(data={**data, 'images': image_urls})
+    serializer.is_valid(raise_exception=True)
+    serializer.save(seller=seller)
+
+
+class Command(BaseCommand):
+    help = "서적 한 권 등록 시 이미지 개수별 DB 왕복(쿼리) 수 측정 (모든 변경은 롤백됨)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--images', default='1,3,5,10', help='이미지 개수 목록 (쉼표 구분)')
+
+    def handle(self, *args, **options):
+        counts = [int(n) for n in options['images'].split(',')]
+        data = {'title': '벤치마크', 'chatLink': 'https://open.kakao.com/o/bench', 'price': 10000, 'major': '컴퓨터공학과'}
+
+        self.stdout.write(f"{'images':>6} {'mode':>8} {'queries':>8} {'inserts':>8}")
+        for count in counts:
+            image_urls = [f'https://bucket.s3.amazonaws.com/image/bench_{i}.jpg' for i in range(count)]
+            for mode, create in (('legacy', legacy_create), ('bulk', bulk_create)):
+                # 검색 인덱싱은 DB 왕복 측정 대상이 아니므로 제외 (커밋 후 색인 큐에 넣는 호출을 막음)
+                try:
+                    with mock.patch.object(book_indexer, 'index'), transaction.atomic():
+                        seller = User.objects.create_user('bench@tukorea.ac.kr', '벤치', 'bench-0000', '컴퓨터공학과')
+                        with CaptureQueriesContext(connection) as ctx:
+                            create(data, seller, image_urls)
+                        raise Rollback
+                except Rollback:
+                    pass
+                # 테스트 환경의 SAVEPOINT/RELEASE 는 실제 요청에서 BEGIN/COMMIT 에 해당
+                inserts = sum(1 for query in ctx.captured_queries if query['sql'].lstrip().upper().startswith('INSERT'))
+                self.stdout.write(f"{count:>6} {mode:>8} {len(ctx.captured_queries):>8} {inserts:>8}")
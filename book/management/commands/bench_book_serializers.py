@@ -0,0 +1,73 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from book.models import Book, BookImage
+from book.rows import BookRowSerializer
+from book.serializers import BookSerializer
+from users.models import User
+from ._utils import summarize_ms
+
+
+class Rollback(Exception):
+    pass
+
+
+def drf_serializer(queryset):
+    """기존 방식: 모델 인스턴스 + BookSerializer (필드별 DRF 처리)"""
+    return BookSerializer(queryset.with_related(), many=True).data
+
+
+def row_serializer(fields):
+    def serialize(queryset):
+        rows = BookRowSerializer(fields)
+        return rows.serialize(rows.queryset(queryset))
+    return serialize
+
+
+class Command(BaseCommand):
+    help = "서적 목록 직렬화 비교 (조회 + 직렬화, 합성 데이터는 롤백됨): BookSerializer vs BookRowSerializer(.values())"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000)
+        parser.add_argument('--images', type=int, default=2, help='서적당 이미지 수')
+        parser.add_argument('--iterations', type=int, default=5)
+
+    def handle(self, *args, **options):
+        modes = [
+            ('drf', drf_serializer),
+            ('rows', row_serializer(None)),
+            ('rows:sparse', row_serializer(['id', 'title', 'price', 'thumbnail'])),
+        ]
+        try:
+            with transaction.atomic():
+                seller = self.create_books(options['rows'], options['images'])
+                self.stdout.write(f"{'mode':>12} {'p50(ms)':>10} {'p99(ms)':>10} {'mean(ms)':>10} {'rows/sec':>10}")
+                for mode, serialize in modes:
+                    samples = []
+                    for _ in range(options['iterations']):
+                        started = time.perf_counter()
+                        data = serialize(Book.objects.filter(seller=seller).order_by('-created_at', '-id'))
+                        samples.append(time.perf_counter() - started)
+                    assert len(data) == options['rows']
+                    stats = summarize_ms(samples)
+                    self.stdout.write(
+                        f"{mode:>12} {stats['p50']:>10.1f} {stats['p99']:>10.1f} {stats['mean']:>10.1f} "
+                        f"{options['rows'] / (stats['mean'] / 1000):>10.0f}"
+                    )
+                raise Rollback
+        except Rollback:
+            pass
+
+    def create_books(self, total, images):
+        # bulk_create 는 시그널(인덱싱/요약)을 보내지 않음
+        seller = User.objects.create_user('bench@tukorea.ac.kr', '벤치', 'bench-0000', '컴퓨터공학과')
+        books = Book.objects.bulk_create([
+            Book(title=f'벤치마크 {i}', chatLink='https://open.kakao.com/o/bench', price=1000 + i,
+                 description='설명 ' * 100, major='컴퓨터공학과', seller=seller)
+            for i in range(total)
+        ], batch_size=1000)
+        BookImage.objects.bulk_create([
+            BookImage(book=book, image_url=f'https://bucket.s3.amazonaws.com/image/{book.pk}_{n}.jpg')
+            for book in books for n in range(images)
+        ], batch_size=1000)
+        return seller
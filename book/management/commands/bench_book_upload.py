@@ -0,0 +1,59 @@
+import io
+import os
+import time
+from uuid import uuid4
+import boto3
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand, CommandError
+from book.storage import get_s3_client, upload_images
+from ._utils import summarize_ms
+
+
+def legacy_upload(files):
+    """기존 방식: 요청마다 클라이언트 생성 + BytesIO 복사 + 순차 업로드"""
+    s3 = boto3.client(
+        "s3",
+        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+        region_name=settings.AWS_S3_REGION_NAME,
+        endpoint_url=settings.AWS_S3_ENDPOINT_URL,
+    )
+    for file in files:
+        file_stream = io.BytesIO(file.read())
+        file_stream.seek(0)
+        s3.upload_fileobj(file_stream, Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=f"image/{uuid4()}_{file.name}")
+
+
+class Command(BaseCommand):
+    help = "로컬 S3 호환 서버(MinIO, moto_server 등)를 대상으로 이미지 개수별 서적 등록 업로드 지연(p50/p99) 측정"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--images', default='1,3,5,10', help='이미지 개수 목록 (쉼표 구분)')
+        parser.add_argument('--iterations', type=int, default=20, help='개수별 반복 횟수')
+        parser.add_argument('--size-kb', type=int, default=500, help='이미지 한 장 크기(KB)')
+
+    def handle(self, *args, **options):
+        if not settings.AWS_S3_ENDPOINT_URL:
+            raise CommandError("AWS_S3_ENDPOINT_URL 을 로컬 S3 호환 서버로 지정한 뒤 실행하세요. (실제 버킷 보호)")
+
+        s3 = get_s3_client()
+        try:
+            s3.head_bucket(Bucket=settings.AWS_STORAGE_BUCKET_NAME)
+        except s3.exceptions.ClientError:
+            s3.create_bucket(Bucket=settings.AWS_STORAGE_BUCKET_NAME)
+
+        payload = os.urandom(options['size_kb'] * 1024)
+        counts = [int(n) for n in options['images'].split(',')]
+
+        self.stdout.write(f"{'images':>6} {'mode':>8} {'p50(ms)':>10} {'p99(ms)':>10} {'mean(ms)':>10}")
+        for count in counts:
+            for mode, upload in (('legacy', legacy_upload), ('pooled', upload_images)):
+                samples = []
+                for _ in range(options['iterations']):
+                    files = [SimpleUploadedFile(f'bench_{i}.jpg', payload, content_type='image/jpeg') for i in range(count)]
+                    started = time.perf_counter()
+                    upload(files)
+                    samples.append(time.perf_counter() - started)
+                stats = summarize_ms(samples)
+                self.stdout.write(f"{count:>6} {mode:>8} {stats['p50']:>10.1f} {stats['p99']:>10.1f} {stats['mean']:>10.1f}")
@@ -0,0 +1,99 @@
+import time
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from config.middleware import COMPRESSORS, compress_bytes
+from config.renderers import FastJSONRenderer, orjson
+from ._utils import summarize_ms
+
+
+def book_listing(total):
+    """BookRowSerializer 기본 출력과 같은 형태의 서적 목록 (커서 페이지 응답)"""
+    now = timezone.now()
+    return {
+        'next': 'cD0yMDI0LTAxLTAxKzAwJTNBMDAlM0EwMC4wMDAwMDAlMkIwMCUzQTAw',
+        'previous': None,
+        'results': [{
+            'id': i,
+            'title': f'운영체제 {i}판',
+            'chatLink': 'https://open.kakao.com/o/bench',
+            'price': 10000 + i,
+            'description': '필기 조금 있고 상태 좋습니다. ' * 10,
+            'major': '컴퓨터공학과',
+            'status': 'FOR_SALE',
+            'created_at': now - timedelta(minutes=i),
+            'updated_at': now,
+            'seller': i % 50 + 1,
+            'seller_name': f'판매자{i % 50}',
+            'view_count': i * 7 % 500,
+            'interest_count': i % 9,
+            'images': [{
+                'image_url': f'https://bucket.s3.amazonaws.com/image/{i}_{n}.jpg',
+                'thumbnail_url': f'https://bucket.s3.amazonaws.com/image/thumb/{i}_{n}.webp',
+                'medium_url': f'https://bucket.s3.amazonaws.com/image/medium/{i}_{n}.webp',
+                'width': 1280,
+                'height': 960,
+            } for n in range(2)],
+        } for i in range(total)],
+    }
+
+
+def message_history(total):
+    """get_chatroom_messages 응답과 같은 형태의 채팅 기록"""
+    now = timezone.now()
+    return {
+        'chatroom_id': 1,
+        'opponent_name': '판매자',
+        'messages': [{
+            'sender': '나' if i % 2 else '판매자',
+            'content': f'안녕하세요, 책 아직 있나요? ({i})',
+            'time': now - timedelta(seconds=total - i),
+        } for i in range(total)],
+    }
+
+
+class Command(BaseCommand):
+    help = "JSON 렌더링 시간(DRF JSONRenderer vs FastJSONRenderer)과 압축 후 전송 크기(raw/gzip/br) 비교 (합성 데이터, DB 미사용)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20)
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stdout.write(self.style.WARNING("orjson 미설치: FastJSONRenderer 가 DRF JSONRenderer 로 동작합니다."))
+        payloads = [
+            ('books:1k', book_listing(1000)),
+            ('books:10k', book_listing(10000)),
+            ('messages:5k', message_history(5000)),
+        ]
+        renderers = [('drf', JSONRenderer()), ('fast', FastJSONRenderer())]
+
+        self.stdout.write(f"{'payload':>12} {'renderer':>8} {'p50(ms)':>10} {'p99(ms)':>10} {'mean(ms)':>10}")
+        for name, data in payloads:
+            for renderer_name, renderer in renderers:
+                samples = []
+                for _ in range(options['iterations']):
+                    started = time.perf_counter()
+                    renderer.render(data)
+                    samples.append(time.perf_counter() - started)
+                stats = summarize_ms(samples)
+                self.stdout.write(
+                    f"{name:>12} {renderer_name:>8} {stats['p50']:>10.1f} {stats['p99']:>10.1f} {stats['mean']:>10.1f}"
+                )
+
+        self.stdout.write('')
+        self.stdout.write(f"{'payload':>12} {'encoding':>8} {'bytes':>10} {'ratio':>7} {'mean(ms)':>10}")
+        for name, data in payloads:
+            content = FastJSONRenderer().render(data)
+            self.stdout.write(f"{name:>12} {'raw':>8} {len(content):>10} {1:>7.2f} {0:>10.1f}")
+            for coding in COMPRESSORS:
+                samples = []
+                for _ in range(max(1, options['iterations'] // 4)):
+                    started = time.perf_counter()
+                    compressed = compress_bytes(coding, content)
+                    samples.append(time.perf_counter() - started)
+                self.stdout.write(
+                    f"{name:>12} {coding:>8} {len(compressed):>10} {len(compressed) / len(content):>7.2f} "
+                    f"{summarize_ms(samples)['mean']:>10.1f}"
+                )
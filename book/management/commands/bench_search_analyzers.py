@@ -0,0 +1,91 @@
+import random
+import time
+from django.core.management.base import BaseCommand
+from elasticsearch.helpers import bulk
+from book.search import ANALYZER_PROFILES, INDEX_SETTINGS, BookDocument, build_book_search
+from ._utils import summarize_ms
+
+WORDS = [
+    '자료구조', '알고리즘', '운영체제', '데이터베이스', '컴퓨터', '네트워크', '미적분학', '선형대수', '확률', '통계',
+    '경영학', '회계원리', '마케팅', '전자회로', '신호', '시스템', '디지털', '논리', '설계', '기계', '열역학', '유체역학',
+    '재료', '역학', 'java', 'python', 'C언어', 'introduction', 'programming', 'engineering', 'calculus', 'physics',
+]
+MAJORS = ['컴퓨터공학과', '전자공학부', '기계공학과', '경영학부', '디자인공학부', '신소재공학과', '생명화학공학과', '에너지전기공학과']
+
+
+def synthetic_book(book_id, rng):
+    return {
+        'id': book_id,
+        'title': ' '.join(rng.choices(WORDS, k=rng.randint(2, 5))),
+        'description': ' '.join(rng.choices(WORDS, k=rng.randint(50, 200))),
+        'major': rng.choice(MAJORS),
+        'price': rng.randint(1, 60) * 1000,
+        'status': rng.choice(['FOR_SALE', 'IN_PROGRESS', 'COMPLETED']),
+    }
+
+
+def profile_mapping(profile):
+    analyzers = ANALYZER_PROFILES[profile]
+    return {
+        'properties': {
+            'id': {'type': 'long'},
+            'title': {'type': 'text', **analyzers['title']},
+            'description': {'type': 'text', **analyzers['description']},
+            'major': {'type': 'text', **analyzers['major'], 'fields': {'raw': {'type': 'keyword'}}},
+            'price': {'type': 'integer'},
+            'status': {'type': 'keyword'},
+        }
+    }
+
+
+class Command(BaseCommand):
+    help = "분석기 프로필별 인덱스 크기, 색인 처리량, 검색 지연(p50/p99)을 합성 데이터로 측정 (임시 인덱스 사용)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--profiles', default=','.join(ANALYZER_PROFILES))
+        parser.add_argument('--docs', type=int, default=20000)
+        parser.add_argument('--queries', type=int, default=500)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--keep', action='store_true', help='측정 후 임시 인덱스를 삭제하지 않음')
+
+    def handle(self, *args, **options):
+        client = BookDocument._get_connection()
+        rng = random.Random(options['seed'])
+        corpus = [synthetic_book(i, rng) for i in range(1, options['docs'] + 1)]
+        # 실제 검색창 입력처럼 단어 앞부분/두 단어 조합을 섞어서 사용
+        queries = [
+            rng.choice(WORDS)[:rng.randint(1, 4)] if rng.random() < 0.5 else ' '.join(rng.choices(WORDS, k=2))
+            for _ in range(options['queries'])
+        ]
+
+        self.stdout.write(
+            f"{'profile':>8} {'size(MB)':>9} {'docs/sec':>9} {'q p50(ms)':>10} {'q p99(ms)':>10} {'q mean(ms)':>11}"
+        )
+        for profile in options['profiles'].split(','):
+            index = f'books-bench-{profile}'
+            client.indices.delete(index=index, ignore_unavailable=True)
+            client.indices.create(index=index, settings=INDEX_SETTINGS, mappings=profile_mapping(profile))
+            try:
+                started = time.perf_counter()
+                bulk(client, ({'_index': index, '_id': doc['id'], '_source': doc} for doc in corpus), chunk_size=1000)
+                client.indices.refresh(index=index)
+                throughput = len(corpus) / (time.perf_counter() - started)
+
+                client.indices.forcemerge(index=index, max_num_segments=1)
+                size = client.indices.stats(index=index, metric='store')['indices'][index]['total']['store']['size_in_bytes']
+
+                samples = []
+                for query in queries:
+                    params = {'q': query, 'sort': 'relevance', 'size': 20}
+                    search = build_book_search(params).index().index(index).params(request_cache=False)
+                    started = time.perf_counter()
+                    search.execute()
+                    samples.append(time.perf_counter() - started)
+                stats = summarize_ms(samples)
+                self.stdout.write(
+                    f"{profile:>8} {size / 1024 / 1024:>9.1f} {throughput:>9.0f} "
+                    f"{stats['p50']:>10.1f} {stats['p99']:>10.1f} {stats['mean']:>11.1f}"
+                )
+            finally:
+                if not options['keep']:
+                    client.indices.delete(index=index, ignore_unavailable=True)
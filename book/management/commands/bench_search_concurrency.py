@@ -0,0 +1,85 @@
+import asyncio
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from elasticsearch_dsl import async_connections
+from book.search_backends import ElasticsearchBackend
+from .bench_search_analyzers import WORDS
+from ._utils import summarize_ms
+
+
+class Command(BaseCommand):
+    help = (
+        "동시 검색 수별 처리량/지연 비교 (실제 ES 대상): "
+        "sync = 동기 클라이언트를 스레드 풀에서 실행 (ASGI에서 동기 뷰가 동작하는 방식), "
+        "async = async 클라이언트를 이벤트 루프에서 실행 (BookSearchView)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', default='50,200,1000', help='동시 요청 수 목록 (쉼표 구분)')
+        parser.add_argument('--requests', type=int, default=5, help='동시 요청 1개당 반복 횟수')
+        parser.add_argument(
+            '--threads', type=int, default=int(os.getenv('ASGI_THREADS', min(32, (os.cpu_count() or 1) + 4))),
+            help='sync 모드 스레드 풀 크기 (asgiref 기본값과 동일)',
+        )
+        parser.add_argument('--hedge-delay', type=float, default=None, help='async 모드 hedged 요청 지연(초)')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        self.queries = [rng.choice(WORDS)[:rng.randint(1, 4)] for _ in range(1000)]
+        # 측정 중 타임아웃으로 실패하지 않도록 넉넉하게
+        self.backend = ElasticsearchBackend(timeouts={'search': 30, 'suggest': 30}, hedge_delay=options['hedge_delay'])
+
+        # async 클라이언트는 생성된 이벤트 루프에 묶이므로 전체 측정을 한 루프에서 실행
+        asyncio.run(self.main(options))
+
+    async def main(self, options):
+        self.stdout.write(
+            f"{'concurrency':>11} {'mode':>6} {'req/sec':>9} {'p50(ms)':>10} {'p99(ms)':>10} {'errors':>7}"
+        )
+        try:
+            for concurrency in (int(n) for n in options['concurrency'].split(',')):
+                for mode in ('sync', 'async'):
+                    total = concurrency * options['requests']
+                    samples, errors, elapsed = await self.run(mode, concurrency, total, options['threads'])
+                    stats = summarize_ms(samples)
+                    self.stdout.write(
+                        f"{concurrency:>11} {mode:>6} {len(samples) / elapsed:>9.0f} "
+                        f"{stats['p50']:>10.1f} {stats['p99']:>10.1f} {errors:>7}"
+                    )
+        finally:
+            await async_connections.get_connection().close()
+
+    async def run(self, mode, concurrency, total, threads):
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(max_workers=threads)
+        samples, errors = [], 0
+
+        async def search(i):
+            params = {'q': self.queries[i % len(self.queries)], 'sort': 'relevance', 'size': settings.BOOK_PAGE_SIZE}
+            if mode == 'sync':
+                await loop.run_in_executor(executor, self.backend.search, params)
+            else:
+                await self.backend.asearch(params)
+
+        async def worker(worker_id):
+            nonlocal errors
+            for i in range(worker_id, total, concurrency):
+                started = time.perf_counter()
+                try:
+                    await search(i)
+                except Exception:
+                    errors += 1
+                else:
+                    samples.append(time.perf_counter() - started)  # 대기 시간 포함 (사용자 체감 지연)
+
+        started = time.perf_counter()
+        try:
+            await asyncio.gather(*(worker(n) for n in range(concurrency)))
+        finally:
+            executor.shutdown()
+        return samples, errors, time.perf_counter() - started
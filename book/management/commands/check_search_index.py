@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand
+from django.utils.dateparse import parse_datetime
+from book.models import Book
+from book.search import BookDocument
+
+# DB 값과 비교할 문서 필드
+COMPARED_FIELDS = ['price', 'status', 'updated_at']
+
+
+class Command(BaseCommand):
+    help = "Elasticsearch 서적 인덱스와 DB 사이의 누락/잔존/불일치 문서 검사 (--fix 로 복구)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fix', action='store_true', help='누락/불일치 문서 재인덱싱, 잔존 문서 삭제')
+        parser.add_argument('--chunk-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        # 인덱스 전체를 scroll 로 읽어 비교 필드만 보관
+        indexed = {}
+        for hit in BookDocument.search().source(COMPARED_FIELDS).params(size=options['chunk_size']).scan():
+            source = hit.to_dict()
+            indexed[int(hit.meta.id)] = (
+                source.get('price'), source.get('status'), parse_datetime(source.get('updated_at') or ''),
+            )
+
+        missing, stale = [], []
+        last_id = 0
+        while True:
+            rows = list(
+                Book.objects.filter(id__gt=last_id).order_by('id')
+                .values_list('id', *COMPARED_FIELDS)[:options['chunk_size']]
+            )
+            if not rows:
+                break
+            for book_id, *values in rows:
+                document = indexed.pop(book_id, None)
+                if document is None:
+                    missing.append(book_id)
+                elif document != tuple(values):
+                    stale.append(book_id)
+            last_id = rows[-1][0]
+        orphaned = sorted(indexed)  # DB 에는 없는데 인덱스에 남은 문서
+
+        self.stdout.write(f"누락: {len(missing)}건 {missing[:20]}")
+        self.stdout.write(f"불일치: {len(stale)}건 {stale[:20]}")
+        self.stdout.write(f"잔존: {len(orphaned)}건 {orphaned[:20]}")
+
+        if options['fix']:
+            document = BookDocument()
+            outdated = missing + stale
+            for start in range(0, len(outdated), options['chunk_size']):
+                books = document.get_queryset().filter(id__in=outdated[start:start + options['chunk_size']])
+                document.update(books)
+            for book_id in orphaned:
+                document._get_connection().delete(index=document._index._name, id=book_id, ignore=[404])
+            self.stdout.write(self.style.SUCCESS(f"{len(outdated)}건 재인덱싱, {len(orphaned)}건 삭제"))
+        elif missing or stale or orphaned:
+            self.stdout.write(self.style.WARNING("인덱스와 DB가 일치하지 않습니다. --fix 로 복구하세요."))
+        else:
+            self.stdout.write(self.style.SUCCESS("인덱스와 DB가 일치합니다."))
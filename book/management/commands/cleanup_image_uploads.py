@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from book.models import ImageUpload
+from book.storage import delete_objects
+
+
+class Command(BaseCommand):
+    help = "서적 등록에 사용되지 않고 만료된 직접 업로드 이미지를 버킷과 DB에서 정리 (cron 등으로 주기 실행)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        expired = ImageUpload.objects.filter(created_at__lt=timezone.now() - settings.BOOK_UPLOAD_TTL).order_by('id')
+        if options['dry_run']:
+            self.stdout.write(f"만료된 업로드 {expired.count()}건 정리 예정")
+            return
+
+        total, failed_total, last_id = 0, 0, 0
+        while True:
+            # 삭제에 실패해 남겨 둔 행을 다시 읽지 않도록 id 키셋으로 진행
+            batch = list(expired.filter(id__gt=last_id).values_list('id', 'key')[:options['batch_size']])
+            if not batch:
+                break
+            last_id = batch[-1][0]
+            failed = set(delete_objects([key for _, key in batch]))
+            # 버킷에서 지우지 못한 객체의 행은 남겨 다음 실행에서 재시도
+            deleted, _ = ImageUpload.objects.filter(id__in=[upload_id for upload_id, key in batch if key not in failed]).delete()
+            total += deleted
+            failed_total += len(batch) - deleted
+        self.stdout.write(f"만료된 업로드 {total}건 정리 완료")
+        if failed_total:
+            self.stderr.write(self.style.WARNING(f"S3 삭제 실패 {failed_total}건은 다음 실행에서 재시도"))
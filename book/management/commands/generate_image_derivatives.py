@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from book.derivatives import process_book_images
+from book.models import BookImage
+
+
+class Command(BaseCommand):
+    help = "파생 이미지(썸네일/중간 크기)가 없는 서적 이미지를 일괄 생성 (백그라운드 작업 누락분 보정)"
+
+    def handle(self, *args, **options):
+        book_ids = (
+            BookImage.objects.filter(thumbnail_url__isnull=True)
+            .values_list('book_id', flat=True).distinct().order_by('book_id')
+        )
+        count = 0
+        for book_id in book_ids.iterator():
+            process_book_images(book_id)
+            count += 1
+        self.stdout.write(f"서적 {count}권의 이미지 파생본 생성 완료")
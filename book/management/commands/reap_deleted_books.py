@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from book.models import Book
+from book.reaper import reap_book
+
+
+class Command(BaseCommand):
+    help = "삭제 요청된(soft delete) 서적의 채팅 기록/S3 이미지/행 정리 (백그라운드 작업 누락분 보정, cron 등으로 주기 실행)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=None, help='이번 실행에서 정리할 최대 서적 수')
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        book_ids = Book.all_objects.filter(deleted_at__isnull=False).order_by('deleted_at').values_list('id', flat=True)
+        book_ids = list(book_ids[:options['limit']] if options['limit'] else book_ids)
+        if options['dry_run']:
+            self.stdout.write(f"정리 대상 서적 {len(book_ids)}권")
+            return
+
+        reaped, failed = 0, 0
+        for book_id in book_ids:
+            try:
+                reaped += reap_book(book_id)
+            except Exception as e:
+                failed += 1
+                self.stderr.write(f"Book {book_id} 정리 실패: {e}")
+        self.stdout.write(f"서적 {reaped}권 정리 완료" + (f", {failed}권 실패" if failed else ''))
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from book.models import Book, SellerSummary
+from book.summary import compute_seller_summary, rebuild_seller_summary
+
+
+class Command(BaseCommand):
+    help = (
+        "판매자 요약을 DB 기준으로 다시 계산 (bulk_create/update 처럼 시그널 없이 바뀐 경우). "
+        "--check 는 어긋난 판매자만 출력"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true', help='수정하지 않고 불일치만 확인')
+
+    def handle(self, *args, **options):
+        seller_ids = set(Book.objects.exclude(seller=None).values_list('seller_id', flat=True).distinct())
+        seller_ids.update(SellerSummary.objects.values_list('seller_id', flat=True))
+
+        mismatched = 0
+        for seller_id in seller_ids:
+            expected = compute_seller_summary(seller_id)
+            current = SellerSummary.objects.filter(seller_id=seller_id).values(*expected).first()
+            if current == expected:
+                continue
+            mismatched += 1
+            if options['check']:
+                self.stdout.write(f"{seller_id}: {current} -> {expected}")
+            else:
+                rebuild_seller_summary(seller_id)
+        action = '확인' if options['check'] else '재계산'
+        self.stdout.write(f"판매자 {len(seller_ids)}명 중 {mismatched}명 요약 불일치 {action}")
@@ -0,0 +1,180 @@
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+from elasticsearch.helpers import bulk, scan
+from book.models import Book
+from book.search import BookDocument
+
+
+class Command(BaseCommand):
+    help = (
+        "새 버전 인덱스를 만들어 DB 전체를 병렬 bulk 인덱싱한 뒤 alias 를 원자적으로 교체 (무중단 재인덱싱). "
+        "중단되면 --resume 으로 체크포인트부터 이어서 실행"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4, help='병렬 bulk 인덱싱 스레드 수')
+        parser.add_argument('--chunk-size', type=int, default=1000, help='DB 조회/bulk 요청 단위')
+        parser.add_argument('--resume', action='store_true', help='체크포인트의 인덱스/위치부터 이어서 실행')
+        parser.add_argument('--checkpoint', default=str(settings.BASE_DIR / '.reindex-checkpoint.json'))
+        parser.add_argument('--keep-old', action='store_true', help='교체 후 이전 인덱스를 삭제하지 않음')
+
+    def handle(self, *args, **options):
+        self.document = BookDocument()
+        self.client = BookDocument._get_connection()
+        self.checkpoint_path = options['checkpoint']
+        alias = BookDocument._index._name
+
+        checkpoint = self.load_checkpoint() if options['resume'] else None
+        if checkpoint:
+            new_index, last_id, started_at = checkpoint['index'], checkpoint['last_id'], checkpoint['started_at']
+            self.stdout.write(f"{new_index} 인덱싱 재개 (id > {last_id})")
+        else:
+            new_index, last_id, started_at = f"{alias}-{timezone.now():%Y%m%d%H%M%S}", 0, timezone.now().isoformat()
+            BookDocument._index.clone(name=new_index).create()
+            self.stdout.write(f"{new_index} 인덱스 생성")
+            self.save_checkpoint(new_index, last_id, started_at)
+
+        # bulk 적재 동안은 refresh 끄고 적재 후 복구
+        self.client.indices.put_settings(index=new_index, settings={'index': {'refresh_interval': '-1'}})
+        indexed = self.index_all(new_index, last_id, started_at, options)
+
+        # 재인덱싱 중 수정된 서적을 한 번 더 반영 (그동안의 변경은 이전 인덱스에만 기록됨)
+        resync_from = timezone.now()
+        changed = list(Book.objects.filter(updated_at__gte=started_at).values_list('id', flat=True))
+        if changed:
+            self.index_ids(new_index, changed, options['chunk_size'])
+            self.stdout.write(f"재인덱싱 중 변경된 서적 {len(changed)}건 추가 반영")
+
+        self.client.indices.put_settings(index=new_index, settings={'index': {'refresh_interval': None}})
+
+        # 건수 대신 id 집합으로 검증: 적재 후 삭제된 서적(고아 문서)은 지우고 누락 문서는 다시 적재한 뒤 alias 교체
+        self.sync_ids(new_index, options['chunk_size'])
+        old_indices = self.swap_alias(alias, new_index, options['keep_old'])
+
+        # 교체 직전까지의 변경/삭제는 이전 인덱스에만 반영되었을 수 있으므로 교체 후 한 번 더 반영
+        changed = list(Book.objects.filter(updated_at__gte=resync_from).values_list('id', flat=True))
+        self.index_ids(new_index, changed, options['chunk_size'])
+        self.sync_ids(new_index, options['chunk_size'])
+
+        os.remove(self.checkpoint_path)
+        self.stdout.write(self.style.SUCCESS(
+            f"{alias} -> {new_index} 교체 완료 ({indexed}건 적재, 이전 인덱스: {', '.join(old_indices) or '없음'})"
+        ))
+
+    def index_all(self, index, last_id, started_at, options):
+        """id 키셋 청크를 워커에 분배, 완료된 연속 구간까지만 체크포인트 전진"""
+        chunk_size = options['chunk_size']
+        started = time.monotonic()
+        indexed = 0
+        in_flight = {}  # future -> (청크 마지막 id)
+        completed = set()
+        order = []  # 제출 순서대로의 청크 마지막 id
+
+        with ThreadPoolExecutor(max_workers=options['workers'], thread_name_prefix='reindex') as executor:
+            exhausted = False
+            while not exhausted or in_flight:
+                # 워커 수의 2배까지만 미리 제출 (메모리 제한)
+                while not exhausted and len(in_flight) < options['workers'] * 2:
+                    ids = list(
+                        Book.objects.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:chunk_size]
+                    )
+                    if not ids:
+                        exhausted = True
+                        break
+                    last_id = ids[-1]
+                    order.append(last_id)
+                    in_flight[executor.submit(self.index_chunk_in_worker, index, ids)] = last_id
+
+                if not in_flight:
+                    break
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    chunk_last_id = in_flight.pop(future)
+                    indexed += future.result()  # 실패 시 예외 -> 체크포인트에서 재개 가능
+                    completed.add(chunk_last_id)
+
+                # 앞에서부터 연속으로 끝난 청크까지만 체크포인트 기록
+                checkpoint_id = None
+                while order and order[0] in completed:
+                    checkpoint_id = order.pop(0)
+                    completed.discard(checkpoint_id)
+                if checkpoint_id is not None:
+                    self.save_checkpoint(index, checkpoint_id, started_at)
+
+                elapsed = time.monotonic() - started
+                self.stdout.write(f"  {indexed}건 적재, {indexed / elapsed if elapsed else 0:.0f} docs/sec")
+        return indexed
+
+    def index_ids(self, index, ids, chunk_size):
+        """변경된 서적 id 를 청크 단위로 다시 적재 (한 번에 전체를 메모리에 올리지 않음)"""
+        for start in range(0, len(ids), chunk_size):
+            self.index_chunk(index, ids[start:start + chunk_size])
+
+    def index_chunk(self, index, ids):
+        books = self.document.get_queryset().filter(id__in=ids)
+        actions = (
+            {'_op_type': 'index', '_index': index, '_id': book.pk, '_source': self.document.prepare(book)}
+            for book in books
+        )
+        success, _ = bulk(self.client, actions, chunk_size=len(ids), max_retries=3, initial_backoff=1)
+        return success
+
+    def index_chunk_in_worker(self, index, ids):
+        try:
+            return self.index_chunk(index, ids)
+        finally:
+            connection.close()  # 워커 스레드별 DB 연결 정리
+
+    def sync_ids(self, index, chunk_size):
+        """DB 와 인덱스의 서적 id 를 비교해 누락 문서는 적재, DB 에 없는(삭제된) 문서는 삭제"""
+        self.client.indices.refresh(index=index)
+        indexed_ids = {
+            int(hit['_id']) for hit in scan(self.client, index=index, query={'_source': False}, size=chunk_size)
+        }
+        db_ids = set(Book.objects.values_list('id', flat=True))
+        missing, orphans = sorted(db_ids - indexed_ids), sorted(indexed_ids - db_ids)
+        for start in range(0, len(missing), chunk_size):
+            self.index_chunk(index, missing[start:start + chunk_size])
+        if orphans:
+            bulk(
+                self.client, ({'_op_type': 'delete', '_index': index, '_id': book_id} for book_id in orphans),
+                chunk_size=chunk_size, max_retries=3, initial_backoff=1, ignore_status=404,
+            )
+        if missing or orphans:
+            self.stdout.write(f"id 비교: 누락 {len(missing)}건 적재, 삭제된 서적 {len(orphans)}건 제거")
+        self.client.indices.refresh(index=index)
+
+    def swap_alias(self, alias, new_index, keep_old):
+        actions = [{'add': {'index': new_index, 'alias': alias}}]
+        old_indices = []
+        if self.client.indices.exists_alias(name=alias):
+            old_indices = list(self.client.indices.get_alias(name=alias))
+            actions = [{'remove': {'index': old, 'alias': alias}} for old in old_indices] + actions
+        elif self.client.indices.exists(index=alias):
+            # alias 도입 이전의 실제 인덱스는 같은 요청 안에서 삭제 후 alias 로 대체
+            actions.append({'remove_index': {'index': alias}})
+        self.client.indices.update_aliases(actions=actions)
+
+        if not keep_old:
+            for old in old_indices:
+                self.client.indices.delete(index=old, ignore_unavailable=True)
+        return old_indices
+
+    def load_checkpoint(self):
+        try:
+            with open(self.checkpoint_path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise CommandError(f"체크포인트가 없습니다: {self.checkpoint_path}")
+
+    def save_checkpoint(self, index, last_id, started_at):
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'index': index, 'last_id': last_id, 'started_at': started_at}, f)
+        os.replace(tmp_path, self.checkpoint_path)
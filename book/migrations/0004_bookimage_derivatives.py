@@ -0,0 +1,33 @@
+# Generated by Django 5.1.3 on 2026-10-18 16:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('book', '0003_imageupload'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bookimage',
+            name='height',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='bookimage',
+            name='medium_url',
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='bookimage',
+            name='thumbnail_url',
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='bookimage',
+            name='width',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 5.1.3 on 2026-10-18 17:04
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def build_seller_summaries(apps, schema_editor):
+    """기존 판매자 요약 생성"""
+    Book = apps.get_model('book', 'Book')
+    ChatRoom = apps.get_model('chat', 'ChatRoom')
+    SellerSummary = apps.get_model('book', 'SellerSummary')
+
+    summaries = {}
+    rows = Book.objects.exclude(seller=None).values('seller_id').annotate(
+        for_sale_count=Count('id', filter=Q(status='FOR_SALE')),
+        in_progress_count=Count('id', filter=Q(status='IN_PROGRESS')),
+        completed_count=Count('id', filter=Q(status='COMPLETED')),
+        total_listed_value=Sum('price', filter=Q(status='FOR_SALE'), default=0),
+    )
+    for row in rows:
+        summaries[row.pop('seller_id')] = row
+    for row in ChatRoom.objects.values('seller_id').annotate(open_chat_count=Count('id')):
+        summaries.setdefault(row['seller_id'], {})['open_chat_count'] = row['open_chat_count']
+    SellerSummary.objects.bulk_create(
+        [SellerSummary(seller_id=seller_id, **values) for seller_id, values in summaries.items()], batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('book', '0005_book_query_indexes'),
+        ('chat', '0001_initial'),
+        ('users', '0002_emailverification_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SellerSummary',
+            fields=[
+                ('seller', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='seller_summary', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('for_sale_count', models.PositiveIntegerField(default=0)),
+                ('in_progress_count', models.PositiveIntegerField(default=0)),
+                ('completed_count', models.PositiveIntegerField(default=0)),
+                ('total_listed_value', models.BigIntegerField(default=0)),
+                ('open_chat_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='book',
+            name='status_rank',
+            field=models.GeneratedField(db_persist=True, expression=models.Case(models.When(status='FOR_SALE', then=models.Value(0)), default=models.Value(1)), output_field=models.PositiveSmallIntegerField()),
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['seller', 'status_rank', '-created_at', '-id'], name='book_seller_rank_idx'),
+        ),
+        migrations.RunPython(build_seller_summaries, migrations.RunPython.noop),
+    ]
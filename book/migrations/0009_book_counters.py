@@ -0,0 +1,40 @@
+# Generated by Django 5.1.3 on 2026-10-18 17:24
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+
+
+def count_interest(apps, schema_editor):
+    """기존 채팅방 수로 관심 수 채우기"""
+    Book = apps.get_model('book', 'Book')
+    ChatRoom = apps.get_model('chat', 'ChatRoom')
+    rooms = ChatRoom.objects.filter(book_id=OuterRef('pk')).values('book_id').annotate(count=Count('id')).values('count')
+    Book.objects.filter(pk__in=ChatRoom.objects.values('book_id')).update(interest_count=Subquery(rooms))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('book', '0008_book_soft_delete'),
+        ('chat', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='book',
+            name='interest_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='book',
+            name='view_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['-interest_count', '-view_count', '-id'], name='book_popular_idx'),
+        ),
+        migrations.RunPython(count_interest, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,17 @@
 from django.db import models
+from django.db.models import Case, Value, When
 from users.models import User
 
+class BookQuerySet(models.QuerySet):
+    def with_related(self):
+        """직렬화에 필요한 판매자/이미지를 고정된 쿼리 수로 함께 조회 (N+1 방지)"""
+        return self.select_related('seller').prefetch_related('images')
+
+class BookManager(models.Manager.from_queryset(BookQuerySet)):
+    """삭제 대기(soft delete) 중인 서적은 조회에서 제외"""
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
 class Book(models.Model):
     STATUS_CHOICES = [
         ('FOR_SALE', '판매 중'),
@@ -17,6 +28,48 @@ class Book(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)  # 등록 시간
     updated_at = models.DateTimeField(auto_now=True)  # 수정 시간
     seller = models.ForeignKey(User, on_delete=models.CASCADE, null=True)  # 사용자 정보
+    deleted_at = models.DateTimeField(null=True, blank=True)  # 삭제 요청 시각 (정리 작업 전까지 숨김, book.reaper)
+    # 조회수/관심(채팅방) 수: 증가분을 프로세스 메모리에 모았다가 주기적으로 일괄 반영 (book.counters)
+    view_count = models.PositiveIntegerField(default=0)
+    interest_count = models.PositiveIntegerField(default=0)
+    # 판매 중 우선 정렬 키 (0: 판매 중, 1: 그 외), DB가 쓰기 시점에 계산해 저장 (bulk_create/update 포함)
+    status_rank = models.GeneratedField(
+        expression=Case(When(status='FOR_SALE', then=Value(0)), default=Value(1)),
+        output_field=models.PositiveSmallIntegerField(),
+        db_persist=True,
+    )
+
+    objects = BookManager()
+    all_objects = BookQuerySet.as_manager()  # 삭제 대기 서적 포함 (정리 작업용)
+
+    # 판매자 요약 증감 계산용으로 DB에서 읽은 시점의 값 보관 (book.signals)
+    SUMMARY_FIELDS = ('seller_id', 'status', 'price')
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_summary_state()
+        return instance
+
+    def remember_summary_state(self):
+        if self.get_deferred_fields().intersection(self.SUMMARY_FIELDS):
+            self._summary_state = None  # only()/defer() 로 일부만 읽은 경우
+        else:
+            self._summary_state = tuple(getattr(self, field) for field in self.SUMMARY_FIELDS)
+
+    class Meta:
+        indexes = [
+            # 전체 목록 커서 페이지네이션 / 키셋 내보내기 (created_at, id 내림차순)
+            models.Index(fields=['-created_at', '-id'], name='book_created_id_idx'),
+            # 판매자별 목록 (seller 범위 + 최신순)
+            models.Index(fields=['seller', '-created_at', '-id'], name='book_seller_created_idx'),
+            # 내 서적 목록 (seller 범위 + 판매 중 우선 + 최신순)
+            models.Index(fields=['seller', 'status_rank', '-created_at', '-id'], name='book_seller_rank_idx'),
+            # 내 서적 목록 조건부 GET 검증자 (seller 범위의 최신 수정 시각/건수를 인덱스만으로 집계)
+            models.Index(fields=['seller', 'updated_at'], name='book_seller_updated_idx'),
+            # 인기순 목록 커서 페이지네이션 (관심 수, 조회수, id 내림차순)
+            models.Index(fields=['-interest_count', '-view_count', '-id'], name='book_popular_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -24,7 +77,33 @@ class Book(models.Model):
 class BookImage(models.Model):
     book = models.ForeignKey(Book, related_name="images", on_delete=models.CASCADE)
     image_url = models.TextField()  # 이미지 URL
+    thumbnail_url = models.TextField(blank=True, null=True)  # 목록용 썸네일(WebP) URL
+    medium_url = models.TextField(blank=True, null=True)  # 상세용 중간 크기(WebP) URL
+    width = models.PositiveIntegerField(blank=True, null=True)  # 원본 너비
+    height = models.PositiveIntegerField(blank=True, null=True)  # 원본 높이
     created_at = models.DateTimeField(auto_now_add=True)  # 등록 시간
 
     def __str__(self):
-        return f"Image for {self.book.title}"
\ No newline at end of file
+        return f"Image for {self.book.title}"
+
+class ImageUpload(models.Model):
+    """Presigned URL로 발급된 직접 업로드 키 (서적 등록 시 확정되면 삭제, 남은 키는 정리 대상)"""
+    key = models.CharField(max_length=255, unique=True)  # S3 객체 키
+    uploader = models.ForeignKey(User, related_name='image_uploads', on_delete=models.CASCADE)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)  # 발급 시간
+
+    def __str__(self):
+        return self.key
+
+class SellerSummary(models.Model):
+    """판매자별 요약 (서적/채팅방 변경 시그널에서 증감 반영, book.summary 참고)"""
+    seller = models.OneToOneField(User, primary_key=True, related_name='seller_summary', on_delete=models.CASCADE)
+    for_sale_count = models.PositiveIntegerField(default=0)  # 판매 중
+    in_progress_count = models.PositiveIntegerField(default=0)  # 거래 중
+    completed_count = models.PositiveIntegerField(default=0)  # 거래 완료
+    total_listed_value = models.BigIntegerField(default=0)  # 판매 중인 서적 가격 합계
+    open_chat_count = models.PositiveIntegerField(default=0)  # 판매자로 참여 중인 채팅방 수
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Summary for {self.seller_id}"
@@ -0,0 +1,125 @@
+import base64
+import json
+from datetime import datetime
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+
+
+# 전체 목록 정렬 (?sort=), 모두 내림차순 - 각 정렬에 맞는 인덱스가 있어야 함 (Book.Meta.indexes)
+LISTING_ORDERINGS = {
+    'newest': ('created_at', 'id'),
+    'popular': ('interest_count', 'view_count', 'id'),  # 관심 수, 조회수 순
+}
+# 내 서적 목록 정렬: 판매 중 우선(status_rank 오름차순), 최신순 - book_seller_rank_idx
+SELLER_ORDERING = ('status_rank', 'created_at', 'id')
+SELLER_ASCENDING = ('status_rank',)
+
+
+class BookCursorPagination(BasePagination):
+    """
+    (created_at, id) 기준 키셋(커서) 페이지네이션
+    OFFSET 없이 마지막 행의 정렬 키 이후만 조회하므로 깊은 페이지도 첫 페이지와 비용이 같음
+    """
+    ordering = ('created_at', 'id')  # 마지막 필드는 유일해야 함
+    ascending = ()  # ordering 중 오름차순 필드 (나머지는 내림차순)
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    invalid_cursor_message = '유효하지 않은 커서입니다.'
+
+    def __init__(self, ordering=None, ascending=None):
+        if ordering is not None:
+            self.ordering = tuple(ordering)
+        if ascending is not None:
+            self.ascending = tuple(ascending)
+        self.page_size = getattr(settings, 'BOOK_PAGE_SIZE', 20)
+        self.max_page_size = getattr(settings, 'BOOK_MAX_PAGE_SIZE', 100)
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def encode_cursor(self, values):
+        # DjangoJSONEncoder는 마이크로초를 잘라내므로 datetime은 직접 isoformat으로 직렬화
+        values = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+        raw = json.dumps(values, separators=(',', ':'))
+        return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            values = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8'))
+            if not isinstance(values, list) or len(values) != len(self.ordering):
+                raise ValueError
+            # 모델 필드 타입으로 복원 (created_at 문자열 -> datetime 등)
+            return [
+                model._meta.get_field(field).to_python(value)
+                for field, value in zip(self.ordering, values)
+            ]
+        except (TypeError, ValueError, UnicodeError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_order_by(self):
+        return [field if field in self.ascending else f'-{field}' for field in self.ordering]
+
+    def get_keyset_filter(self, values):
+        """(a, b, c) < (x, y, z) 를 인덱스를 탈 수 있는 OR 조건으로 풀어서 작성 (오름차순 필드는 >)"""
+        condition = Q()
+        for i, field in enumerate(self.ordering):
+            lookup = 'gt' if field in self.ascending else 'lt'
+            clause = Q(**{f'{field}__{lookup}': values[i]})
+            for prev_field, prev_value in zip(self.ordering[:i], values[:i]):
+                clause &= Q(**{prev_field: prev_value})
+            condition |= clause
+        return condition
+
+    def get_key_values(self, row):
+        """행의 정렬 키 값 (모델 인스턴스 또는 .values() dict)"""
+        if isinstance(row, dict):
+            return [row[field] for field in self.ordering]
+        return [getattr(row, field) for field in self.ordering]
+
+    def iterate_chunks(self, queryset, chunk_size=None):
+        """
+        전체 결과를 키셋 단위 청크(list)로 순회 (내보내기용)
+        mysqlclient는 결과 전체를 클라이언트에 버퍼링하므로 iterator() 대신 청크 쿼리로 메모리를 일정하게 유지
+        """
+        chunk_size = chunk_size or getattr(settings, 'BOOK_EXPORT_CHUNK_SIZE', 1000)
+        queryset = queryset.order_by(*self.get_order_by())
+        chunk = list(queryset[:chunk_size])
+        while chunk:
+            yield chunk
+            if len(chunk) < chunk_size:
+                break
+            chunk = list(queryset.filter(self.get_keyset_filter(self.get_key_values(chunk[-1])))[:chunk_size])
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page_size = self.get_page_size(request)
+        cursor = self.decode_cursor(request, queryset.model)
+
+        if cursor is not None:
+            queryset = queryset.filter(self.get_keyset_filter(cursor))
+        queryset = queryset.order_by(*self.get_order_by())
+
+        # 다음 페이지 존재 여부 확인을 위해 한 건 더 조회
+        rows = list(queryset[:page_size + 1])
+        self.has_next = len(rows) > page_size
+        page = rows[:page_size]
+
+        self.next_cursor = None
+        if self.has_next:
+            self.next_cursor = self.encode_cursor(self.get_key_values(page[-1]))
+        return page
+
+    def get_paginated_response(self, data):
+        return Response({'next': self.next_cursor, 'results': data})
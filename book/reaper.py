@@ -0,0 +1,88 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from chat.models import ChatRoom, Message
+from .models import Book, BookImage
+from .signals import books_updated
+from .storage import delete_objects, key_from_url
+from .summary import apply_delta, book_contribution
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    # 정리 작업은 한 번에 한 권씩 (DB 쓰기 부하 제한)
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='book-reaper')
+    return _executor
+
+
+def soft_delete_book(book_id):
+    """
+    서적 삭제 요청: deleted_at 만 기록해 즉시 숨기고 (Book.objects 에서 제외) 연관 데이터 정리는 커밋 후 백그라운드에서
+    판매자 요약/검색 색인/응답 캐시는 지금 반영, 없는(이미 삭제된) 서적이면 False
+    """
+    with transaction.atomic():
+        book = Book.objects.select_for_update().filter(pk=book_id).only('id', 'seller_id', 'status', 'price').first()
+        if book is None:
+            return False
+        Book.objects.filter(pk=book_id).update(deleted_at=timezone.now())
+        apply_delta(book.seller_id, book_contribution(book.status, book.price, sign=-1))
+        books_updated([book_id])  # 색인에서는 삭제 문서로 처리됨
+        transaction.on_commit(lambda: get_executor().submit(reap_book_in_background, book_id))
+    return True
+
+
+def reap_book_in_background(book_id):
+    close_old_connections()
+    try:
+        reap_book(book_id)
+    except Exception:
+        logger.exception("삭제된 서적 정리 실패: Book %s (reap_deleted_books 로 재시도)", book_id)
+    finally:
+        close_old_connections()
+
+
+def image_keys(book_id):
+    """서적 이미지(원본/파생본)의 S3 키 (버킷 외부 URL 제외)"""
+    urls = BookImage.objects.filter(book_id=book_id).values_list('image_url', 'thumbnail_url', 'medium_url')
+    return [key for row in urls for key in map(key_from_url, filter(None, row)) if key]
+
+
+def reap_book(book_id):
+    """
+    삭제 대기 서적 한 권 정리 (정리할 서적이 아니면 False)
+    1. 채팅 메시지를 배치 단위로 삭제 (배치마다 짧은 트랜잭션, 긴 락 방지)
+    2. S3 이미지 일괄 삭제 - 실패하면 DB 행을 남겨 다음 실행에서 재시도
+    3. 채팅방/이미지/서적 행 삭제 (검색 문서는 post_delete 시그널로 삭제)
+    """
+    book = Book.all_objects.filter(pk=book_id, deleted_at__isnull=False).first()
+    if book is None:
+        return False
+
+    room_ids = list(ChatRoom.objects.filter(book_id=book_id).values_list('id', flat=True))
+    messages = Message.objects.filter(chatRoom_id__in=room_ids)
+    while room_ids:
+        batch = list(messages.values_list('id', flat=True)[:settings.BOOK_REAPER_MESSAGE_BATCH])
+        if not batch:
+            break
+        Message.objects.filter(id__in=batch).delete()
+        time.sleep(settings.BOOK_REAPER_BATCH_PAUSE)
+
+    failed = delete_objects(image_keys(book_id))
+    if failed:
+        raise RuntimeError(f"S3 이미지 {len(failed)}개 삭제 실패: {failed[:5]}")
+
+    with transaction.atomic():
+        book.delete()  # 남은 채팅방(정리 중 생성된 메시지 포함)/이미지는 연쇄 삭제
+    return True
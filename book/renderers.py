@@ -0,0 +1,18 @@
+import json
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework.renderers import BaseRenderer
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Accept: application/x-ndjson 협상용 렌더러
+    목록은 뷰에서 StreamingHttpResponse로 직접 내보내고, 여기서는 오류 응답 등 단건만 한 줄로 렌더링
+    """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return (json.dumps(data, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n').encode('utf-8')
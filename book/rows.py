@@ -0,0 +1,87 @@
+from rest_framework import serializers
+from .models import BookImage
+
+# 응답 필드 -> .values() 컬럼 (BookSerializer 와 같은 필드/순서)
+BOOK_COLUMNS = {
+    'id': 'id',
+    'title': 'title',
+    'chatLink': 'chatLink',
+    'price': 'price',
+    'description': 'description',
+    'major': 'major',
+    'status': 'status',
+    'created_at': 'created_at',
+    'updated_at': 'updated_at',
+    'seller': 'seller_id',
+    'seller_name': 'seller__name',
+    'view_count': 'view_count',
+    'interest_count': 'interest_count',
+}
+IMAGE_FIELDS = ['image_url', 'thumbnail_url', 'medium_url', 'width', 'height']  # BookImageSerializer 와 동일
+DATETIME_FIELDS = ('created_at', 'updated_at')
+# 'thumbnail': 첫 이미지의 썸네일 URL (파생 이미지 생성 전이면 원본 URL), ?fields= 로 요청할 때만 포함
+DEFAULT_FIELDS = [*BOOK_COLUMNS, 'images']
+ALLOWED_FIELDS = [*DEFAULT_FIELDS, 'thumbnail']
+
+
+class BookRowSerializer:
+    """
+    읽기 전용 목록용 직렬화: 모델 인스턴스/DRF 필드 객체 없이 .values() 행에서 바로 dict 생성
+    기본 출력은 BookSerializer 와 같고, ?fields=id,title,price,thumbnail 로 필요한 필드만 조회/출력
+    이미지는 요청된 경우에만 서적 묶음당 한 번의 쿼리로 조회
+    """
+    fields_query_param = 'fields'
+    # 커서 페이지네이션/키셋 순회에 필요한 정렬 키(최신순/인기순/내 서적)는 응답 필드와 무관하게 항상 조회
+    key_columns = ('id', 'created_at', 'interest_count', 'view_count', 'status_rank')
+
+    def __init__(self, fields=None):
+        self.fields = list(fields or DEFAULT_FIELDS)
+        self.columns = list(dict.fromkeys(
+            [*self.key_columns, *(BOOK_COLUMNS[field] for field in self.fields if field in BOOK_COLUMNS)]
+        ))
+        self.with_images = 'images' in self.fields or 'thumbnail' in self.fields
+        self.format_datetime = serializers.DateTimeField().to_representation  # DRF 와 같은 시간 형식
+
+    @classmethod
+    def from_request(cls, request):
+        """?fields=... 파싱, 알 수 없는 필드면 400"""
+        raw = request.query_params.get(cls.fields_query_param)
+        if not raw:
+            return cls()
+        fields = list(dict.fromkeys(field.strip() for field in raw.split(',') if field.strip()))
+        unknown = [field for field in fields if field not in ALLOWED_FIELDS]
+        if unknown or not fields:
+            raise serializers.ValidationError({
+                cls.fields_query_param: f"알 수 없는 필드: {', '.join(unknown)} (사용 가능: {', '.join(ALLOWED_FIELDS)})"
+            })
+        return cls(fields)
+
+    def queryset(self, queryset):
+        return queryset.values(*self.columns)
+
+    def images_by_book(self, book_ids):
+        images = {}
+        # 정렬은 파이썬에서 (book_id 인덱스 조회 후 DB 정렬 방지), 서적별 이미지는 등록(id) 순
+        rows = BookImage.objects.filter(book_id__in=book_ids).values('id', 'book_id', *IMAGE_FIELDS)
+        for row in sorted(rows, key=lambda row: row['id']):
+            del row['id']
+            images.setdefault(row.pop('book_id'), []).append(row)
+        return images
+
+    def serialize(self, rows):
+        rows = list(rows)
+        images = self.images_by_book([row['id'] for row in rows]) if self.with_images and rows else {}
+        return [self.to_representation(row, images.get(row['id'], [])) for row in rows]
+
+    def to_representation(self, row, images):
+        data = {}
+        for field in self.fields:
+            if field == 'images':
+                data['images'] = images
+            elif field == 'thumbnail':
+                data['thumbnail'] = (images[0]['thumbnail_url'] or images[0]['image_url']) if images else None
+            elif field in DATETIME_FIELDS:
+                data[field] = self.format_datetime(row[field])
+            else:
+                data[field] = row[BOOK_COLUMNS[field]]
+        return data
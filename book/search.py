@@ -1,43 +1,239 @@
+import base64
+import json
+from django.conf import settings
 from django_elasticsearch_dsl import Document, fields
 from django_elasticsearch_dsl.registries import registry
-from .models import Book
+from elasticsearch_dsl import AsyncSearch
+from elasticsearch_dsl.query import Bool, MatchAll, MultiMatch, Range, Term
+from .models import Book, BookImage
+
+# 검색 응답에 그대로 내려주는 _source 필드 (DB 조회 없이 응답)
+SEARCH_RESULT_FIELDS = [
+    'title', 'price', 'description', 'major', 'status', 'seller_name', 'image_url', 'thumbnail_url', 'created_at',
+]
+
+# 분석기 프로필: 필드별 (색인 분석기, 검색 분석기)
+# - full: 제목/설명/전공 모두 색인·검색 시 edge n-gram (긴 설명에서 토큰 폭증, 검색어도 n-gram 으로 쪼개짐)
+# - lean: 제목/전공만 색인 시 edge n-gram, 검색어는 standard 분석기로 한 번만 토큰화
+ANALYZER_PROFILES = {
+    'full': {
+        'title': {'analyzer': 'edge_ngram_analyzer', 'search_analyzer': 'edge_ngram_analyzer'},
+        'description': {'analyzer': 'edge_ngram_analyzer', 'search_analyzer': 'edge_ngram_analyzer'},
+        'major': {'analyzer': 'edge_ngram_analyzer', 'search_analyzer': 'edge_ngram_analyzer'},
+    },
+    'lean': {
+        'title': {'analyzer': 'edge_ngram_lowercase_analyzer', 'search_analyzer': 'standard'},
+        'description': {'analyzer': 'standard', 'search_analyzer': 'standard'},
+        'major': {'analyzer': 'edge_ngram_lowercase_analyzer', 'search_analyzer': 'standard'},
+    },
+}
+
+INDEX_SETTINGS = {
+    'number_of_shards': 1,
+    'number_of_replicas': 0,
+    'analysis': {
+        'tokenizer': {
+            'edge_ngram_tokenizer': {
+                'type': 'edge_ngram',
+                'min_gram': 1,
+                'max_gram': 25,
+                'token_chars': ['letter', 'digit']
+            }
+        },
+        'filter': {
+            'word_delimiter_filter': {
+                'type': 'word_delimiter',
+                'preserve_original': True,
+                'split_on_case_change': True,
+                'split_on_numerics': True
+            }
+        },
+        'analyzer': {
+            'edge_ngram_analyzer': {
+                'type': 'custom',
+                'tokenizer': 'edge_ngram_tokenizer'
+            },
+            # standard 검색 분석기와 대소문자 처리를 맞춘 색인용 분석기
+            'edge_ngram_lowercase_analyzer': {
+                'type': 'custom',
+                'tokenizer': 'edge_ngram_tokenizer',
+                'filter': ['lowercase']
+            }
+        }
+    }
+}
+
+_analyzers = ANALYZER_PROFILES[settings.BOOK_SEARCH_ANALYZER_PROFILE]
 
 @registry.register_document
 class BookDocument(Document):
-    title = fields.TextField(analyzer='edge_ngram_analyzer', search_analyzer='edge_ngram_analyzer')
-    description = fields.TextField(analyzer='edge_ngram_analyzer', search_analyzer='edge_ngram_analyzer')
-    major = fields.TextField(analyzer='edge_ngram_analyzer', search_analyzer='edge_ngram_analyzer')
+    title = fields.TextField(**_analyzers['title'])
+    description = fields.TextField(**_analyzers['description'])
+    major = fields.TextField(
+        **_analyzers['major'],
+        fields={'raw': fields.KeywordField()},  # 전공 정확히 일치 필터용
+    )
+
+    # 검색 결과 응답용 비정규화 필드
+    status = fields.KeywordField()
+    seller_name = fields.KeywordField()
+    image_url = fields.KeywordField(index=False)  # 첫 번째 이미지
+    thumbnail_url = fields.KeywordField(index=False)
+
+    # 검색창 자동완성용 completion suggester 필드
+    title_suggest = fields.CompletionField()
+    major_suggest = fields.CompletionField()
 
     class Index:
         name = 'books'
-        settings = {
-            'number_of_shards': 1,
-            'number_of_replicas': 0,
-            'analysis': {
-                'tokenizer': {
-                    'edge_ngram_tokenizer': {
-                        'type': 'edge_ngram',
-                        'min_gram': 1,
-                        'max_gram': 25,
-                        'token_chars': ['letter', 'digit']
-                    }
-                },
-                'filter': {
-                    'word_delimiter_filter': {
-                        'type': 'word_delimiter',
-                        'preserve_original': True,
-                        'split_on_case_change': True,
-                        'split_on_numerics': True
-                    }
-                },
-                'analyzer': {
-                    'edge_ngram_analyzer': {
-                        'type': 'custom',
-                        'tokenizer': 'edge_ngram_tokenizer'
-                    }
-                }
-            }
-        }
+        settings = INDEX_SETTINGS
 
     class Django:
-        model = Book  # Book 모델을 연결
\ No newline at end of file
+        model = Book  # Book 모델을 연결
+        fields = ['id', 'price', 'created_at', 'updated_at']
+        related_models = [BookImage]
+
+    def get_queryset(self):
+        return super().get_queryset().with_related()
+
+    def get_instances_from_related(self, related_instance):
+        if isinstance(related_instance, BookImage):
+            return related_instance.book
+
+    def prepare_seller_name(self, instance):
+        return instance.seller.name if instance.seller else None
+
+    def prepare_title_suggest(self, instance):
+        # 제목 전체 + 각 단어로 시작하는 접미 구간을 입력으로 넣어 중간 단어로도 자동완성
+        words = instance.title.split()
+        inputs = [' '.join(words[i:]) for i in range(len(words))] or [instance.title]
+        return {'input': inputs, 'weight': 2 if instance.status == 'FOR_SALE' else 1}
+
+    def prepare_major_suggest(self, instance):
+        return {'input': [instance.major]}
+
+    def _first_image(self, instance):
+        images = list(instance.images.all())  # prefetch 된 경우 추가 쿼리 없음
+        return min(images, key=lambda image: image.pk) if images else None
+
+    def prepare_image_url(self, instance):
+        image = self._first_image(instance)
+        return image.image_url if image else None
+
+    def prepare_thumbnail_url(self, instance):
+        image = self._first_image(instance)
+        return image.thumbnail_url if image else None
+
+
+# 정렬 기준별 ES sort (마지막 키는 search_after 페이지네이션을 위한 유일 키)
+SEARCH_SORTS = {
+    'relevance': ['_score', {'id': 'desc'}],
+    'newest': [{'created_at': 'desc'}, {'id': 'desc'}],
+    'price_asc': [{'price': 'asc'}, {'id': 'asc'}],
+    'price_desc': [{'price': 'desc'}, {'id': 'desc'}],
+}
+
+
+def encode_search_after(values):
+    return base64.urlsafe_b64encode(json.dumps(list(values), separators=(',', ':')).encode('utf-8')).decode('ascii')
+
+
+def sort_value_types(sort):
+    """정렬 기준별 search_after 값 타입 (_score 는 실수, created_at 은 epoch 밀리초, price/id 는 정수)"""
+    return [(int, float) if key == '_score' else int for key in SEARCH_SORTS[sort]]
+
+
+def decode_search_after(cursor, sort):
+    """정렬 기준과 길이/타입이 맞지 않는 커서면 ValueError (인메모리 백엔드 비교 오류, ES 400 방지)"""
+    values = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8'))
+    types = sort_value_types(sort)
+    if not isinstance(values, list) or len(values) != len(types):
+        raise ValueError(cursor)
+    for value, expected in zip(values, types):
+        if isinstance(value, bool) or not isinstance(value, expected):
+            raise ValueError(cursor)
+    return values
+
+
+def build_book_search(params):
+    """
+    검증된 검색 파라미터(BookSearchParamsSerializer) -> ES Search
+    점수와 무관한 조건은 filter 절에 넣어 ES 필터 캐시를 활용
+    """
+    query = params.get('q')
+    if query:
+        # 제목, 설명, 전공 중 하나라도 검색어와 일치하면 검색
+        text_query = Bool(
+            should=[
+                MultiMatch(query=query, fields=['title']),
+                MultiMatch(query=query, fields=['description']),
+                MultiMatch(query=query, fields=['major'])
+            ],
+            minimum_should_match=1  # 하나라도 일치하면 검색됨
+        )
+    else:
+        text_query = MatchAll()
+
+    filters = []
+    if params.get('status'):
+        filters.append(Term(status=params['status']))
+    if params.get('major'):
+        filters.append(Term(**{'major.raw': params['major']}))
+    price_range = {}
+    if params.get('min_price') is not None:
+        price_range['gte'] = params['min_price']
+    if params.get('max_price') is not None:
+        price_range['lte'] = params['max_price']
+    if price_range:
+        filters.append(Range(price=price_range))
+
+    search = (
+        BookDocument.search()
+        .query(Bool(must=[text_query], filter=filters))
+        .sort(*SEARCH_SORTS[params['sort']])
+        .source(SEARCH_RESULT_FIELDS)
+        .extra(size=params['size'], track_total_hits=False)
+    )
+    if params.get('search_after'):
+        search = search.extra(search_after=params['search_after'])
+    return search
+
+
+def to_async_search(search):
+    """동기 Search 와 같은 요청을 async 클라이언트(async_connections)로 실행하는 AsyncSearch"""
+    return AsyncSearch(index=BookDocument._index._name).update_from_dict(search.to_dict())
+
+
+def next_search_after(hits, size):
+    """가득 찬 페이지면 마지막 hit의 sort 값으로 다음 커서 생성"""
+    if len(hits) < size:
+        return None
+    return encode_search_after(hits[-1].meta.sort)
+
+
+def build_book_suggest(prefix, size):
+    """제목/전공 자동완성 요청 (hit 없이 suggest 만, 제목 원문만 _source 로 받음)"""
+    completion = {'size': size, 'skip_duplicates': True}
+    return (
+        BookDocument.search()
+        .suggest('titles', prefix, completion={'field': 'title_suggest', **completion})
+        .suggest('majors', prefix, completion={'field': 'major_suggest', **completion})
+        .source(['title'])
+        .extra(size=0)
+    )
+
+
+def parse_suggestions(response, size):
+    titles = []
+    for option in response.suggest.titles[0].options:
+        title = option._source.title
+        if title not in titles:
+            titles.append(title)
+    majors = [option.text for option in response.suggest.majors[0].options]
+    return {'titles': titles[:size], 'majors': majors[:size]}
+
+
+def hit_to_result(hit):
+    """검색 hit(_source) -> API 응답 dict"""
+    source = hit.to_dict()
+    return {'id': int(hit.meta.id), **{field: source.get(field) for field in SEARCH_RESULT_FIELDS}}
\ No newline at end of file
@@ -0,0 +1,480 @@
+import asyncio
+import bisect
+import logging
+import re
+import threading
+import time
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from elasticsearch import ApiError, ConnectionError, ConnectionTimeout, TransportError
+from .search import (
+    SEARCH_RESULT_FIELDS, BookDocument, build_book_search, build_book_suggest, hit_to_result, next_search_after,
+    encode_search_after, parse_suggestions, to_async_search,
+)
+
+logger = logging.getLogger(__name__)
+
+# ES 호출 예외 - 장애(연결/타임아웃/5xx)만 차단기에 집계, 4xx 는 요청 오류이므로 호출자에게 전달
+ES_ERRORS = (ApiError, ConnectionError, ConnectionTimeout, TransportError)
+
+
+class SearchUnavailable(Exception):
+    """ES 차단 중인데 대체 색인이 아직 준비되지 않음"""
+
+
+# 검색 뷰에서 처리하는 예외 (search_error_status 로 400/503)
+SEARCH_ERRORS = (*ES_ERRORS, SearchUnavailable)
+
+
+def is_unavailable(error):
+    """ES 장애로 간주하는 예외인지 (전송 오류/타임아웃, 5xx 응답, 대체 색인 미준비)"""
+    if isinstance(error, ApiError):
+        return error.status_code >= 500
+    return isinstance(error, (TransportError, SearchUnavailable))
+
+
+def search_error_status(error):
+    """검색 API 응답 상태: ES 가 거절한 요청(4xx)은 400, 장애는 503"""
+    return 503 if is_unavailable(error) else 400
+
+TOKEN_RE = re.compile(r'\w+')
+
+
+def tokenize(text):
+    return TOKEN_RE.findall((text or '').lower())
+
+
+async def hedged(call, delay):
+    """
+    call() 이 delay 초 안에 끝나지 않으면 같은 요청을 한 번 더 보내고 먼저 성공한 응답 사용 (hedged request)
+    느린 샤드/노드 하나 때문에 생기는 꼬리 지연(p99)을 줄임. delay 가 None 이면 한 번만 요청
+    """
+    first = asyncio.ensure_future(call())
+    if delay is None:
+        return await first
+    done, _ = await asyncio.wait({first}, timeout=delay)
+    if done:
+        return first.result()
+
+    pending = {first, asyncio.ensure_future(call())}
+    error = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = error or task.exception()
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+class ElasticsearchBackend:
+    """Elasticsearch 검색 (기본), 요청별 타임아웃(초)으로 응답 지연 제한"""
+    name = 'elasticsearch'
+
+    def __init__(self, timeouts, hedge_delay=None):
+        self.timeouts = timeouts  # {'search': 초, 'suggest': 초}
+        self.hedge_delay = hedge_delay
+
+    def search(self, params):
+        search = build_book_search(params).params(request_timeout=self.timeouts['search'])
+        hits = list(search.execute())  # DB 조회 없이 정렬 순서 그대로 응답
+        return self.to_page(hits, params['size'])
+
+    async def asearch(self, params):
+        """async 클라이언트로 검색 (ASGI 이벤트 루프에서 스레드 점유 없이 대기)"""
+        search = to_async_search(build_book_search(params)).params(request_timeout=self.timeouts['search'])
+        response = await hedged(lambda: search.execute(ignore_cache=True), self.hedge_delay)
+        return self.to_page(list(response), params['size'])
+
+    def to_page(self, hits, size):
+        return {'results': [hit_to_result(hit) for hit in hits], 'next': next_search_after(hits, size)}
+
+    def suggest(self, prefix, size):
+        response = build_book_suggest(prefix, size).params(request_timeout=self.timeouts['suggest']).execute()
+        return parse_suggestions(response, size)
+
+
+class InMemoryBackend:
+    """
+    프로세스 내 역색인 검색 (ES 장애 시 대체, 테스트/소규모 배포용)
+    - 제목/전공은 단어 접두어, 설명은 단어 일치로 검색 (lean 분석기 프로필과 동일한 동작)
+    - 문서는 BookDocument.prepare() 로 만들어 ES _source 와 같은 응답 형태 유지
+    - 서적 변경 시그널은 dirty 표시만 하고, 다음 검색 때 한 번의 쿼리로 모아서 반영
+    """
+    name = 'memory'
+    FIELD_WEIGHTS = {'title': 3.0, 'major': 2.0, 'description': 1.0}
+    PREFIX_FIELDS = ('title', 'major')
+
+    def __init__(self, chunk_size=1000):
+        self.chunk_size = chunk_size
+        self._lock = threading.RLock()
+        self._built = False
+        self._warming = False
+        self._building = threading.Lock()
+        self._dirty = set()
+        self._docs = {}  # id -> 문서
+        self._postings = {field: {} for field in self.FIELD_WEIGHTS}  # field -> term -> {id}
+        self._vocabulary = {field: [] for field in self.PREFIX_FIELDS}  # 접두어 검색용 정렬된 단어 목록
+
+    # ---- 색인 관리 ----
+
+    def build(self):
+        """DB 전체로 색인 생성 (이미 생성되어 있으면 무시)"""
+        with self._building:
+            if self._built:
+                return
+            with self._lock:
+                self._warming = True  # 생성 중 변경도 dirty 로 기록
+            started = time.monotonic()
+            document = BookDocument()
+            last_id, count = 0, 0
+            while True:
+                books = list(document.get_queryset().filter(id__gt=last_id).order_by('id')[:self.chunk_size])
+                if not books:
+                    break
+                with self._lock:
+                    for book in books:
+                        self._add(document.prepare(book))
+                last_id, count = books[-1].pk, count + len(books)
+            self._built = True
+            logger.info("in-memory search index built: %s books in %.2fs", count, time.monotonic() - started)
+
+    @property
+    def ready(self):
+        return self._built
+
+    def warm_async(self):
+        """백그라운드 스레드에서 색인 생성 (한 번만)"""
+        def run():
+            try:
+                self.build()
+            except Exception:
+                logger.exception("in-memory search index build failed")
+                self._warming = False  # 다음 요청에서 재시도
+            finally:
+                close_old_connections()
+        with self._lock:
+            if self._warming or self._built:
+                return
+            self._warming = True
+        threading.Thread(target=run, name='memory-search-build', daemon=True).start()
+
+    def mark_dirty(self, book_id):
+        """변경된 서적 표시 (색인을 사용하기 시작한 뒤에만 기록)"""
+        with self._lock:
+            if self._warming or self._built:
+                self._dirty.add(book_id)
+
+    def reset(self):
+        """색인 비우기 (다음 검색 때 다시 생성)"""
+        with self._building, self._lock:
+            self._built = self._warming = False
+            self._dirty.clear()
+            self._docs.clear()
+            for field in self._postings:
+                self._postings[field].clear()
+            for field in self._vocabulary:
+                self._vocabulary[field].clear()
+
+    def _refresh_dirty(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            dirty, self._dirty = self._dirty, set()
+        document = BookDocument()
+        books = {book.pk: book for book in document.get_queryset().filter(pk__in=dirty)}
+        with self._lock:
+            for book_id in dirty:
+                self._remove(book_id)
+                if book_id in books:
+                    self._add(document.prepare(books[book_id]))
+
+    def _ensure_ready(self):
+        self.build()
+        self._refresh_dirty()
+
+    def _add(self, doc):
+        book_id = doc['id']
+        self._docs[book_id] = doc
+        for field in self.FIELD_WEIGHTS:
+            for term in set(tokenize(doc.get(field))):
+                postings = self._postings[field].setdefault(term, set())
+                if not postings and field in self.PREFIX_FIELDS:
+                    vocabulary = self._vocabulary[field]
+                    index = bisect.bisect_left(vocabulary, term)
+                    if index == len(vocabulary) or vocabulary[index] != term:
+                        vocabulary.insert(index, term)
+                postings.add(book_id)
+
+    def _remove(self, book_id):
+        doc = self._docs.pop(book_id, None)
+        if doc is None:
+            return
+        for field in self.FIELD_WEIGHTS:
+            for term in set(tokenize(doc.get(field))):
+                self._postings[field].get(term, set()).discard(book_id)
+
+    def _prefix_terms(self, field, prefix):
+        vocabulary = self._vocabulary[field]
+        index = bisect.bisect_left(vocabulary, prefix)
+        while index < len(vocabulary) and vocabulary[index].startswith(prefix):
+            yield vocabulary[index]
+            index += 1
+
+    # ---- 검색 ----
+
+    def _score(self, query):
+        """검색어 단어 중 하나라도 일치하는 서적별 점수"""
+        scores = {}
+        for term in tokenize(query):
+            for field, weight in self.FIELD_WEIGHTS.items():
+                if field in self.PREFIX_FIELDS:
+                    matched = set()
+                    for indexed_term in self._prefix_terms(field, term):
+                        matched |= self._postings[field][indexed_term]
+                else:
+                    matched = self._postings[field].get(term, set())
+                for book_id in matched:
+                    scores[book_id] = scores.get(book_id, 0.0) + weight
+        return scores
+
+    def _matches_filters(self, doc, params):
+        if params.get('status') and doc['status'] != params['status']:
+            return False
+        if params.get('major') and doc['major'] != params['major']:
+            return False
+        if params.get('min_price') is not None and doc['price'] < params['min_price']:
+            return False
+        if params.get('max_price') is not None and doc['price'] > params['max_price']:
+            return False
+        return True
+
+    def _sort_values(self, doc, score, sort):
+        """ES sort 값과 같은 형태 (search_after 커서 호환)"""
+        if sort == 'relevance':
+            return [score, doc['id']]
+        if sort == 'newest':
+            return [int(doc['created_at'].timestamp() * 1000), doc['id']]
+        return [doc['price'], doc['id']]
+
+    def search(self, params):
+        self._ensure_ready()
+        sort = params['sort']
+        descending = sort != 'price_asc'
+        with self._lock:
+            if params.get('q'):
+                candidates = self._score(params['q']).items()
+            else:
+                candidates = ((book_id, 1.0) for book_id in self._docs)
+            rows = [
+                (self._sort_values(self._docs[book_id], score, sort), self._docs[book_id])
+                for book_id, score in candidates
+                if self._matches_filters(self._docs[book_id], params)
+            ]
+
+        after = params.get('search_after')
+        if after:
+            rows = [row for row in rows if (row[0] < after if descending else row[0] > after)]
+        rows.sort(key=lambda row: row[0], reverse=descending)
+        page = rows[:params['size']]
+
+        results = [self.to_result(doc) for _, doc in page]
+        next_cursor = encode_search_after(page[-1][0]) if len(page) == params['size'] else None
+        return {'results': results, 'next': next_cursor}
+
+    async def asearch(self, params):
+        # 색인 생성/dirty 반영에 DB 조회가 있으므로 동기 스레드에서 실행
+        return await sync_to_async(self.search)(params)
+
+    def suggest(self, prefix, size):
+        """completion suggester 와 같은 규칙: 제목의 각 단어부터 시작하는 구간, 전공 전체가 접두어로 시작"""
+        self._ensure_ready()
+        prefix = prefix.lower()
+        first_word = (tokenize(prefix) or [prefix])[0]
+        with self._lock:
+            candidates = set()
+            for term in self._prefix_terms('title', first_word):
+                candidates |= self._postings['title'][term]
+            # 판매 중 우선(weight), 같은 가중치는 최신순
+            docs = sorted(
+                (self._docs[book_id] for book_id in candidates),
+                key=lambda doc: (doc['status'] == 'FOR_SALE', doc['id']), reverse=True,
+            )
+            titles = []
+            for doc in docs:
+                words = doc['title'].lower().split()
+                if doc['title'] not in titles and any(
+                    ' '.join(words[i:]).startswith(prefix) for i in range(len(words))
+                ):
+                    titles.append(doc['title'])
+                    if len(titles) >= size:
+                        break
+            majors = set()
+            for term in self._prefix_terms('major', first_word):
+                majors.update(
+                    self._docs[book_id]['major'] for book_id in self._postings['major'][term]
+                    if self._docs[book_id]['major'].lower().startswith(prefix)
+                )
+        return {'titles': titles, 'majors': sorted(majors)[:size]}
+
+    def to_result(self, doc):
+        result = {'id': doc['id'], **{field: doc.get(field) for field in SEARCH_RESULT_FIELDS}}
+        result['created_at'] = doc['created_at'].isoformat()  # ES _source 와 같은 ISO 문자열
+        return result
+
+
+class CircuitBreaker:
+    """연속 실패가 threshold 에 도달하면 reset_timeout 동안 차단, 이후 한 번 시험 요청 허용"""
+
+    def __init__(self, failure_threshold, reset_timeout):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                self._opened_at = time.monotonic()  # half-open: 시험 요청 하나만 통과
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+
+    def record_failure(self):
+        """실패 집계, 차단 상태가 되면 True"""
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                return True
+            return False
+
+    @property
+    def state(self):
+        with self._lock:
+            return 'closed' if self._opened_at is None else 'open'
+
+
+class FallbackBackend:
+    """
+    ES 우선, 장애/지연 예산 초과/차단 중에는 인메모리 검색으로 응답
+    ES 요청 타임아웃이 지연 예산이므로 ES가 느려도 예산 안에 대체 응답 가능
+    대체 색인은 서버 시작 시(warm_search_fallback) 백그라운드에서 생성, 실패했으면 차단기가 열릴 때 다시 시도
+    - 요청 경로에서는 색인을 만들지 않음: 색인이 준비되기 전의 장애는 차단 여부와 관계없이 예외 전달 (뷰에서 503)
+    - ES 가 거절한 요청(4xx)은 장애가 아니므로 집계/대체 없이 호출자에게 전달
+    """
+    name = 'auto'
+
+    def __init__(self, primary, fallback, breaker):
+        self.primary = primary
+        self.fallback = fallback
+        self.breaker = breaker
+
+    def _on_primary_error(self, method, error):
+        if not is_unavailable(error):
+            self.breaker.record_success()  # ES 는 응답했음
+            raise error
+        logger.warning("elasticsearch %s unavailable: %s", method, error)
+        if self.breaker.record_failure():
+            self.fallback.warm_async()
+
+    def _on_primary_result(self, method, elapsed):
+        if elapsed > self.primary.timeouts[method]:
+            # 느린 응답도 장애 징후로 집계
+            if self.breaker.record_failure():
+                self.fallback.warm_async()
+        else:
+            self.breaker.record_success()
+
+    def _check_fallback(self, error=None):
+        """대체 색인이 준비되지 않았으면 (생성은 백그라운드에 맡기고) 예외"""
+        if self.fallback.ready:
+            return
+        self.fallback.warm_async()  # 시작 시 생성 실패/초기화된 경우 다시 생성 (이미 생성 중이면 무시)
+        raise error or SearchUnavailable("in-memory search index is not ready")
+
+    def _call(self, method, *args):
+        error = None
+        if self.breaker.allow():
+            started = time.monotonic()
+            try:
+                result = getattr(self.primary, method)(*args)
+            except ES_ERRORS as e:
+                self._on_primary_error(method, e)
+                error = e
+            else:
+                self._on_primary_result(method, time.monotonic() - started)
+                return result
+        self._check_fallback(error)
+        return getattr(self.fallback, method)(*args)
+
+    def search(self, params):
+        return self._call('search', params)
+
+    def suggest(self, prefix, size):
+        return self._call('suggest', prefix, size)
+
+    async def asearch(self, params):
+        error = None
+        if self.breaker.allow():
+            started = time.monotonic()
+            try:
+                result = await self.primary.asearch(params)
+            except ES_ERRORS as e:
+                self._on_primary_error('asearch', e)
+                error = e
+            else:
+                self._on_primary_result('search', time.monotonic() - started)
+                return result
+        self._check_fallback(error)
+        return await self.fallback.asearch(params)
+
+
+memory_backend = InMemoryBackend(chunk_size=settings.BOOK_EXPORT_CHUNK_SIZE)
+_backends = {}
+_backends_lock = threading.Lock()
+
+
+def _create_backend(name):
+    elasticsearch = ElasticsearchBackend(
+        timeouts={'search': settings.BOOK_SEARCH_TIMEOUT, 'suggest': settings.BOOK_SUGGEST_TIMEOUT},
+        hedge_delay=settings.BOOK_SEARCH_HEDGE_DELAY,
+    )
+    if name == 'elasticsearch':
+        return elasticsearch
+    if name == 'memory':
+        return memory_backend
+    if name == 'auto':
+        return FallbackBackend(
+            elasticsearch, memory_backend,
+            CircuitBreaker(settings.BOOK_SEARCH_BREAKER_THRESHOLD, settings.BOOK_SEARCH_BREAKER_RESET_TIMEOUT),
+        )
+    raise ValueError(f"unknown BOOK_SEARCH_BACKEND: {name}")
+
+
+def get_search_backend():
+    """settings.BOOK_SEARCH_BACKEND: 'auto'(ES + 인메모리 대체) | 'elasticsearch' | 'memory'"""
+    name = settings.BOOK_SEARCH_BACKEND
+    if name not in _backends:
+        with _backends_lock:
+            if name not in _backends:
+                _backends[name] = _create_backend(name)
+    return _backends[name]  # 'memory' 는 첫 검색에서 동기 생성, 'auto' 는 warm_search_fallback() 에서 생성
+
+
+def warm_search_fallback():
+    """서버 프로세스 시작 시 호출 (config.asgi/wsgi): 'auto' 면 대체 인메모리 색인을 백그라운드에서 미리 생성"""
+    if settings.BOOK_SEARCH_BACKEND == 'auto':
+        memory_backend.warm_async()
@@ -1,11 +1,16 @@
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
 from rest_framework import serializers
-from .models import Book, BookImage
+from .models import Book, BookImage, ImageUpload, SellerSummary
+from .search import SEARCH_SORTS, decode_search_after
+from .storage import get_upload_executor, object_exists
 from users.models import User
 
 class BookImageSerializer(serializers.ModelSerializer):
     class Meta:
         model = BookImage
-        fields = ['image_url']
+        fields = ['image_url', 'thumbnail_url', 'medium_url', 'width', 'height']
 
 class BookSerializer(serializers.ModelSerializer):
     seller_name = serializers.CharField(source='seller.name', read_only=True)
@@ -13,22 +18,24 @@ class BookSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Book
-        fields = ['id', 'title', 'chatLink', 'price', 'description', 'major', 'status', 'created_at', 'updated_at', 'seller', 'seller_name', 'images']
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        fields = ['id', 'title', 'chatLink', 'price', 'description', 'major', 'status', 'created_at', 'updated_at', 'seller', 'seller_name', 'view_count', 'interest_count', 'images']
+        read_only_fields = ['id', 'created_at', 'updated_at', 'view_count', 'interest_count']
 
 class BookCreateSerializer(serializers.ModelSerializer):
+    images = serializers.ListField(child=serializers.CharField(), write_only=True, required=False)  # 업로드된 이미지 URL
+
     class Meta:
         model = Book
-        fields = ['id', 'title', 'chatLink', 'price', 'description', 'major', 'status', 'seller']
+        fields = ['id', 'title', 'chatLink', 'price', 'description', 'major', 'status', 'seller', 'images']
         read_only_fields = ['id', 'created_at', 'updated_at']
 
     def create(self, validated_data):
         images = validated_data.pop('images', [])  # images 필드를 추출
-        book = Book.objects.create(**validated_data)  # Book 객체 생성
 
-        # BookImage 모델에 각 이미지 URL을 저장
-        for image_url in images:
-            BookImage.objects.create(book=book, image_url=image_url)
+        # 서적과 이미지를 하나의 트랜잭션에서 저장 (이미지는 한 번의 bulk INSERT)
+        with transaction.atomic():
+            book = Book.objects.create(**validated_data)  # Book 객체 생성
+            BookImage.objects.bulk_create([BookImage(book=book, image_url=image_url) for image_url in images])
 
         return book
 
@@ -36,4 +43,118 @@ class UserSerializer(serializers.ModelSerializer):
     """User 정보 직렬화"""
     class Meta:
         model = User
-        fields = ['name', 'student_id', 'school_email']
\ No newline at end of file
+        fields = ['name', 'student_id', 'school_email']
+
+class SellerSummarySerializer(serializers.ModelSerializer):
+    """판매자 요약 (내 서적 목록 상단)"""
+    class Meta:
+        model = SellerSummary
+        fields = ['for_sale_count', 'in_progress_count', 'completed_count', 'total_listed_value', 'open_chat_count']
+
+class ImageUploadFileSerializer(serializers.Serializer):
+    """직접 업로드할 파일 정보"""
+    name = serializers.CharField(max_length=100)
+    content_type = serializers.RegexField(r'^image/[\w.+-]+$')
+
+class ImageUploadRequestSerializer(serializers.Serializer):
+    """Presigned 업로드 URL 발급 요청"""
+    files = ImageUploadFileSerializer(many=True, allow_empty=False, max_length=settings.BOOK_MAX_IMAGES)
+
+class ImageKeysSerializer(serializers.Serializer):
+    """직접 업로드한 이미지 키로 서적 등록 시 키 검증"""
+    image_keys = serializers.ListField(
+        child=serializers.CharField(max_length=255), allow_empty=False, max_length=settings.BOOK_MAX_IMAGES
+    )
+
+    invalid_message = "유효하지 않은 이미지 키입니다."
+
+    @staticmethod
+    def issued(user, keys):
+        """본인에게 발급되었고 만료되지 않은 업로드 키"""
+        issued_after = timezone.now() - settings.BOOK_UPLOAD_TTL
+        return ImageUpload.objects.filter(uploader=user, key__in=keys, created_at__gte=issued_after)
+
+    def validate_image_keys(self, keys):
+        # 본인에게 발급되었고 만료되지 않은 키인지 한 번의 쿼리로 확인 (실제 확정은 claim)
+        issued = set(self.issued(self.context['request'].user, keys).values_list('key', flat=True))
+        if len(set(keys)) != len(keys) or issued != set(keys):
+            raise serializers.ValidationError(self.invalid_message)
+
+        # 실제로 버킷에 업로드가 끝났는지 확인
+        if not all(get_upload_executor().map(object_exists, keys)):
+            raise serializers.ValidationError("업로드가 완료되지 않은 이미지가 있습니다.")
+        return keys
+
+    def claim(self):
+        """
+        서적 등록 트랜잭션 안에서 키 확정: 조건부 DELETE 로 지운 행 수가 키 수와 같아야 성공
+        동시 요청이 같은 키를 쓰면 먼저 커밋한 쪽만 행을 지우고 (행 잠금 대기 후) 나머지는 0건 -> False
+        """
+        keys = self.validated_data['image_keys']
+        deleted, _ = self.issued(self.context['request'].user, keys).delete()
+        return deleted == len(keys)
+
+
+class BookSearchParamsSerializer(serializers.Serializer):
+    """서적 검색 쿼리 파라미터"""
+    q = serializers.CharField(required=False, allow_blank=True, default='', max_length=100)
+    status = serializers.ChoiceField(choices=Book.STATUS_CHOICES, required=False)
+    major = serializers.CharField(required=False, max_length=50)
+    min_price = serializers.IntegerField(required=False, min_value=0)
+    max_price = serializers.IntegerField(required=False, min_value=0)
+    sort = serializers.ChoiceField(choices=list(SEARCH_SORTS), required=False)
+    size = serializers.IntegerField(required=False, min_value=1, max_value=settings.BOOK_MAX_PAGE_SIZE)
+    search_after = serializers.CharField(required=False)
+
+    def validate(self, data):
+        data['q'] = ' '.join(data['q'].split())  # 공백 정규화 (캐시 키 통일)
+        has_filter = any(data.get(key) is not None for key in ('status', 'major', 'min_price', 'max_price'))
+        if not data['q'] and not has_filter:
+            raise serializers.ValidationError({"error": 'Query parameter "q" is required.'})
+        if data.get('min_price') is not None and data.get('max_price') is not None and data['min_price'] > data['max_price']:
+            raise serializers.ValidationError({"min_price": "최소 가격이 최대 가격보다 큽니다."})
+
+        # 검색어가 없으면 관련도 정렬 의미가 없으므로 최신순
+        data.setdefault('sort', 'relevance' if data['q'] else 'newest')
+        data.setdefault('size', settings.BOOK_PAGE_SIZE)
+        # 커서는 정렬 기준의 sort 값 목록이어야 함 (다른 정렬의 커서/조작된 커서는 400)
+        if data.get('search_after'):
+            try:
+                data['search_after'] = decode_search_after(data['search_after'], data['sort'])
+            except (TypeError, ValueError, UnicodeError):
+                raise serializers.ValidationError({"search_after": "유효하지 않은 커서입니다."})
+        return data
+
+
+class BookSuggestParamsSerializer(serializers.Serializer):
+    """자동완성 쿼리 파라미터"""
+    q = serializers.CharField(max_length=50, trim_whitespace=True)
+    k = serializers.IntegerField(required=False, default=5, min_value=1, max_value=10)
+
+
+class BookIdsParamsSerializer(serializers.Serializer):
+    """여러 서적 조회 쿼리 파라미터 (?ids=1,2,3)"""
+    ids = serializers.CharField()
+
+    def validate_ids(self, value):
+        try:
+            ids = [int(book_id) for book_id in value.split(',') if book_id.strip()]
+        except ValueError:
+            raise serializers.ValidationError("ids는 쉼표로 구분된 서적 ID여야 합니다.")
+        ids = list(dict.fromkeys(ids))  # 중복 제거 (요청 순서 유지)
+        if not ids:
+            raise serializers.ValidationError("서적 ID가 없습니다.")
+        if len(ids) > settings.BOOK_BATCH_MAX_IDS:
+            raise serializers.ValidationError(f"한 번에 최대 {settings.BOOK_BATCH_MAX_IDS}권까지 요청할 수 있습니다.")
+        return ids
+
+
+class BookBulkStatusSerializer(serializers.Serializer):
+    """여러 서적 거래 상태 일괄 변경"""
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=settings.BOOK_BATCH_MAX_IDS
+    )
+    status = serializers.ChoiceField(choices=Book.STATUS_CHOICES)
+
+    def validate_ids(self, ids):
+        return list(dict.fromkeys(ids))
@@ -1,17 +1,107 @@
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
-from .models import Book
-from .search import BookDocument
+from chat.models import ChatRoom
+from .cache import listing_cache, search_cache
+from .counters import book_counters
+from .indexer import book_indexer
+from .models import Book, BookImage, SellerSummary
+from .search_backends import memory_backend
+from .summary import apply_delta, book_contribution, merge_deltas
 
-# 새로운 책이 저장될 때마다 Elasticsearch에 인덱싱
+def books_updated(book_ids):
+    """queryset.update() 처럼 시그널 없이 바뀐 서적을 post_save 와 같이 인덱스/응답 캐시에 반영 (커밋 후)"""
+    book_ids = list(book_ids)
+
+    def notify():
+        for book_id in book_ids:
+            book_indexer.index(book_id)
+            memory_backend.mark_dirty(book_id)
+        search_cache.bump()
+        listing_cache.bump()
+    transaction.on_commit(notify)
+
+# 책이 생성/수정/삭제될 때마다 인덱싱 큐에 추가 (커밋 후, 백그라운드에서 bulk 전송)
+@receiver(post_save, sender=Book)
+def index_book(sender, instance, **kwargs):
+    # 이미지까지 저장된 뒤(커밋 후)에 인덱싱해야 첫 이미지 URL이 문서에 포함됨
+    book_id = instance.pk
+    transaction.on_commit(lambda: book_indexer.index(book_id))
+
+@receiver(post_delete, sender=Book)
+def unindex_book(sender, instance, **kwargs):
+    book_id = instance.pk
+    transaction.on_commit(lambda: book_indexer.delete(book_id))
+
+# 이미지 변경은 첫 이미지 URL에 반영되도록 서적 문서 갱신
+@receiver(post_save, sender=BookImage)
+@receiver(post_delete, sender=BookImage)
+def index_book_image(sender, instance, **kwargs):
+    book_id = instance.book_id
+    transaction.on_commit(lambda: book_indexer.index(book_id))
+
+# 서적/이미지가 바뀌면 검색 결과/목록 캐시 무효화 (커밋 후 세대 번호 증가)
+@receiver(post_save, sender=Book)
+@receiver(post_delete, sender=Book)
+@receiver(post_save, sender=BookImage)
+@receiver(post_delete, sender=BookImage)
+def invalidate_response_caches(sender, **kwargs):
+    transaction.on_commit(search_cache.bump)
+    transaction.on_commit(listing_cache.bump)
+
+# 인메모리 검색 색인은 변경된 서적만 표시해 두고 다음 검색 때 반영
 @receiver(post_save, sender=Book)
-def index_book(sender, instance, created, **kwargs):
+@receiver(post_delete, sender=Book)
+@receiver(post_save, sender=BookImage)
+@receiver(post_delete, sender=BookImage)
+def mark_memory_index_dirty(sender, instance, **kwargs):
+    book_id = instance.pk if sender is Book else instance.book_id
+    transaction.on_commit(lambda: memory_backend.mark_dirty(book_id))
+
+# 판매자 요약은 서적 변경과 같은 트랜잭션에서 증감 반영
+@receiver(post_save, sender=Book)
+def update_seller_summary(sender, instance, created, **kwargs):
+    old_state = None if created else getattr(instance, '_summary_state', None)
+    if not created and old_state is None:
+        # 이전 값을 모르면 (only()/새 인스턴스로 저장) 요약을 다시 계산하도록 표시
+        SellerSummary.objects.filter(seller_id=instance.seller_id).delete()
+    else:
+        old_seller_id, old_status, old_price = old_state or (None, None, None)
+        added = book_contribution(instance.status, instance.price)
+        removed = book_contribution(old_status, old_price, sign=-1) if old_state else {}
+        if old_seller_id == instance.seller_id:
+            apply_delta(instance.seller_id, merge_deltas(added, removed))
+        else:
+            apply_delta(old_seller_id, removed)
+            apply_delta(instance.seller_id, added)
+    instance.remember_summary_state()
+
+@receiver(post_delete, sender=Book)
+def remove_from_seller_summary(sender, instance, **kwargs):
+    if instance.deleted_at is not None:
+        return  # 삭제 요청(soft delete) 시점에 이미 반영됨 (book.reaper)
+    seller_id, status, price = getattr(instance, '_summary_state', None) or (
+        instance.seller_id, instance.status, instance.price
+    )
+    apply_delta(seller_id, book_contribution(status, price, sign=-1))
+
+@receiver(post_save, sender=ChatRoom)
+def count_open_chat(sender, instance, created, **kwargs):
     if created:
-        book_document = BookDocument()
-        book_document.update(instance)
-
-# 기존 데이터들을 Elasticsearch에 추가하도록 설정
-def index_existing_books():
-    for book in Book.objects.all():
-        book_document = BookDocument()
-        book_document.update(book)
\ No newline at end of file
+        apply_delta(instance.seller_id, {'open_chat_count': 1})
+
+@receiver(post_delete, sender=ChatRoom)
+def uncount_open_chat(sender, instance, **kwargs):
+    apply_delta(instance.seller_id, {'open_chat_count': -1})
+
+# 서적 관심 수 (채팅방 수) - 커밋 후 메모리에 합산, 주기적으로 일괄 반영
+@receiver(post_save, sender=ChatRoom)
+def count_interest(sender, instance, created, **kwargs):
+    if created:
+        book_id = instance.book_id
+        transaction.on_commit(lambda: book_counters.interest(book_id))
+
+@receiver(post_delete, sender=ChatRoom)
+def uncount_interest(sender, instance, **kwargs):
+    book_id = instance.book_id
+    transaction.on_commit(lambda: book_counters.interest(book_id, -1))
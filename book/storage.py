@@ -0,0 +1,110 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from uuid import uuid4
+import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
+from django.conf import settings
+from django.utils.text import get_valid_filename
+
+_s3_client = None
+_s3_client_lock = threading.Lock()
+_upload_executor = None
+_upload_executor_lock = threading.Lock()
+
+
+def get_s3_client():
+    """프로세스당 한 번만 생성하는 공용 S3 클라이언트 (boto3 클라이언트는 스레드 간 공유 가능)"""
+    global _s3_client
+    if _s3_client is None:
+        with _s3_client_lock:
+            if _s3_client is None:
+                _s3_client = boto3.client(
+                    "s3",
+                    aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+                    aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+                    region_name=settings.AWS_S3_REGION_NAME,
+                    endpoint_url=settings.AWS_S3_ENDPOINT_URL,
+                    config=Config(max_pool_connections=settings.BOOK_UPLOAD_WORKERS * 2),
+                )
+    return _s3_client
+
+
+def get_upload_executor():
+    """업로드 동시 실행 수를 제한하는 프로세스 공용 스레드 풀"""
+    global _upload_executor
+    if _upload_executor is None:
+        with _upload_executor_lock:
+            if _upload_executor is None:
+                _upload_executor = ThreadPoolExecutor(
+                    max_workers=settings.BOOK_UPLOAD_WORKERS, thread_name_prefix='s3-upload'
+                )
+    return _upload_executor
+
+
+def object_url(key):
+    """S3 객체 키 -> 공개 URL"""
+    return f"https://{settings.AWS_STORAGE_BUCKET_NAME}.s3.{settings.AWS_S3_REGION_NAME}.amazonaws.com/{key}"
+
+
+def key_from_url(url):
+    """object_url()로 만든 URL -> S3 객체 키"""
+    prefix = object_url('')
+    return url[len(prefix):] if url.startswith(prefix) else None
+
+
+def new_image_key(filename):
+    """파일명 유니크하게 생성"""
+    return f"image/{uuid4()}_{get_valid_filename(filename)}"
+
+
+def upload_image(file):
+    """업로드된 파일을 복사 없이 그대로 S3에 올리고 URL 반환"""
+    key = new_image_key(file.name)
+    file.seek(0)
+    get_s3_client().upload_fileobj(file, Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=key)
+    return object_url(key)
+
+
+def upload_images(files):
+    """여러 이미지를 동시에 업로드, 입력 순서대로 URL 반환"""
+    if len(files) == 1:
+        return [upload_image(files[0])]
+    return list(get_upload_executor().map(upload_image, files))
+
+
+def presigned_image_post(key, content_type):
+    """클라이언트가 버킷에 직접 올릴 수 있는 presigned POST (용량/타입 조건 포함)"""
+    return get_s3_client().generate_presigned_post(
+        Bucket=settings.AWS_STORAGE_BUCKET_NAME,
+        Key=key,
+        Fields={'Content-Type': content_type},
+        Conditions=[
+            {'Content-Type': content_type},
+            ['content-length-range', 1, settings.BOOK_UPLOAD_MAX_BYTES],
+        ],
+        ExpiresIn=settings.BOOK_UPLOAD_URL_EXPIRES,
+    )
+
+
+def object_exists(key):
+    try:
+        get_s3_client().head_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=key)
+    except ClientError as e:
+        if e.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound'):
+            return False
+        raise
+    return True
+
+
+def delete_objects(keys):
+    """S3 일괄 삭제 (요청당 최대 1000개), 삭제에 실패한 키 목록 반환"""
+    keys = list(keys)
+    failed = []
+    for start in range(0, len(keys), 1000):
+        response = get_s3_client().delete_objects(
+            Bucket=settings.AWS_STORAGE_BUCKET_NAME,
+            Delete={'Objects': [{'Key': key} for key in keys[start:start + 1000]], 'Quiet': True},
+        )
+        failed.extend(error['Key'] for error in response.get('Errors', []))  # Quiet: 실패한 키만 응답
+    return failed
@@ -0,0 +1,46 @@
+import json
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from config.renderers import dumps
+from .pagination import BookCursorPagination
+from .renderers import NDJSONRenderer
+
+
+def wants_ndjson(request):
+    """콘텐츠 협상 결과가 NDJSON인지 확인"""
+    return getattr(request, 'accepted_renderer', None) is not None and request.accepted_renderer.format == NDJSONRenderer.format
+
+
+def encode_rows(rows):
+    """서적 dict 목록 -> NDJSON 바이트 (한 줄에 한 권)"""
+    return b''.join(
+        (dumps(book) or json.dumps(book, cls=DjangoJSONEncoder, ensure_ascii=False).encode('utf-8')) + b'\n'
+        for book in rows
+    )
+
+
+def stream_books_ndjson(request, queryset, row_serializer, paginator=None):
+    """
+    서적 목록을 한 줄에 한 권씩 NDJSON으로 스트리밍 (전체 목록을 메모리에 만들지 않음)
+    row_serializer(BookRowSerializer)로 키셋 청크마다 .values() 조회 + 이미지 한 번 조회, 청크 단위로 전송
+    paginator: 정렬 기준 (JSON 응답과 같은 순서로 내보내도록 뷰에서 전달, 기본 최신순)
+    ASGI 에서는 동기 제너레이터를 sync_to_async(list)로 전부 버퍼링하므로 청크마다 스레드에서 조회하는 비동기 제너레이터 사용
+    """
+    chunks = (paginator or BookCursorPagination()).iterate_chunks(row_serializer.queryset(queryset))
+
+    def next_chunk():
+        chunk = next(chunks, None)
+        return None if chunk is None else encode_rows(row_serializer.serialize(chunk))
+
+    def rows():
+        while (data := next_chunk()) is not None:
+            yield data
+
+    async def arows():
+        while (data := await sync_to_async(next_chunk)()) is not None:
+            yield data
+
+    asgi = isinstance(getattr(request, '_request', request), ASGIRequest)
+    return StreamingHttpResponse(arows() if asgi else rows(), content_type=NDJSONRenderer.media_type)
@@ -0,0 +1,98 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Max, OuterRef, Q, Subquery, Sum
+from django.utils import timezone
+from .models import Book, SellerSummary
+
+# 서적 상태별 집계 컬럼
+STATUS_COUNT_FIELDS = {
+    'FOR_SALE': 'for_sale_count',
+    'IN_PROGRESS': 'in_progress_count',
+    'COMPLETED': 'completed_count',
+}
+
+
+def book_contribution(status, price, sign=1):
+    """서적 한 권이 요약에 더하는 값 (sign=-1 이면 빼는 값)"""
+    delta = {STATUS_COUNT_FIELDS[status]: sign}
+    if status == 'FOR_SALE':
+        delta['total_listed_value'] = sign * price
+    return delta
+
+
+def merge_deltas(*deltas):
+    merged = {}
+    for delta in deltas:
+        for field, value in delta.items():
+            merged[field] = merged.get(field, 0) + value
+    return {field: value for field, value in merged.items() if value}
+
+
+def status_change_delta(books, new_status):
+    """(이전 상태, 가격) 목록의 서적이 모두 new_status 로 바뀔 때의 증감 (queryset.update() 용)"""
+    return merge_deltas(*(
+        delta for old_status, price in books
+        for delta in (book_contribution(old_status, price, sign=-1), book_contribution(new_status, price))
+    ))
+
+
+def apply_delta(seller_id, delta):
+    """
+    요약 행에 증감 반영 (F() 갱신이라 동시 요청에도 안전)
+    행이 없으면 무시 - 처음 조회할 때 DB 기준으로 생성됨 (탈퇴 등 연쇄 삭제 중 행을 다시 만들지 않도록)
+    """
+    if seller_id is None or not delta:
+        return
+    SellerSummary.objects.filter(seller_id=seller_id).update(
+        **{field: F(field) + value for field, value in delta.items()},
+        updated_at=timezone.now(),  # update()는 auto_now 를 적용하지 않음 (조건부 GET 검증자)
+    )
+
+
+def compute_seller_summary(seller_id):
+    from chat.models import ChatRoom
+
+    counts = Book.objects.filter(seller_id=seller_id).aggregate(
+        **{field: Count('id', filter=Q(status=status)) for status, field in STATUS_COUNT_FIELDS.items()},
+        total_listed_value=Sum('price', filter=Q(status='FOR_SALE'), default=0),
+    )
+    counts['open_chat_count'] = ChatRoom.objects.filter(seller_id=seller_id).count()
+    return counts
+
+
+def rebuild_seller_summary(seller_id):
+    """DB 기준으로 요약 재계산 (요약 행이 없거나 bulk_create/update 처럼 시그널 없이 바뀐 경우)"""
+    values = compute_seller_summary(seller_id)
+    try:
+        with transaction.atomic():
+            summary, _ = SellerSummary.objects.update_or_create(seller_id=seller_id, defaults=values)
+    except IntegrityError:
+        # 동시에 다른 요청이 먼저 생성
+        summary = SellerSummary.objects.get(seller_id=seller_id)
+    return summary
+
+
+def get_seller_summary(seller_id):
+    """요약 한 행 조회, 아직 없으면 생성"""
+    summary = SellerSummary.objects.filter(seller_id=seller_id).first()
+    return summary if summary is not None else rebuild_seller_summary(seller_id)
+
+
+def get_seller_summary_with_versions(seller_id):
+    """
+    요약 한 행 + 판매자 서적의 최신 수정 시각/건수/조회수·관심 수 합계 (내 서적 목록 조건부 GET 검증자)를 한 번의 쿼리로 조회
+    (seller, updated_at) 인덱스로 판매자 서적 범위를 찾되, 조회수/관심 수 합계를 위해 해당 서적 행은 읽음
+    (판매자당 서적 수 만큼만), 요약 행이 아직 없으면 생성
+    카운터 일괄 반영은 updated_at 을 바꾸지 않으므로 합계로 변경 감지
+    """
+    books = Book.objects.filter(seller_id=OuterRef('seller_id')).values('seller_id')
+    queryset = SellerSummary.objects.filter(seller_id=seller_id).annotate(
+        books_updated_at=Subquery(books.annotate(value=Max('updated_at')).values('value')),
+        books_count=Subquery(books.annotate(value=Count('id')).values('value')),
+        books_views=Subquery(books.annotate(value=Sum('view_count')).values('value')),
+        books_interest=Subquery(books.annotate(value=Sum('interest_count')).values('value')),
+    )
+    summary = queryset.first()
+    if summary is None:
+        rebuild_seller_summary(seller_id)
+        summary = queryset.first()
+    return summary
@@ -1,3 +1,1481 @@
-from django.test import TestCase
+import asyncio
+import gzip
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import IntegrityError, OperationalError, connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from elastic_transport import ApiResponseMeta, HttpHeaders
+from elasticsearch import ApiError, BadRequestError, ConnectionError as ESConnectionError
+from elasticsearch_dsl import AsyncSearch
+from elasticsearch_dsl.utils import AttrDict
+from PIL import Image
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from chat.models import ChatRoom, Message
+from config.middleware import negotiate_encoding
+from config.renderers import FastJSONRenderer
+from config.testing import QueryPlanAssertionsMixin
+from users.models import User
+from .cache import listing_cache, search_cache
+from .counters import book_counters
+from .derivatives import process_book_images
+from .indexer import DELETE, INDEX, BookIndexer
+from .management.commands.reindex_books import Command as ReindexCommand
+from .models import Book, BookImage, ImageUpload, SellerSummary
+from .pagination import BookCursorPagination
+from .reaper import reap_book
+from .rows import BookRowSerializer
+from .search import (
+    ANALYZER_PROFILES, INDEX_SETTINGS, SEARCH_RESULT_FIELDS, BookDocument, build_book_suggest, encode_search_after, hit_to_result, parse_suggestions,
+)
+from .search_backends import (
+    CircuitBreaker, ElasticsearchBackend, FallbackBackend, SearchUnavailable, get_search_backend, hedged, memory_backend,
+    warm_search_fallback,
+)
+from .serializers import BookSerializer
+from .storage import get_s3_client, object_url, upload_images
+from .summary import compute_seller_summary, rebuild_seller_summary
 
-# Create your tests here.
+
+def create_user(n=1, name='판매자'):
+    """테스트용 사용자 (n 으로 이메일/학번 구분)"""
+    return User.objects.create_user(
+        school_email=f'user{n}@tukorea.ac.kr', name=name, student_id=f'{2020000000 + n}', major='컴퓨터공학과'
+    )
+
+
+class BookQueryCountTests(TestCase):
+    """목록 API가 결과 건수와 무관하게 고정된 쿼리 수로 동작하는지 검증 (N+1 회귀 방지)"""
+    SIZES = (10, 1000, 10000)
+    MAX_QUERIES = 3  # 서적 + 이미지 prefetch (+ 판매자 요약 또는 여유분 1)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.seller = create_user()
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.seller)
+
+    def create_books(self, total):
+        """bulk_create로 생성해 인덱싱 시그널을 타지 않도록 함"""
+        existing = Book.objects.count()
+        books = Book.objects.bulk_create([
+            Book(title=f'책 {i}', chatLink='https://open.kakao.com/o/test', price=1000 + i,
+                 description='설명', major='컴퓨터공학과', seller=self.seller)
+            for i in range(existing, total)
+        ])
+        BookImage.objects.bulk_create([
+            BookImage(book=book, image_url=f'https://bucket.s3.amazonaws.com/image/{book.pk}_{n}.jpg')
+            for book in books for n in range(2)
+        ])
+        rebuild_seller_summary(self.seller.pk)  # bulk_create는 요약 시그널도 보내지 않음
+        listing_cache.bump()  # 목록 캐시 무효화 시그널도 없음
+
+    def assertMaxQueries(self, max_queries, url, data=None):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, data)
+        self.assertEqual(response.status_code, 200)
+        self.assertLessEqual(
+            len(ctx.captured_queries), max_queries,
+            '\n'.join(query['sql'] for query in ctx.captured_queries[:10])
+        )
+        return response
+
+    def test_all_books_query_count(self):
+        for size in self.SIZES:
+            with self.subTest(books=size):
+                self.create_books(size)
+                response = self.assertMaxQueries(self.MAX_QUERIES, '/api/v1/books/all')
+                self.assertTrue(response.data['results'][0]['images'])
+
+    def test_books_by_user_query_count(self):
+        for size in self.SIZES:
+            with self.subTest(books=size):
+                self.create_books(size)
+                response = self.assertMaxQueries(self.MAX_QUERIES, '/api/v1/books/user/')
+                self.assertEqual(len(response.data['books']), size)
+
+    @override_settings(BOOK_SEARCH_BACKEND='elasticsearch')
+    def test_search_query_count(self):
+        """검색은 ES 문서(_source)만으로 응답하므로 DB 쿼리가 없어야 함"""
+        for size in self.SIZES:
+            with self.subTest(books=size):
+                self.create_books(size)
+                hits = [
+                    mock.Mock(meta=mock.Mock(id=str(pk), sort=[1.0, pk]), to_dict=mock.Mock(return_value={'title': title}))
+                    for pk, title in Book.objects.values_list('pk', 'title')
+                ]
+                search_cache.bump()  # bulk_create는 무효화 시그널을 보내지 않음
+                with mock.patch.object(AsyncSearch, 'execute', new_callable=mock.AsyncMock, return_value=hits):
+                    response = self.assertMaxQueries(0, '/api/v1/search/', {'q': '책', 'size': 100})
+                self.assertEqual(len(response.json()['results']), size)
+
+
+class BookCursorPaginationTests(TestCase):
+    """키셋 커서 페이지네이션: 같은 정렬 값이 있어도 중복/누락 없이 순회, page_size 제한, 잘못된 커서"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seller = create_user()
+        Book.objects.bulk_create([
+            Book(title=f'책 {i}', chatLink='https://open.kakao.com/o/test', price=1000, major='컴퓨터공학과', seller=seller,
+                 view_count=i % 2)
+            for i in range(10)
+        ])
+        Book.objects.update(created_at=timezone.now())  # 모두 같은 등록 시각 -> id 로 구분
+
+    def setUp(self):
+        listing_cache.bump()
+
+    def traverse(self, **params):
+        ids, params = [], {'page_size': 3, 'fields': 'id', **params}
+        while True:
+            response = self.client.get('/api/v1/books/all', params)
+            self.assertEqual(response.status_code, 200)
+            ids += [book['id'] for book in response.data['results']]
+            if response.data['next'] is None:
+                return ids
+            params['cursor'] = response.data['next']
+
+    def test_traversal_with_equal_sort_values(self):
+        expected = list(Book.objects.order_by('-id').values_list('id', flat=True))
+        self.assertEqual(self.traverse(), expected)
+        popular = list(Book.objects.order_by('-interest_count', '-view_count', '-id').values_list('id', flat=True))
+        self.assertEqual(self.traverse(sort='popular'), popular)
+
+    @override_settings(BOOK_PAGE_SIZE=4, BOOK_MAX_PAGE_SIZE=5)
+    def test_page_size_clamp(self):
+        for page_size, expected in [(2, 2), (100, 5), (0, 4), ('x', 4)]:
+            with self.subTest(page_size=page_size):
+                response = self.client.get('/api/v1/books/all', {'page_size': page_size})
+                self.assertEqual(len(response.data['results']), expected)
+
+    def test_invalid_cursor(self):
+        pagination = BookCursorPagination()
+        for cursor in ('not-a-cursor', pagination.encode_cursor([1]), pagination.encode_cursor(['yesterday', 1])):
+            with self.subTest(cursor=cursor):
+                self.assertEqual(self.client.get('/api/v1/books/all', {'cursor': cursor}).status_code, 404)
+
+
+@override_settings(BOOK_SEARCH_BACKEND='memory')
+class InMemorySearchTests(TestCase):
+    """ES 없이 인메모리 검색 백엔드로 검색/자동완성 API 검증"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seller = create_user()
+        for title, major, price, book_status in [
+            ('자료구조 입문', '컴퓨터공학과', 15000, 'FOR_SALE'),
+            ('알고리즘 문제 해결', '컴퓨터공학과', 20000, 'FOR_SALE'),
+            ('회로이론', '전자공학부', 12000, 'COMPLETED'),
+            ('C언어 자료구조', '전자공학부', 9000, 'FOR_SALE'),
+        ]:
+            Book.objects.create(
+                title=title, chatLink='https://open.kakao.com/o/test', price=price, description=f'{title} 교재',
+                major=major, status=book_status, seller=seller,
+            )
+
+    def setUp(self):
+        memory_backend.reset()
+        search_cache.bump()
+        self.client = APIClient()
+
+    def search(self, **params):
+        response = self.client.get('/api/v1/search/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_prefix_match_on_title(self):
+        titles = [result['title'] for result in self.search(q='자료')['results']]
+        self.assertCountEqual(titles, ['자료구조 입문', 'C언어 자료구조'])
+
+    def test_filters_and_price_sort(self):
+        data = self.search(major='전자공학부', status='FOR_SALE', sort='price_asc')
+        self.assertEqual([result['title'] for result in data['results']], ['C언어 자료구조'])
+
+    def test_search_after_pagination(self):
+        first = self.search(sort='price_desc', size=2, min_price=1)
+        second = self.search(sort='price_desc', size=2, min_price=1, search_after=first['next'])
+        prices = [result['price'] for result in first['results'] + second['results']]
+        self.assertEqual(prices, [20000, 15000, 12000, 9000])
+
+    def test_invalid_search_after(self):
+        first = self.search(sort='price_desc', size=2, min_price=1)
+        for cursor in (encode_search_after(['x']), encode_search_after([{'a': 1}, 2]), encode_search_after([1.5, 2]),
+                       encode_search_after([True, 1]), 'not-base64!'):
+            response = self.client.get('/api/v1/search/', {'sort': 'price_desc', 'min_price': 1, 'search_after': cursor})
+            self.assertEqual(response.status_code, 400, cursor)
+            self.assertIn('search_after', response.json())
+        # 관련도 정렬 커서(_score 실수)는 가격 정렬에 사용할 수 없음
+        relevance = self.search(q='자료', size=1)['next']
+        response = self.client.get('/api/v1/search/', {'sort': 'price_desc', 'min_price': 1, 'search_after': relevance})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(len(self.search(sort='price_desc', size=2, min_price=1, search_after=first['next'])['results']), 2)
+
+    @override_settings(BOOK_INDEXER_ENABLED=False)
+    def test_changes_applied_after_commit(self):
+        book = Book.objects.get(title='회로이론')
+        self.search(q='회로')  # 색인 생성
+        with self.captureOnCommitCallbacks(execute=True):
+            book.delete()
+        search_cache.bump()
+        self.assertEqual(self.search(q='회로')['results'], [])
+
+    def test_suggest(self):
+        response = self.client.get('/api/v1/search/suggest', {'q': '자료'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['titles'], ['C언어 자료구조', '자료구조 입문'])
+
+    @override_settings(BOOK_SEARCH_BACKEND='auto')
+    def test_fallback_when_elasticsearch_unavailable(self):
+        memory_backend.build()
+        with mock.patch.object(AsyncSearch, 'execute', side_effect=ESConnectionError('unavailable')):
+            titles = [result['title'] for result in self.search(q='알고리즘')['results']]
+        self.assertEqual(titles, ['알고리즘 문제 해결'])
+
+    @override_settings(BOOK_SEARCH_BACKEND='elasticsearch')
+    def test_hedged_request_uses_first_success(self):
+        """느린 첫 요청 대신 hedge 요청의 응답 사용"""
+        async def slow_then_fast(*args, **kwargs):
+            slow_then_fast.calls += 1
+            await asyncio.sleep(1 if slow_then_fast.calls == 1 else 0)
+            return [mock.Mock(meta=mock.Mock(id='1', sort=[1.0, 1]), to_dict=mock.Mock(return_value={'title': 'hedged'}))]
+        slow_then_fast.calls = 0
+
+        backend = ElasticsearchBackend(timeouts={'search': 1, 'suggest': 1}, hedge_delay=0.05)
+        with mock.patch.object(AsyncSearch, 'execute', slow_then_fast):
+            started = time.monotonic()
+            data = async_to_sync(backend.asearch)({'q': '책', 'sort': 'relevance', 'size': 20})
+        self.assertEqual(slow_then_fast.calls, 2)
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertEqual(data['results'][0]['title'], 'hedged')
+
+
+@override_settings(BOOK_SEARCH_BACKEND='memory')
+class BookSuggestTests(TestCase):
+    """자동완성: 제목 중간 단어 접두어, 같은 제목 중복 제거, 개수 제한, ES 요청/응답 변환"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seller = create_user()
+        for title, major in [
+            ('자료구조 입문', '컴퓨터공학과'), ('자료구조 입문', '컴퓨터공학과'), ('자료 구조와 알고리즘', '컴퓨터공학과'),
+            ('자바 프로그래밍', '컴퓨터공학과'), ('전자기학', '전자공학부'),
+        ]:
+            Book.objects.create(title=title, chatLink='https://open.kakao.com/o/test', price=1000, major=major, seller=seller)
+
+    def setUp(self):
+        memory_backend.reset()
+        search_cache.bump()
+
+    def suggest(self, **params):
+        response = self.client.get('/api/v1/search/suggest', params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_dedupe_and_limit(self):
+        self.assertEqual(self.suggest(q='자료')['titles'], ['자료 구조와 알고리즘', '자료구조 입문'])
+        self.assertEqual(len(self.suggest(q='자', k=2)['titles']), 2)
+
+    def test_middle_word_and_major(self):
+        self.assertEqual(self.suggest(q='구조')['titles'], ['자료 구조와 알고리즘'])
+        self.assertEqual(self.suggest(q='전자')['majors'], ['전자공학부'])
+
+    def test_invalid_params(self):
+        self.assertEqual(self.client.get('/api/v1/search/suggest', {'q': '자료', 'k': 11}).status_code, 400)
+        self.assertEqual(self.client.get('/api/v1/search/suggest').status_code, 400)
+
+    def test_elasticsearch_request_and_parsing(self):
+        body = build_book_suggest('자료', 3).to_dict()
+        self.assertEqual(body['size'], 0)
+        self.assertEqual(body['suggest']['titles']['completion'], {'field': 'title_suggest', 'size': 3, 'skip_duplicates': True})
+        response = AttrDict({'suggest': {
+            'titles': [{'options': [{'_source': {'title': title}} for title in ('자료구조', '자료구조', '자료 구조', '자바')]}],
+            'majors': [{'options': [{'text': '컴퓨터공학과'}]}],
+        }})
+        self.assertEqual(parse_suggestions(response, 2), {'titles': ['자료구조', '자료 구조'], 'majors': ['컴퓨터공학과']})
+
+
+def es_api_error(status_code, cls=ApiError):
+    meta = ApiResponseMeta(status=status_code, http_version='1.1', headers=HttpHeaders(), duration=0.0, node=None)
+    return cls(message='error', meta=meta, body={})
+
+
+class FallbackBackendTests(TestCase):
+    """ES 장애(연결/타임아웃/5xx)만 차단기에 집계, 4xx 는 호출자에게 전달, 대체 색인은 차단 시에만 생성"""
+
+    def setUp(self):
+        self.primary = mock.Mock(timeouts={'search': 1, 'suggest': 1})
+        self.fallback = mock.Mock(ready=False)
+        self.fallback.suggest.return_value = {'titles': [], 'majors': []}
+        self.backend = FallbackBackend(self.primary, self.fallback, CircuitBreaker(failure_threshold=2, reset_timeout=60))
+
+    def test_client_error_is_not_an_outage(self):
+        self.primary.suggest.side_effect = es_api_error(400, BadRequestError)
+        for _ in range(3):
+            with self.assertRaises(BadRequestError):
+                self.backend.suggest('자료', 5)
+        self.assertEqual(self.backend.breaker.state, 'closed')
+        self.fallback.suggest.assert_not_called()
+        self.fallback.warm_async.assert_not_called()
+
+    def test_outage_opens_breaker_and_warms_fallback(self):
+        self.fallback.ready = True
+        self.primary.suggest.side_effect = es_api_error(503)
+        with self.assertLogs('book.search_backends', 'WARNING'):
+            self.assertEqual(self.backend.suggest('자료', 5), {'titles': [], 'majors': []})
+        self.fallback.warm_async.assert_not_called()
+
+        self.primary.suggest.side_effect = ESConnectionError('unavailable')
+        with self.assertLogs('book.search_backends', 'WARNING'):
+            self.backend.suggest('자료', 5)
+        self.assertEqual(self.backend.breaker.state, 'open')
+        self.fallback.warm_async.assert_called()
+        # 차단 중에는 ES 를 호출하지 않음
+        self.backend.suggest('자료', 5)
+        self.assertEqual(self.primary.suggest.call_count, 2)
+
+    def test_fallback_not_ready(self):
+        """대체 색인이 아직 없으면 차단 전/후 모두 요청 경로에서 생성하지 않고 예외 (뷰에서 503)"""
+        self.primary.suggest.side_effect = ESConnectionError('unavailable')
+        for _ in range(2):
+            with self.assertLogs('book.search_backends', 'WARNING'), self.assertRaises(ESConnectionError):
+                self.backend.suggest('자료', 5)
+        self.assertEqual(self.backend.breaker.state, 'open')
+        with self.assertRaises(SearchUnavailable):
+            self.backend.suggest('자료', 5)
+        self.fallback.suggest.assert_not_called()
+        self.fallback.warm_async.assert_called()  # 생성은 백그라운드에서
+
+        self.fallback.ready = True
+        self.assertEqual(self.backend.suggest('자료', 5), {'titles': [], 'majors': []})
+        self.assertEqual(self.primary.suggest.call_count, 2)
+
+    @override_settings(BOOK_SEARCH_BACKEND='auto')
+    def test_not_ready_view_status(self):
+        search_cache.bump()
+        backend = FallbackBackend(self.primary, self.fallback, CircuitBreaker(failure_threshold=1, reset_timeout=60))
+        backend.breaker.record_failure()
+        with mock.patch('book.views.get_search_backend', return_value=backend):
+            self.assertEqual(self.client.get('/api/v1/search/suggest', {'q': '자료'}).status_code, 503)
+
+    @override_settings(BOOK_SEARCH_BACKEND='auto')
+    def test_backend_lookup_does_not_build_fallback(self):
+        with mock.patch.object(memory_backend, 'warm_async') as warm:
+            get_search_backend()
+        warm.assert_not_called()
+        # 서버 시작 시에만 미리 생성
+        with mock.patch.object(memory_backend, 'warm_async') as warm:
+            warm_search_fallback()
+        warm.assert_called_once()
+
+    @override_settings(BOOK_SEARCH_BACKEND='elasticsearch')
+    def test_search_view_status(self):
+        search_cache.bump()
+        with mock.patch.object(AsyncSearch, 'execute', side_effect=es_api_error(400, BadRequestError)):
+            self.assertEqual(self.client.get('/api/v1/search/', {'q': '책'}).status_code, 400)
+        with mock.patch.object(AsyncSearch, 'execute', side_effect=ESConnectionError('unavailable')):
+            self.assertEqual(self.client.get('/api/v1/search/', {'q': '책'}).status_code, 503)
+
+
+class BookQueryPlanTests(QueryPlanAssertionsMixin, TestCase):
+    """서적 API 쿼리가 인덱스로 처리되는지 실행 계획으로 검증 (전체 스캔/인덱스 없는 정렬 회귀 방지)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.sellers = [create_user(n) for n in range(3)]
+        books = Book.objects.bulk_create([
+            Book(title=f'책 {i}', chatLink='https://open.kakao.com/o/test', price=1000 + i, description='설명',
+                 major='컴퓨터공학과', status=['FOR_SALE', 'IN_PROGRESS', 'COMPLETED'][i % 3],
+                 seller=cls.sellers[i % 3])
+            for i in range(60)
+        ])
+        BookImage.objects.bulk_create([
+            BookImage(book=book, image_url=f'https://bucket.s3.amazonaws.com/image/{book.pk}.jpg') for book in books
+        ])
+        cls.book = books[0]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.sellers[0])
+        # 목록 캐시를 끄고 매 요청의 DB 쿼리를 검사
+        patcher = mock.patch.object(listing_cache, 'pages', 0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_all_books_plan(self):
+        first = self.client.get('/api/v1/books/all', {'page_size': 10})
+        self.assertIndexedPlans(lambda: self.client.get('/api/v1/books/all', {'page_size': 10}))
+        # 두 번째 페이지부터는 키셋 조건 (created_at, id) < (...)
+        self.assertIndexedPlans(
+            lambda: self.client.get('/api/v1/books/all', {'page_size': 10, 'cursor': first.data['next']})
+        )
+
+    def test_all_books_ndjson_plan(self):
+        self.assertIndexedPlans(lambda: self.client.get('/api/v1/books/all', HTTP_ACCEPT='application/x-ndjson'))
+
+    def test_popular_books_plan(self):
+        first = self.client.get('/api/v1/books/all', {'page_size': 10, 'sort': 'popular'})
+        self.assertIndexedPlans(
+            lambda: self.client.get('/api/v1/books/all', {'page_size': 10, 'sort': 'popular', 'cursor': first.data['next']})
+        )
+
+    def test_books_by_user_plan(self):
+        self.assertIndexedPlans(lambda: self.client.get('/api/v1/books/user/'))
+        self.assertIndexedPlans(lambda: self.client.get('/api/v1/books/user/', HTTP_ACCEPT='application/x-ndjson'))
+
+    def test_book_detail_plan(self):
+        self.assertIndexedPlans(lambda: self.client.get(f'/api/v1/books/{self.book.pk}/'))
+
+
+@override_settings(BOOK_INDEXER_ENABLED=False)
+class SellerSummaryTests(TestCase):
+    """판매자 요약 증감 반영이 DB 재계산 결과와 일치하는지 검증"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.seller = create_user()
+        cls.buyer = create_user(2, name='구매자')
+
+    def create_book(self, price, **kwargs):
+        return Book.objects.create(
+            title='책', chatLink='https://open.kakao.com/o/test', price=price, major='컴퓨터공학과', seller=self.seller,
+            **kwargs
+        )
+
+    def assertSummaryConsistent(self):
+        summary = SellerSummary.objects.get(seller=self.seller)
+        expected = compute_seller_summary(self.seller.pk)
+        self.assertEqual({field: getattr(summary, field) for field in expected}, expected)
+        return summary
+
+    def test_incremental_updates(self):
+        rebuild_seller_summary(self.seller.pk)
+        first = self.create_book(10000)
+        second = self.create_book(5000)
+        self.create_book(7000, status='COMPLETED')
+        self.assertEqual(self.assertSummaryConsistent().total_listed_value, 15000)
+
+        # 상태/가격 변경은 조회 시점 값과의 차이만큼 반영
+        book = Book.objects.get(pk=first.pk)
+        book.status, book.price = 'IN_PROGRESS', 12000
+        book.save()
+        second.price = 6000
+        second.save()
+        summary = self.assertSummaryConsistent()
+        self.assertEqual((summary.for_sale_count, summary.in_progress_count), (1, 1))
+
+        ChatRoom.objects.create(buyer=self.buyer, book=second, seller=self.seller)
+        self.assertEqual(self.assertSummaryConsistent().open_chat_count, 1)
+
+        second.delete()  # 채팅방도 함께 삭제
+        summary = self.assertSummaryConsistent()
+        self.assertEqual((summary.for_sale_count, summary.open_chat_count, summary.total_listed_value), (0, 0, 0))
+
+    def test_status_rank_ordering(self):
+        completed = self.create_book(1000, status='COMPLETED')
+        for_sale = self.create_book(1000)
+        in_progress = self.create_book(1000, status='IN_PROGRESS')
+        client = APIClient()
+        client.force_authenticate(user=self.seller)
+        response = client.get('/api/v1/books/user/')
+        self.assertEqual([book['id'] for book in response.data['books']], [for_sale.pk, in_progress.pk, completed.pk])
+        self.assertEqual(response.data['summary']['for_sale_count'], 1)
+
+
+class BookBatchTests(TestCase):
+    """여러 서적 조회 / 거래 상태 일괄 변경"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.seller, cls.other = [create_user(n) for n in range(2)]
+        cls.books = [
+            Book.objects.create(
+                title=f'책 {i}', chatLink='https://open.kakao.com/o/test', price=1000 * (i + 1), major='컴퓨터공학과',
+                seller=cls.seller,
+            )
+            for i in range(3)
+        ]
+        cls.others_book = Book.objects.create(
+            title='남의 책', chatLink='https://open.kakao.com/o/test', price=1000, major='컴퓨터공학과', seller=cls.other
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.seller)
+
+    def test_multi_get(self):
+        ids = [self.books[2].pk, 999999, self.books[0].pk]
+        with self.assertNumQueries(2):  # 서적 + 이미지 prefetch
+            response = self.client.get('/api/v1/books/', {'ids': ','.join(map(str, ids))})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([book['id'] for book in response.data['results']], [self.books[2].pk, self.books[0].pk])
+        self.assertEqual(response.data['missing'], [999999])
+
+    def test_multi_get_invalid_ids(self):
+        self.assertEqual(self.client.get('/api/v1/books/', {'ids': '1,abc'}).status_code, 400)
+
+    def test_bulk_status_update(self):
+        rebuild_seller_summary(self.seller.pk)
+        ids = [book.pk for book in self.books[:2]]
+        with mock.patch('book.signals.book_indexer') as indexer, self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch('/api/v1/books/', {'ids': ids, 'status': 'COMPLETED'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sorted(response.data['updated']), ids)
+        self.assertEqual(sorted(call.args[0] for call in indexer.index.call_args_list), ids)
+        self.assertEqual(Book.objects.filter(pk__in=ids, status='COMPLETED', status_rank=1).count(), 2)
+
+        summary = SellerSummary.objects.get(seller=self.seller)
+        expected = compute_seller_summary(self.seller.pk)
+        self.assertEqual({field: getattr(summary, field) for field in expected}, expected)
+
+    def test_bulk_status_update_requires_ownership(self):
+        ids = [self.books[0].pk, self.others_book.pk]
+        response = self.client.patch('/api/v1/books/', {'ids': ids, 'status': 'COMPLETED'}, format='json')
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.data['ids'], [self.others_book.pk])
+        self.assertFalse(Book.objects.filter(status='COMPLETED').exists())  # 하나도 변경되지 않음
+
+
+class BookRowSerializerTests(TestCase):
+    """.values() 기반 목록 직렬화가 BookSerializer 와 같은 결과를 내는지 검증"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.seller = create_user()
+        for i in range(3):
+            book = Book.objects.create(
+                title=f'책 {i}', chatLink='https://open.kakao.com/o/test', price=1000 * (i + 1), description='설명',
+                major='컴퓨터공학과', seller=cls.seller,
+            )
+            BookImage.objects.bulk_create([
+                BookImage(book=book, image_url=f'https://bucket.s3.amazonaws.com/image/{book.pk}_{n}.jpg',
+                          thumbnail_url=f'https://bucket.s3.amazonaws.com/thumb/{book.pk}_{n}.webp' if n else None)
+                for n in range(i)
+            ])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.seller)
+        listing_cache.bump()  # TestCase 는 커밋하지 않으므로 무효화(on_commit)가 실행되지 않음
+
+    def test_matches_book_serializer(self):
+        queryset = Book.objects.order_by('-created_at', '-id')
+        rows = BookRowSerializer()
+        expected = BookSerializer(queryset.with_related(), many=True).data
+        self.assertEqual(rows.serialize(rows.queryset(queryset)), [dict(book) for book in expected])
+
+    def test_sparse_fields(self):
+        response = self.client.get('/api/v1/books/all', {'fields': 'id,title,price,thumbnail'})
+        self.assertEqual(response.status_code, 200)
+        for book in response.data['results']:
+            self.assertEqual(list(book), ['id', 'title', 'price', 'thumbnail'])
+        # 썸네일이 아직 없으면 첫 이미지 원본, 이미지가 없으면 None
+        thumbnails = {book['title']: book['thumbnail'] for book in response.data['results']}
+        self.assertIsNone(thumbnails['책 0'])
+        self.assertTrue(thumbnails['책 1'].endswith('_0.jpg'))
+
+    def test_unknown_field(self):
+        response = self.client.get('/api/v1/books/user/', {'fields': 'id,password'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('fields', response.data)
+
+
+class NDJSONExportTests(TestCase):
+    """NDJSON 내보내기: 키셋 청크 단위 전송, JSON 응답과 같은 정렬"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.seller = create_user()
+        statuses = ['COMPLETED', 'FOR_SALE', 'IN_PROGRESS']
+        cls.books = Book.objects.bulk_create([
+            Book(title=f'책 {i}', chatLink='https://open.kakao.com/o/test', price=1000, major='컴퓨터공학과',
+                 seller=cls.seller, status=statuses[i % 3])
+            for i in range(7)
+        ])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.seller)
+
+    @override_settings(BOOK_EXPORT_CHUNK_SIZE=3)
+    def test_async_stream_in_chunks(self):
+        async def export():
+            response = await self.async_client.get('/api/v1/books/all', headers={'Accept': 'application/x-ndjson'})
+            return response, [chunk async for chunk in response.streaming_content]
+
+        response, chunks = async_to_sync(export)()
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_async)
+        self.assertTrue(response['Content-Type'].startswith('application/x-ndjson'))
+        # 청크(3권)마다 한 번씩 조회/전송
+        self.assertEqual([len(chunk.splitlines()) for chunk in chunks], [3, 3, 1])
+        ids = [json.loads(line)['id'] for chunk in chunks for line in chunk.splitlines()]
+        self.assertEqual(ids, sorted((book.pk for book in self.books), reverse=True))
+
+    @override_settings(BOOK_EXPORT_CHUNK_SIZE=2)
+    def test_user_books_same_order_as_json(self):
+        listing = self.client.get('/api/v1/books/user/')
+        response = self.client.get('/api/v1/books/user/', HTTP_ACCEPT='application/x-ndjson')
+        self.assertTrue(response['Content-Type'].startswith('application/x-ndjson'))
+        lines = b''.join(response.streaming_content).splitlines()
+        self.assertEqual([json.loads(line)['id'] for line in lines], [book['id'] for book in listing.data['books']])
+        self.assertEqual(listing.data['books'][0]['status'], 'FOR_SALE')
+
+
+class ResponseRenderingTests(TestCase):
+    """기본 JSON 렌더러 출력 호환성 / 응답 압축 협상"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seller = create_user()
+        Book.objects.bulk_create([
+            Book(title=f'책 {i}', chatLink='https://open.kakao.com/o/test', price=1000, description='설명 ' * 20,
+                 major='컴퓨터공학과', seller=seller)
+            for i in range(20)
+        ])
+
+    def setUp(self):
+        listing_cache.bump()
+
+    def test_fast_renderer_matches_drf(self):
+        data = {
+            'time': timezone.now(), 'price': Decimal('1000.50'), 'id': uuid.uuid4(), 'title': '운영체제\u2028',
+            'nested': [{'n': 1, 'none': None, 'ok': True}],
+        }
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_negotiate_encoding(self):
+        self.assertEqual(negotiate_encoding('gzip, deflate, br'), 'br')
+        self.assertEqual(negotiate_encoding('br;q=0.5, gzip'), 'gzip')
+        self.assertEqual(negotiate_encoding('gzip;q=0, br;q=0'), None)
+        self.assertEqual(negotiate_encoding('identity'), None)
+
+    @override_settings(RESPONSE_COMPRESSION_MIN_BYTES=1024)
+    def test_compresses_large_response(self):
+        response = self.client.get('/api/v1/books/all', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(len(json.loads(gzip.decompress(response.content))['results']), 20)
+
+    @override_settings(RESPONSE_COMPRESSION_MIN_BYTES=10 ** 7)
+    def test_skips_small_response(self):
+        response = self.client.get('/api/v1/books/all', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(len(response.json()['results']), 20)
+
+    def test_compresses_ndjson_stream(self):
+        response = self.client.get('/api/v1/books/all', HTTP_ACCEPT='application/x-ndjson', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        lines = gzip.decompress(b''.join(response.streaming_content)).splitlines()
+        self.assertEqual(len(lines), 20)
+
+
+class ConditionalGetTests(TestCase):
+    """서적 상세/내 서적 목록 조건부 GET: 변경이 없으면 직렬화 없이 검증자 쿼리 한 번으로 304"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.seller = create_user()
+        cls.books = [
+            Book.objects.create(
+                title=f'책 {i}', chatLink='https://open.kakao.com/o/test', price=1000, major='컴퓨터공학과', seller=cls.seller
+            )
+            for i in range(3)
+        ]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.seller)
+
+    def assertNotModified(self, url, **headers):
+        with self.assertNumQueries(1):
+            response = self.client.get(url, **headers)
+        self.assertEqual(response.status_code, 304)
+
+    def test_book_detail(self):
+        url = f'/api/v1/books/{self.books[0].pk}/'
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('private', response['Cache-Control'])
+        self.assertNotModified(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertNotModified(url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+
+        time.sleep(0.001)
+        self.client.patch(url, {'price': 2000}, format='json')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['price'], 2000)
+
+    def test_book_detail_not_found(self):
+        self.assertEqual(self.client.get('/api/v1/books/999999/').status_code, 404)
+
+    def test_my_books(self):
+        url = '/api/v1/books/user/'
+        etag = self.client.get(url)['ETag']
+        self.assertNotModified(url, HTTP_IF_NONE_MATCH=etag)
+        # 응답 필드가 다르면 다른 표현
+        self.assertEqual(self.client.get(url, {'fields': 'id'}, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+        # 삭제는 최신 수정 시각을 바꾸지 않아도 건수로 감지
+        with mock.patch('book.signals.book_indexer'):
+            self.books[0].delete()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['books']), 2)
+
+
+@override_settings(BOOK_SEARCH_BACKEND='memory')
+class SearchCacheTests(TestCase):
+    """세대 번호 기반 검색 결과 캐시: 적중/미적중 집계, 커밋 후 무효화"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.seller = create_user()
+        cls.book = Book.objects.create(
+            title='자료구조', chatLink='https://open.kakao.com/o/test', price=1000, major='컴퓨터공학과', seller=cls.seller
+        )
+
+    def setUp(self):
+        search_cache.cache.clear()
+        memory_backend.reset()
+
+    def test_hit_and_miss(self):
+        self.assertIsNone(search_cache.get({'q': '책', 'size': 20}))
+        search_cache.set({'q': '책', 'size': 20}, {'results': []})
+        self.assertEqual(search_cache.get({'size': 20, 'q': '책'}), {'results': []})  # 파라미터 순서 무관
+        self.assertIsNone(search_cache.get({'q': '책', 'size': 10}))
+        stats = search_cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['hit_ratio']), (1, 2, 0.3333))
+
+    def test_search_served_from_cache(self):
+        self.client.get('/api/v1/search/', {'q': '자료'})
+        with mock.patch.object(memory_backend, 'search') as search:
+            response = self.client.get('/api/v1/search/', {'q': '자료'})
+        search.assert_not_called()
+        self.assertEqual([result['title'] for result in response.json()['results']], ['자료구조'])
+
+    def test_async_view_does_not_block_event_loop(self):
+        on_loop = []
+
+        def record(call):
+            def wrapper(*args):
+                try:
+                    asyncio.get_running_loop()
+                    on_loop.append(True)
+                except RuntimeError:
+                    on_loop.append(False)
+                return call(*args)
+            return wrapper
+
+        with mock.patch.object(search_cache, 'get', record(search_cache.get)), \
+                mock.patch.object(search_cache, 'set', record(search_cache.set)):
+            self.assertEqual(self.client.get('/api/v1/search/', {'q': '자료'}).status_code, 200)
+        self.assertEqual(on_loop, [False, False])  # 캐시 조회/저장 모두 이벤트 루프 밖(스레드)에서
+
+    @override_settings(BOOK_INDEXER_ENABLED=False)
+    def test_invalidated_on_commit(self):
+        search_cache.set({'q': '자료'}, {'results': []})
+        generation = search_cache.generation()
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.book.price = 2000
+            self.book.save()
+            self.assertEqual(search_cache.generation(), generation)  # 커밋 전에는 이전 결과 유지
+        for callback in callbacks:
+            callback()
+        self.assertGreater(search_cache.generation(), generation)
+        self.assertIsNone(search_cache.get({'q': '자료'}))
+
+
+class ListingCacheTests(TestCase):
+    """공개 서적 목록 캐시: 앞쪽 페이지 캐시, 무효화, 만료 후 재계산 중복 방지, 미리 갱신"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seller = create_user()
+        Book.objects.bulk_create([
+            Book(title=f'책 {i}', chatLink='https://open.kakao.com/o/test', price=1000, major='컴퓨터공학과', seller=seller)
+            for i in range(5)
+        ])
+        cls.seller = seller
+
+    def setUp(self):
+        listing_cache.bump()
+        self.page = {'cursor': None, 'page_size': 2, 'fields': ['id']}
+
+    def test_caches_first_pages_only(self):
+        with mock.patch.object(listing_cache, 'pages', 2):
+            first = self.client.get('/api/v1/books/all', {'page_size': 2, 'fields': 'id'}).data
+            second = self.client.get('/api/v1/books/all', {'page_size': 2, 'fields': 'id', 'cursor': first['next']}).data
+            with self.assertNumQueries(0):
+                self.client.get('/api/v1/books/all', {'page_size': 2, 'fields': 'id'})
+                self.client.get('/api/v1/books/all', {'page_size': 2, 'fields': 'id', 'cursor': first['next']})
+            # 세 번째 페이지는 캐시하지 않음
+            with self.assertNumQueries(1):
+                self.client.get('/api/v1/books/all', {'page_size': 2, 'fields': 'id', 'cursor': second['next']})
+
+    def test_invalidated_on_commit(self):
+        self.client.get('/api/v1/books/all')
+        with mock.patch('book.signals.book_indexer'), self.captureOnCommitCallbacks(execute=True):
+            Book.objects.create(
+                title='새 책', chatLink='https://open.kakao.com/o/test', price=1000, major='컴퓨터공학과', seller=self.seller
+            )
+        response = self.client.get('/api/v1/books/all')
+        self.assertEqual(response.data['results'][0]['title'], '새 책')
+
+    def test_single_recompute_after_expiry(self):
+        compute = mock.Mock(return_value={'next': None, 'results': [1]})
+        listing_cache.get_page(self.page, compute)
+        with mock.patch('book.cache.time.time', return_value=time.time() + listing_cache.timeout + 1):
+            # 다른 워커가 재계산 중(락 보유)이면 이전 값으로 응답
+            key = listing_cache.make_key(self.page)
+            self.assertTrue(listing_cache._lock(key))
+            compute.return_value = {'next': None, 'results': [2]}
+            self.assertEqual(listing_cache.get_page(self.page, compute)['results'], [1])
+            self.assertEqual(compute.call_count, 1)
+            # 락이 풀리면 한 번만 재계산
+            listing_cache.cache.delete(f'{key}:lock')
+            self.assertEqual(listing_cache.get_page(self.page, compute)['results'], [2])
+        self.assertEqual(compute.call_count, 2)
+        stats = listing_cache.stats()
+        self.assertGreaterEqual(stats['stale_hits'], 1)
+        self.assertIsNotNone(stats['recompute_ms_avg'])
+
+    def test_refresh_ahead(self):
+        compute = mock.Mock(return_value={'next': None, 'results': [1]})
+        executor = mock.Mock(submit=lambda fn, *args: fn(*args))  # 백그라운드 갱신을 즉시 실행
+        with mock.patch.object(listing_cache, 'refresh_ahead', 0.5), \
+                mock.patch.object(listing_cache, '_background', return_value=executor), \
+                mock.patch('book.cache.close_old_connections'):
+            listing_cache.get_page(self.page, compute)
+            compute.return_value = {'next': None, 'results': [2]}
+            with mock.patch('book.cache.time.time', return_value=time.time() + listing_cache.timeout * 0.6):
+                self.assertEqual(listing_cache.get_page(self.page, compute)['results'], [1])  # 응답은 기존 값
+            self.assertEqual(listing_cache.get_page(self.page, compute)['results'], [2])
+        self.assertEqual(compute.call_count, 2)
+
+
+@override_settings(BOOK_REAPER_MESSAGE_BATCH=2, BOOK_REAPER_BATCH_PAUSE=0)
+class SoftDeleteTests(TestCase):
+    """서적 삭제: 즉시 숨김 + 판매자 요약 반영, 정리 작업에서 메시지 배치 삭제/S3 일괄 삭제/행 삭제"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.seller, cls.buyer = [create_user(n) for n in range(2)]
+        cls.book = Book.objects.create(
+            title='책', chatLink='https://open.kakao.com/o/test', price=1000, major='컴퓨터공학과', seller=cls.seller
+        )
+        BookImage.objects.create(
+            book=cls.book, image_url=object_url('image/a.jpg'),
+            thumbnail_url=object_url('image/derivatives/a_thumbnail.webp'),
+        )
+        room = ChatRoom.objects.create(buyer=cls.buyer, book=cls.book, seller=cls.seller)
+        Message.objects.bulk_create([Message(chatRoom=room, sender=cls.buyer, content=f'메시지 {n}') for n in range(5)])
+        rebuild_seller_summary(cls.seller.pk)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.seller)
+        listing_cache.bump()
+
+    def assertSummaryConsistent(self):
+        summary = SellerSummary.objects.get(seller=self.seller)
+        expected = compute_seller_summary(self.seller.pk)
+        self.assertEqual({field: getattr(summary, field) for field in expected}, expected)
+
+    def soft_delete(self):
+        with mock.patch('book.signals.book_indexer') as indexer, mock.patch('book.reaper.get_executor') as executor, \
+                self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(f'/api/v1/books/{self.book.pk}/')
+        self.assertEqual(response.status_code, 204)
+        executor.return_value.submit.assert_called_once()
+        indexer.index.assert_called_once_with(self.book.pk)  # 색인에서 빠짐 (삭제 대기 서적은 조회되지 않음)
+
+    def test_delete_hides_book(self):
+        self.soft_delete()
+        self.assertEqual(self.client.get(f'/api/v1/books/{self.book.pk}/').status_code, 404)
+        self.assertEqual(self.client.get('/api/v1/books/all').data['results'], [])
+        self.assertEqual(self.client.delete(f'/api/v1/books/{self.book.pk}/').status_code, 404)
+        self.assertTrue(Book.all_objects.filter(pk=self.book.pk).exists())  # 행/메시지는 정리 전까지 남음
+        self.assertEqual(Message.objects.count(), 5)
+        self.assertSummaryConsistent()
+
+    def test_reap(self):
+        self.soft_delete()
+        with mock.patch('book.reaper.delete_objects', return_value=[]) as delete_objects, \
+                mock.patch('book.signals.book_indexer'), CaptureQueriesContext(connection) as ctx:
+            self.assertTrue(reap_book(self.book.pk))
+        delete_objects.assert_called_once_with(['image/a.jpg', 'image/derivatives/a_thumbnail.webp'])
+        # 메시지 5개를 2개씩 나눠 삭제
+        message_deletes = [query for query in ctx.captured_queries if query['sql'].startswith('DELETE FROM "Message"')]
+        self.assertEqual(len(message_deletes), 3)
+        self.assertFalse(Book.all_objects.filter(pk=self.book.pk).exists())
+        self.assertFalse(ChatRoom.objects.exists())
+        self.assertFalse(Message.objects.exists())
+        self.assertSummaryConsistent()
+        self.assertFalse(reap_book(self.book.pk))
+
+    def test_reap_keeps_rows_when_storage_fails(self):
+        self.soft_delete()
+        with mock.patch('book.reaper.delete_objects', return_value=['image/a.jpg']), self.assertRaises(RuntimeError):
+            reap_book(self.book.pk)
+        self.assertTrue(Book.all_objects.filter(pk=self.book.pk).exists())
+        self.assertTrue(BookImage.objects.filter(book=self.book).exists())
+
+
+class BookCounterTests(TestCase):
+    """조회수/관심 수: 메모리에 합산 후 일괄 UPDATE, 인기순 목록"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.seller, cls.buyer = [create_user(n) for n in range(2)]
+        cls.books = Book.objects.bulk_create([
+            Book(title=f'책 {i}', chatLink='https://open.kakao.com/o/test', price=1000, major='컴퓨터공학과', seller=cls.seller)
+            for i in range(3)
+        ])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.buyer)
+        listing_cache.bump()
+        patcher = mock.patch.object(book_counters, '_pending', {})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_views_are_buffered(self):
+        for book, views in zip(self.books, (3, 1, 1)):
+            for _ in range(views):
+                self.assertEqual(self.client.get(f'/api/v1/books/{book.pk}/').status_code, 200)
+        self.assertEqual(Book.objects.filter(view_count__gt=0).count(), 0)  # 요청마다 UPDATE 하지 않음
+
+        # 증가량이 같은 서적끼리 묶어 UPDATE (3, 1 두 묶음)
+        with self.assertNumQueries(2):
+            self.assertEqual(book_counters.flush(), 3)
+        self.assertEqual(
+            list(Book.objects.order_by('id').values_list('view_count', flat=True)), [3, 1, 1]
+        )
+        with self.assertNumQueries(0):
+            self.assertEqual(book_counters.flush(), 0)
+
+    def test_counters_and_conditional_get(self):
+        """상세/내 서적 목록 모두 카운터를 검증자에 포함, 재검증 요청은 조회수로 세지 않음"""
+        url = f'/api/v1/books/{self.books[0].pk}/'
+        etag = self.client.get(url)['ETag']
+        book_counters.flush()
+        # 반영된 카운터는 새 ETag 로 전달, 재검증(200/304)은 조회수를 늘리지 않으므로 이후 ETag 는 그대로
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual((response.status_code, response.data['view_count']), (200, 1))
+        etag = response['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertEqual(book_counters.flush(), 0)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        seller = APIClient()
+        seller.force_authenticate(user=self.seller)
+        my_books = seller.get('/api/v1/books/user/')['ETag']
+        self.client.get(url)  # 새 조회
+        book_counters.flush()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+        # 카운터 반영은 updated_at 을 바꾸지 않지만 내 서적 목록도 새 값으로 응답
+        response = seller.get('/api/v1/books/user/', HTTP_IF_NONE_MATCH=my_books)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual({book['id']: book['view_count'] for book in response.data['books']}[self.books[0].pk], 2)
+
+    def test_interest_from_chatrooms(self):
+        with mock.patch('book.signals.book_indexer'), self.captureOnCommitCallbacks(execute=True):
+            room = ChatRoom.objects.create(buyer=self.buyer, book=self.books[1], seller=self.seller)
+        book_counters.flush()
+        self.assertEqual(Book.objects.get(pk=self.books[1].pk).interest_count, 1)
+
+        with mock.patch('book.signals.book_indexer'), self.captureOnCommitCallbacks(execute=True):
+            room.delete()
+        book_counters.flush()
+        self.assertEqual(Book.objects.get(pk=self.books[1].pk).interest_count, 0)
+
+    def test_failed_flush_is_retried(self):
+        book_counters.view(self.books[0].pk)
+        with mock.patch('django.db.models.query.QuerySet.update', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                book_counters.flush()
+        book_counters.view(self.books[0].pk)
+        book_counters.flush()
+        self.assertEqual(Book.objects.get(pk=self.books[0].pk).view_count, 2)
+
+    def test_popular_sort(self):
+        Book.objects.filter(pk=self.books[0].pk).update(interest_count=1)
+        Book.objects.filter(pk=self.books[2].pk).update(interest_count=1, view_count=5)
+        response = self.client.get('/api/v1/books/all', {'sort': 'popular', 'page_size': 2})
+        self.assertEqual([book['id'] for book in response.data['results']], [self.books[2].pk, self.books[0].pk])
+        self.assertEqual(response.data['results'][0]['view_count'], 5)
+        response = self.client.get('/api/v1/books/all', {'sort': 'popular', 'page_size': 2, 'cursor': response.data['next']})
+        self.assertEqual([book['id'] for book in response.data['results']], [self.books[1].pk])
+
+    def test_unknown_sort(self):
+        self.assertEqual(self.client.get('/api/v1/books/all', {'sort': 'price'}).status_code, 400)
+
+
+class FakeElasticsearch:
+    """reindex_books 가 사용하는 인덱스/alias API 만 흉내 낸 메모리 ES (인덱스 -> {id: 문서})"""
+
+    def __init__(self):
+        self.docs = {}
+        self.aliases = {}  # alias -> 인덱스 목록
+        self.indices = self
+        self.on_update_aliases = None
+        self.on_bulk = None
+
+    def put_settings(self, index, settings):
+        self.docs.setdefault(index, {})
+
+    def refresh(self, index):
+        pass
+
+    def exists_alias(self, name):
+        return name in self.aliases
+
+    def get_alias(self, name):
+        return {index: {} for index in self.aliases[name]}
+
+    def exists(self, index):
+        return index in self.docs
+
+    def update_aliases(self, actions):
+        if self.on_update_aliases:
+            self.on_update_aliases()
+        for action in actions:
+            if 'add' in action:
+                self.aliases.setdefault(action['add']['alias'], []).append(action['add']['index'])
+
+    def delete(self, index, ignore_unavailable=False):
+        self.docs.pop(index, None)
+
+    def bulk(self, client, actions, **kwargs):
+        count = 0
+        for action in actions:
+            docs = self.docs.setdefault(action['_index'], {})
+            if action['_op_type'] == 'delete':
+                docs.pop(str(action['_id']), None)
+            else:
+                docs[str(action['_id'])] = action['_source']
+            count += 1
+        if self.on_bulk:
+            self.on_bulk()
+        return count, []
+
+    def scan(self, client, index, **kwargs):
+        return [{'_id': doc_id} for doc_id in list(self.docs.get(index, {}))]
+
+
+@override_settings(BOOK_INDEXER_ENABLED=False)
+class ReindexBooksCommandTests(TransactionTestCase):
+    """무중단 재인덱싱: 적재 중 삭제된 서적(고아 문서)과 alias 교체 전후의 변경이 새 인덱스에 반영되는지 검증"""
+
+    def setUp(self):
+        self.seller = create_user()
+        self.books = [
+            Book.objects.create(
+                title=f'책 {i}', chatLink='https://open.kakao.com/o/test', price=1000, major='컴퓨터공학과', seller=self.seller
+            )
+            for i in range(5)
+        ]
+        self.es = FakeElasticsearch()
+        module = 'book.management.commands.reindex_books'
+        for patcher in (
+            mock.patch.object(BookDocument, '_get_connection', return_value=self.es),
+            mock.patch.object(type(BookDocument._index), 'create'),
+            mock.patch(f'{module}.bulk', side_effect=self.es.bulk),
+            mock.patch(f'{module}.scan', side_effect=self.es.scan),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        checkpoint_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(checkpoint_dir.cleanup)
+        self.checkpoint = os.path.join(checkpoint_dir.name, 'checkpoint.json')
+
+    def reindex(self):
+        call_command('reindex_books', workers=1, chunk_size=2, checkpoint=self.checkpoint, stdout=StringIO())
+        (index,) = self.es.aliases['books']
+        return self.es.docs[index]
+
+    def test_deleted_during_reindex(self):
+        def delete_indexed_book():
+            self.es.on_bulk = None
+            Book.objects.filter(pk=self.books[0].pk).delete()  # 첫 청크로 이미 적재된 서적 삭제
+
+        self.es.on_bulk = delete_indexed_book
+        docs = self.reindex()
+        self.assertEqual(sorted(map(int, docs)), sorted(Book.objects.values_list('id', flat=True)))
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+    def test_writes_around_alias_swap(self):
+        def write_during_swap():
+            Book.objects.filter(pk=self.books[1].pk).update(title='수정된 제목', updated_at=timezone.now())
+            Book.objects.filter(pk=self.books[2].pk).update(deleted_at=timezone.now())
+            self.added = Book.objects.create(
+                title='새 책', chatLink='https://open.kakao.com/o/test', price=1000, major='컴퓨터공학과', seller=self.seller
+            )
+
+        self.es.on_update_aliases = write_during_swap
+        docs = self.reindex()
+        self.assertEqual(docs[str(self.books[1].pk)]['title'], '수정된 제목')
+        self.assertNotIn(str(self.books[2].pk), docs)
+        self.assertIn(str(self.added.pk), docs)
+        self.assertEqual(len(docs), 5)
+
+    def test_resync_in_chunks(self):
+        """적재 중 수정된 서적도 chunk_size 단위로 나눠 다시 적재"""
+        def update_during_bulk():
+            self.es.on_bulk = None
+            Book.objects.filter(pk__in=[book.pk for book in self.books[:3]]).update(title='수정된 제목', updated_at=timezone.now())
+
+        self.es.on_bulk = update_during_bulk
+        with mock.patch.object(ReindexCommand, 'index_chunk', autospec=True, side_effect=ReindexCommand.index_chunk) as index_chunk:
+            docs = self.reindex()
+        self.assertTrue(all(len(call.args[2]) <= 2 for call in index_chunk.call_args_list))
+        self.assertEqual([docs[str(book.pk)]['title'] for book in self.books[:3]], ['수정된 제목'] * 3)
+
+
+class BookIndexerTests(TestCase):
+    """색인 큐: 같은 서적 요청 병합, 실패 항목만 백오프 재시도, 끝내 실패한 항목만 dead-letter"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seller = create_user()
+        cls.books = Book.objects.bulk_create([
+            Book(title=f'책 {i}', chatLink='https://open.kakao.com/o/test', price=1000, major='컴퓨터공학과', seller=seller)
+            for i in range(2)
+        ])
+
+    def setUp(self):
+        self.indexer = BookIndexer(batch_size=10, flush_interval=0.01, max_retries=2, retry_backoff=0.1, queue_size=100)
+        self.pending = {self.books[0].pk: INDEX, self.books[1].pk: INDEX}
+        patcher = mock.patch.object(BookDocument, '_get_connection')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch('book.indexer.time.sleep')
+        self.sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def bulk_failing(self, book_id, times):
+        """book_id 문서만 times 번 실패하는 bulk, 호출마다 보낸 문서 id 기록"""
+        calls = []
+
+        def bulk(client, actions, **kwargs):
+            calls.append([action['_id'] for action in actions])
+            if book_id in calls[-1] and len(calls) <= times:
+                return 1, [{'index': {'_id': str(book_id), 'status': 429, 'error': 'rejected'}}]
+            return len(calls[-1]), []
+        return bulk, calls
+
+    def test_coalesces_same_book(self):
+        for action, book_id in [(INDEX, 1), (INDEX, 2), (DELETE, 1), (INDEX, 2)]:
+            self.indexer.queue.put((action, book_id))
+        self.assertEqual(self.indexer._collect(), {1: DELETE, 2: INDEX})
+
+    def test_retries_only_failed_documents(self):
+        bulk, calls = self.bulk_failing(self.books[1].pk, times=2)
+        with mock.patch('book.indexer.bulk', side_effect=bulk), self.assertNoLogs('book.indexer.deadletter'):
+            self.indexer.flush(self.pending)
+        self.assertEqual(calls, [[self.books[0].pk, self.books[1].pk], [self.books[1].pk], [self.books[1].pk]])
+        self.assertEqual([call.args[0] for call in self.sleep.call_args_list], [0.1, 0.2])  # 지수 백오프
+
+    def test_build_failure_is_retried(self):
+        actions = self.indexer.build_actions(self.pending)
+        bulk, calls = self.bulk_failing(None, times=0)
+        with mock.patch.object(self.indexer, 'build_actions', side_effect=[OperationalError('gone away'), actions]) as build, \
+                mock.patch('book.indexer.bulk', side_effect=bulk), self.assertNoLogs('book.indexer.deadletter'), \
+                self.assertLogs('book.indexer', 'WARNING'):
+            self.indexer.flush(self.pending)
+        self.assertEqual(build.call_count, 2)
+        self.assertEqual(calls, [[self.books[0].pk, self.books[1].pk]])
+
+    def test_deadletters_only_failed_documents(self):
+        bulk, _ = self.bulk_failing(self.books[1].pk, times=10)
+        with mock.patch('book.indexer.bulk', side_effect=bulk), self.assertLogs('book.indexer.deadletter') as logs:
+            self.indexer.flush(self.pending)
+        self.assertEqual(len(logs.output), 1)
+        self.assertIn(f'book_id={self.books[1].pk} ', logs.output[0])
+
+
+@override_settings(BOOK_INDEXER_ENABLED=False)
+class ImageKeysTests(TestCase):
+    """직접 업로드 키로 서적 등록: 본인 발급/미만료 키만, 한 키는 한 서적에만 사용"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.seller, cls.other = [create_user(n) for n in range(2)]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.seller)
+        for target, value in [
+            ('book.serializers.object_exists', mock.Mock(return_value=True)),
+            ('book.serializers.get_upload_executor', mock.Mock(return_value=mock.Mock(map=map))),  # S3 확인을 요청 스레드에서
+            ('book.views.schedule_derivatives', mock.Mock()),
+        ]:
+            patcher = mock.patch(target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def create_book(self, keys):
+        return self.client.post('/api/v1/books/', {
+            'title': '운영체제', 'chatLink': 'https://open.kakao.com/o/test', 'price': 10000, 'major': '컴퓨터공학과',
+            'image_keys': keys,
+        }, format='json')
+
+    def test_claims_keys(self):
+        ImageUpload.objects.create(key='image/a.jpg', uploader=self.seller)
+        response = self.create_book(['image/a.jpg'])
+        self.assertEqual(response.status_code, 201)
+        self.assertFalse(ImageUpload.objects.exists())
+        self.assertEqual(BookImage.objects.get().image_url, object_url('image/a.jpg'))
+
+    def test_foreign_key(self):
+        ImageUpload.objects.create(key='image/other.jpg', uploader=self.other)
+        self.assertEqual(self.create_book(['image/other.jpg']).status_code, 400)
+        self.assertTrue(ImageUpload.objects.filter(key='image/other.jpg').exists())
+
+    def test_expired_key(self):
+        upload = ImageUpload.objects.create(key='image/old.jpg', uploader=self.seller)
+        ImageUpload.objects.filter(pk=upload.pk).update(created_at=timezone.now() - settings.BOOK_UPLOAD_TTL - timedelta(minutes=1))
+        self.assertEqual(self.create_book(['image/old.jpg']).status_code, 400)
+        self.assertFalse(Book.objects.exists())
+
+    def test_reused_key(self):
+        ImageUpload.objects.create(key='image/a.jpg', uploader=self.seller)
+        self.assertEqual(self.create_book(['image/a.jpg']).status_code, 201)
+        self.assertEqual(self.create_book(['image/a.jpg']).status_code, 400)
+        self.assertEqual(Book.objects.count(), 1)
+
+    def test_key_claimed_concurrently(self):
+        """검증 이후 다른 요청이 먼저 같은 키를 확정하면 서적을 만들지 않음"""
+        ImageUpload.objects.create(key='image/a.jpg', uploader=self.seller)
+        ImageUpload.objects.create(key='image/b.jpg', uploader=self.seller)
+
+        def claimed_elsewhere(key):
+            ImageUpload.objects.filter(key='image/b.jpg').delete()
+            return True
+
+        with mock.patch('book.serializers.object_exists', side_effect=claimed_elsewhere):
+            response = self.create_book(['image/a.jpg', 'image/b.jpg'])
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('image_keys', response.data)
+        self.assertFalse(Book.objects.exists())
+        self.assertTrue(ImageUpload.objects.filter(key='image/a.jpg').exists())  # 확정 취소(롤백)
+
+    def test_cleanup_keeps_failed_keys(self):
+        """S3 삭제에 실패한 키의 행은 남기고, 남은 행 때문에 같은 배치를 반복하지 않음"""
+        for name in 'abc':
+            ImageUpload.objects.create(key=f'image/{name}.jpg', uploader=self.seller)
+        ImageUpload.objects.update(created_at=timezone.now() - settings.BOOK_UPLOAD_TTL - timedelta(minutes=1))
+        s3 = mock.Mock()
+        s3.delete_objects.side_effect = lambda Bucket, Delete: {'Errors': [
+            {'Key': obj['Key'], 'Code': 'AccessDenied'} for obj in Delete['Objects'] if obj['Key'] == 'image/a.jpg'
+        ]}
+        with mock.patch('book.storage.get_s3_client', return_value=s3):
+            call_command('cleanup_image_uploads', batch_size=1, stdout=StringIO(), stderr=StringIO())
+
+        self.assertEqual(s3.delete_objects.call_count, 3)
+        self.assertEqual(list(ImageUpload.objects.values_list('key', flat=True)), ['image/a.jpg'])
+
+
+class ImageUploadTests(TestCase):
+    """서적 이미지 업로드: 프로세스 공용 S3 클라이언트, 제한된 스레드 풀에서 복사 없이 동시 업로드"""
+
+    def test_shared_client(self):
+        with mock.patch('book.storage._s3_client', None), mock.patch('book.storage.boto3.client') as client:
+            self.assertIs(get_s3_client(), get_s3_client())
+        client.assert_called_once()
+
+    def test_concurrent_upload_without_copy(self):
+        files = [SimpleUploadedFile(f'photo{i}.jpg', b'jpeg') for i in range(3)]
+        threads = []
+        s3 = mock.Mock()
+        s3.upload_fileobj.side_effect = lambda file, **kwargs: threads.append(threading.current_thread().name)
+        with mock.patch('book.storage.get_s3_client', return_value=s3):
+            urls = upload_images(files)
+
+        # 업로드한 파일 객체를 그대로 전달 (BytesIO 복사 없음), URL 은 입력 순서
+        self.assertEqual(sorted(map(id, (call.args[0] for call in s3.upload_fileobj.call_args_list))), sorted(map(id, files)))
+        for i, url in enumerate(urls):
+            self.assertTrue(url.startswith(object_url('image/')) and url.endswith(f'_photo{i}.jpg'), url)
+        self.assertTrue(all(name.startswith('s3-upload') for name in threads), threads)
+
+
+@override_settings(BOOK_INDEXER_ENABLED=False)
+class ImageDerivativeTests(TestCase):
+    """이미지 파생본: 원본 크기 기록, WebP 썸네일/중간 크기 업로드, 서적 수정 시각/색인/캐시 갱신"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seller = create_user()
+        cls.book = Book.objects.create(
+            title='책', chatLink='https://open.kakao.com/o/test', price=1000, major='컴퓨터공학과', seller=seller
+        )
+        cls.image = BookImage.objects.create(book=cls.book, image_url=object_url('image/photo.jpg'))
+
+    def test_process_book_images(self):
+        original = io.BytesIO()
+        Image.new('RGB', (1600, 1200), 'white').save(original, format='JPEG')
+        uploads = {}
+        s3 = mock.Mock()
+        s3.get_object.return_value = {'Body': io.BytesIO(original.getvalue())}
+        s3.upload_fileobj.side_effect = lambda buffer, Bucket, Key, ExtraArgs: uploads.update({Key: (buffer.read(), ExtraArgs)})
+
+        generations = search_cache.generation(), listing_cache.generation()
+        with mock.patch('book.derivatives.get_s3_client', return_value=s3), mock.patch('book.derivatives.close_old_connections'), \
+                mock.patch('book.signals.book_indexer') as indexer, mock.patch('book.signals.memory_backend') as memory, \
+                self.captureOnCommitCallbacks(execute=True):
+            process_book_images(self.book.pk)
+
+        image = BookImage.objects.get(pk=self.image.pk)
+        self.assertEqual((image.width, image.height), (1600, 1200))
+        self.assertEqual(image.thumbnail_url, object_url('image/derivatives/photo_thumbnail.webp'))
+        self.assertEqual(image.medium_url, object_url('image/derivatives/photo_medium.webp'))
+        for name, max_size in settings.BOOK_IMAGE_DERIVATIVES.items():
+            content, extra = uploads[f'image/derivatives/photo_{name}.webp']
+            self.assertEqual(extra['ContentType'], 'image/webp')
+            with Image.open(io.BytesIO(content)) as derivative:
+                self.assertEqual((derivative.format, max(derivative.size)), ('WEBP', max_size))
+        self.assertGreater(Book.objects.get(pk=self.book.pk).updated_at, self.book.updated_at)
+        # PATCH 와 같은 경로: 색인, 메모리 인덱스, 응답 캐시 모두 갱신
+        indexer.index.assert_called_once_with(self.book.pk)
+        memory.mark_dirty.assert_called_once_with(self.book.pk)
+        self.assertEqual([search_cache.generation(), listing_cache.generation()], [g + 1 for g in generations])
+
+        # 이미 처리된 이미지는 다시 처리하지 않음
+        s3.reset_mock()
+        with mock.patch('book.derivatives.get_s3_client', return_value=s3), \
+                mock.patch('book.signals.book_indexer'), mock.patch('book.derivatives.close_old_connections'):
+            process_book_images(self.book.pk)
+        s3.get_object.assert_not_called()
+
+
+@override_settings(BOOK_INDEXER_ENABLED=False)
+class BookCreateTests(TestCase):
+    """서적 등록: 서적 + 이미지를 한 트랜잭션에서, 이미지는 bulk INSERT 한 번으로 한 번만 저장"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.seller = create_user()
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.seller)
+        self.urls = [object_url(f'image/{i}.jpg') for i in range(3)]
+        for target, value in [
+            ('book.views.upload_images', mock.Mock(return_value=self.urls)),
+            ('book.views.schedule_derivatives', mock.Mock()),
+        ]:
+            patcher = mock.patch(target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def create_book(self):
+        return self.client.post('/api/v1/books/', {
+            'title': '운영체제', 'chatLink': 'https://open.kakao.com/o/test', 'price': 10000, 'major': '컴퓨터공학과',
+            'images': [SimpleUploadedFile(f'{i}.jpg', b'jpeg') for i in range(3)],
+        }, format='multipart')
+
+    def test_images_inserted_once_in_bulk(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.create_book()
+        self.assertEqual(response.status_code, 201)
+        inserts = [
+            query['sql'] for query in ctx.captured_queries
+            if query['sql'].startswith('INSERT') and BookImage._meta.db_table in query['sql'].split('(')[0]
+        ]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(list(BookImage.objects.order_by('id').values_list('image_url', flat=True)), self.urls)
+
+    def test_rolls_back_book_when_images_fail(self):
+        with mock.patch.object(BookImage.objects, 'bulk_create', side_effect=IntegrityError), self.assertRaises(IntegrityError):
+            self.create_book()
+        self.assertFalse(Book.objects.exists())
+
+
+@override_settings(BOOK_INDEXER_ENABLED=False)
+class BookDocumentTests(TestCase):
+    """검색 문서 비정규화: 검색 응답에 필요한 필드를 _source 에 담아 DB 조회 없이 응답"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seller = create_user()
+        cls.book = Book.objects.create(
+            title='자료구조 입문', chatLink='https://open.kakao.com/o/test', price=15000, major='컴퓨터공학과',
+            status='IN_PROGRESS', seller=seller,
+        )
+        BookImage.objects.bulk_create([
+            BookImage(book=cls.book, image_url=object_url(f'image/{n}.jpg'), thumbnail_url=object_url(f'image/thumb/{n}.webp'))
+            for n in range(2)
+        ])
+
+    def test_prepare_and_result(self):
+        document = BookDocument()
+        book = document.get_queryset().get(pk=self.book.pk)
+        with self.assertNumQueries(0):  # 판매자/이미지는 get_queryset 에서 함께 조회
+            source = document.prepare(book)
+        self.assertEqual(source['seller_name'], '판매자')
+        self.assertEqual((source['price'], source['status']), (15000, 'IN_PROGRESS'))
+        self.assertEqual(source['image_url'], object_url('image/0.jpg'))  # 첫 번째(등록 순) 이미지
+        self.assertEqual(source['thumbnail_url'], object_url('image/thumb/0.webp'))
+        self.assertEqual(source['title_suggest'], {'input': ['자료구조 입문', '입문'], 'weight': 1})
+
+        hit = mock.Mock(meta=mock.Mock(id=str(self.book.pk)), to_dict=mock.Mock(return_value=source))
+        result = hit_to_result(hit)
+        self.assertEqual(list(result), ['id', *SEARCH_RESULT_FIELDS])
+        self.assertEqual(result['id'], self.book.pk)
+        self.assertEqual(result['created_at'], source['created_at'])
+
+
+class SearchAnalyzerTests(TestCase):
+    """분석기 프로필 매핑 / hedged 요청"""
+
+    def test_profile_mapping(self):
+        properties = BookDocument._doc_type.mapping.to_dict()['properties']
+        for field, analyzers in ANALYZER_PROFILES[settings.BOOK_SEARCH_ANALYZER_PROFILE].items():
+            self.assertEqual({key: properties[field][key] for key in analyzers}, analyzers)
+        self.assertEqual(properties['major']['fields']['raw']['type'], 'keyword')
+        # lean: n-gram 은 제목/전공 색인 시에만, 검색어와 설명은 standard 로 한 번만 토큰화
+        lean = ANALYZER_PROFILES['lean']
+        self.assertEqual({analyzers['search_analyzer'] for analyzers in lean.values()}, {'standard'})
+        self.assertEqual(lean['description']['analyzer'], 'standard')
+
+    def test_profiles_use_defined_analyzers(self):
+        defined = {'standard', *INDEX_SETTINGS['analysis']['analyzer']}
+        for profile, fields in ANALYZER_PROFILES.items():
+            for field, analyzers in fields.items():
+                with self.subTest(profile=profile, field=field):
+                    self.assertLessEqual(set(analyzers.values()), defined)
+
+    def test_hedged_request_errors(self):
+        calls = []
+
+        async def failing():
+            calls.append(time.monotonic())
+            await asyncio.sleep(0.05)
+            raise ESConnectionError('unavailable')
+
+        # 두 요청 모두 실패하면 예외, delay 가 None 이면 한 번만 요청
+        with self.assertRaises(ESConnectionError):
+            async_to_sync(hedged)(failing, 0.01)
+        self.assertEqual(len(calls), 2)
+        with self.assertRaises(ESConnectionError):
+            async_to_sync(hedged)(failing, None)
+        self.assertEqual(len(calls), 3)
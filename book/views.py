@@ -1,32 +1,113 @@
-import io
-import boto3
-from django.conf import settings
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework.permissions import IsAuthenticated, AllowAny
-from rest_framework.parsers import MultiPartParser, FormParser
-from .models import Book, BookImage
-from .serializers import BookSerializer, UserSerializer, BookCreateSerializer
-from elasticsearch_dsl.query import Bool, MultiMatch
-from .search import BookDocument
-from django.db.models import Case, When, Value, IntegerField
-from uuid import uuid4
+from rest_framework.permissions import IsAuthenticated, IsAdminUser, AllowAny
+from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
+from rest_framework.settings import api_settings
+from .models import Book, ImageUpload
+from .serializers import (
+    BookSerializer, UserSerializer, BookCreateSerializer, ImageUploadRequestSerializer, ImageKeysSerializer,
+    BookSearchParamsSerializer, BookSuggestParamsSerializer, SellerSummarySerializer, BookIdsParamsSerializer,
+    BookBulkStatusSerializer,
+)
+from .pagination import LISTING_ORDERINGS, SELLER_ASCENDING, SELLER_ORDERING, BookCursorPagination
+from .rows import BookRowSerializer
+from .renderers import NDJSONRenderer
+from .streaming import wants_ndjson, stream_books_ndjson
+from .derivatives import schedule_derivatives
+from .reaper import soft_delete_book
+from .storage import upload_images, new_image_key, presigned_image_post, object_url
+from .cache import listing_cache, search_cache
+from .counters import book_counters
+from .search_backends import SEARCH_ERRORS, get_search_backend, search_error_status
+from .signals import books_updated
+from .summary import apply_delta, get_seller_summary_with_versions, status_change_delta
+from django.db import transaction
+from django.utils import timezone
+from django.http import HttpResponse, JsonResponse
+from django.views import View
+from config.conditional import is_conditional, make_etag, not_modified, set_validators
+from config.renderers import dumps
 
 # 서적 전체 조회(GET)
 class BookListAllView(APIView):
     parser_classes = [AllowAny]  # 파일 업로드를 위한 설정
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, NDJSONRenderer]
 
     def get(self, request, *args, **kwargs):
-        """서적 전체 조회 (GET)"""
-        books = Book.objects.all().order_by('-created_at')
-        serializer = BookSerializer(books, many=True)
-        return Response(serializer.data)
+        """서적 전체 조회 (GET) - ?cursor=...&page_size=...&fields=...&sort=newest|popular 커서 페이지네이션"""
+        rows = BookRowSerializer.from_request(request)  # 읽기 전용 목록은 .values() 기반 직렬화
+        sort = request.query_params.get('sort', 'newest')
+        if sort not in LISTING_ORDERINGS:
+            return Response({'sort': [f"사용 가능한 정렬: {', '.join(LISTING_ORDERINGS)}"]}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Accept: application/x-ndjson 이면 전체 목록을 스트리밍으로 내보내기
+        paginator = BookCursorPagination(LISTING_ORDERINGS[sort])
+        if wants_ndjson(request):
+            return stream_books_ndjson(request, Book.objects.all(), rows, paginator)
+
+        # 모든 사용자에게 같은 응답이므로 앞쪽 페이지는 캐시에서 응답 (서적/이미지 변경 시 무효화)
+        page = {
+            'cursor': request.query_params.get(paginator.cursor_query_param) or None,
+            'page_size': paginator.get_page_size(request),
+            'fields': rows.fields,
+            'sort': sort,
+        }
+
+        def build_page():
+            books = paginator.paginate_queryset(rows.queryset(Book.objects.all()), request, view=self)
+            return paginator.get_paginated_response(rows.serialize(books)).data
+
+        return Response(listing_cache.get_page(page, build_page))
 
 class BookListCreateView(APIView):
-    parser_classes = [MultiPartParser, FormParser]
+    parser_classes = [MultiPartParser, FormParser, JSONParser]
     permission_classes = [IsAuthenticated] 
 
+    def get(self, request, *args, **kwargs):
+        """여러 서적 조회 (GET) - ?ids=1,2,3&fields=..., 서적 + 이미지 쿼리 한 번씩"""
+        params = BookIdsParamsSerializer(data=request.query_params)
+        if not params.is_valid():
+            return Response(params.errors, status=status.HTTP_400_BAD_REQUEST)
+        ids = params.validated_data['ids']
+        rows = BookRowSerializer.from_request(request)
+
+        books = {book['id']: book for book in rows.serialize(rows.queryset(Book.objects.filter(pk__in=ids)))}
+        results = [books[book_id] for book_id in ids if book_id in books]  # 요청 순서 유지
+        missing = [book_id for book_id in ids if book_id not in books]
+        return Response({'results': results, 'missing': missing}, status=status.HTTP_200_OK)
+
+    def patch(self, request, *args, **kwargs):
+        """본인 서적 거래 상태 일괄 변경 (PATCH) - {"ids": [...], "status": "COMPLETED"}, 하나의 트랜잭션"""
+        serializer = BookBulkStatusSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        ids, new_status = serializer.validated_data['ids'], serializer.validated_data['status']
+
+        with transaction.atomic():
+            # 소유권 확인과 행 잠금을 한 번의 쿼리로 (id 순서로 잠가 교착 방지)
+            owned = list(
+                Book.objects.select_for_update().filter(pk__in=ids, seller=request.user)
+                .order_by('pk').values_list('pk', 'status', 'price')
+            )
+            if len(owned) != len(ids):
+                owned_ids = {book_id for book_id, _, _ in owned}
+                return Response(
+                    {"error": "수정 권한이 없거나 존재하지 않는 서적이 있습니다.",
+                     "ids": [book_id for book_id in ids if book_id not in owned_ids]},
+                    status=status.HTTP_403_FORBIDDEN
+                )
+
+            changed = [(book_id, old_status, price) for book_id, old_status, price in owned if old_status != new_status]
+            if changed:
+                changed_ids = [book_id for book_id, _, _ in changed]
+                Book.objects.filter(pk__in=changed_ids).update(status=new_status, updated_at=timezone.now())
+                # update()는 시그널을 보내지 않으므로 판매자 요약/인덱스 반영을 직접 처리
+                apply_delta(request.user.pk, status_change_delta([(old, price) for _, old, price in changed], new_status))
+                books_updated(changed_ids)
+
+        return Response({'updated': [book_id for book_id, _, _ in changed], 'status': new_status}, status=status.HTTP_200_OK)
+
     def post(self, request, *args, **kwargs):
         # status 필드를 가져올 때 변수명 변경
         book_status = request.data.get('status')
@@ -36,82 +117,132 @@ class BookListCreateView(APIView):
             request.data['status'] = book_status.strip('"')
 
         """서적 등록 기능 (POST)"""
-        files = request.data.getlist('images')
+        if hasattr(request.data, 'getlist'):
+            files = request.data.getlist('images')
+            image_keys = request.data.getlist('image_keys')
+        else:
+            files = []
+            image_keys = request.data.get('image_keys')
 
-        if not files:
+        if image_keys:
+            # presigned URL로 직접 업로드한 이미지 키 검증
+            keys_serializer = ImageKeysSerializer(data={'image_keys': image_keys}, context={'request': request})
+            if not keys_serializer.is_valid():
+                return Response(keys_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+            image_urls = [object_url(key) for key in image_keys]
+        elif files:
+            # 공용 S3 클라이언트로 이미지를 동시에 업로드
+            image_urls = upload_images(files)
+        else:
             return Response({"error": "No images uploaded"}, status=status.HTTP_400_BAD_REQUEST)
 
-        # S3 클라이언트 설정
-        s3 = boto3.client(
-            "s3",
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            region_name=settings.AWS_S3_REGION_NAME,
-        )
-
-        image_urls = []
-
-        for file in files:
-            # 파일을 메모리에서 읽음
-            file_stream = io.BytesIO(file.read())
-            file_stream.seek(0)  # 파일 포인터를 처음으로 이동
-
-            # 파일명 유니크하게 생성
-            s3_file_name = f"image/{uuid4()}_{file.name}"
-
-            # S3에 업로드
-            s3.upload_fileobj(file_stream, Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=s3_file_name)
-
-            # S3 URL 생성
-            file_url = f"https://{settings.AWS_STORAGE_BUCKET_NAME}.s3.{settings.AWS_S3_REGION_NAME}.amazonaws.com/{s3_file_name}"
-            image_urls.append(file_url)
-        
         # 시리얼라이저 사용하여 서적 데이터 저장
-        request.data['images'] = image_urls
+        data = request.data.dict() if hasattr(request.data, 'dict') else dict(request.data)
+        data.pop('image_keys', None)
+        data['images'] = image_urls
 
-        serializer = BookCreateSerializer(data=request.data)
-        print("Data to be saved:", serializer)
+        serializer = BookCreateSerializer(data=data)
 
         # 서적 정보 저장
         if serializer.is_valid():
-            # 서적 정보 저장
-            book = serializer.save(seller=request.user)  # 현재 로그인한 유저 저장
+            with transaction.atomic():
+                # 업로드 키 확정 (정리 대상에서 제외), 동시 요청이 먼저 사용한 키면 등록하지 않음
+                if image_keys and not keys_serializer.claim():
+                    transaction.set_rollback(True)
+                    return Response(
+                        {'image_keys': [ImageKeysSerializer.invalid_message]}, status=status.HTTP_400_BAD_REQUEST
+                    )
+
+                # 서적 + 이미지 저장 (현재 로그인한 유저 저장)
+                book = serializer.save(seller=request.user)
 
-            # 개별적으로 BookImage 객체 생성
-            for url in image_urls:
-                BookImage.objects.create(book=book, image_url=url)
+            # 썸네일 등 파생 이미지는 백그라운드에서 생성
+            schedule_derivatives(book.id)
 
             # 책 정보를 포함한 응답 반환
             return Response(serializer.data, status=status.HTTP_201_CREATED)
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+# 이미지 직접 업로드용 presigned URL 발급(POST)
+class ImageUploadView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        """이미지 직접 업로드 URL 발급 (POST) - 업로드 후 image_keys로 서적 등록"""
+        serializer = ImageUploadRequestSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        uploads = []
+        for file in serializer.validated_data['files']:
+            key = new_image_key(file['name'])
+            presigned = presigned_image_post(key, file['content_type'])
+            uploads.append({'key': key, 'url': presigned['url'], 'fields': presigned['fields']})
+
+        ImageUpload.objects.bulk_create([ImageUpload(key=upload['key'], uploader=request.user) for upload in uploads])
+        return Response({'uploads': uploads}, status=status.HTTP_201_CREATED)
+
 # 유저 별 책 조회(GET)
 class BookListByUser(APIView):
     permission_classes = [IsAuthenticated]
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, NDJSONRenderer]
 
     def get(self, request, *args, **kwargs):
-        """개인 서적 조회 (GET)"""
-        books = Book.objects.filter(seller=request.user).annotate(
-            for_sale_priority=Case(
-                When(status='FOR_SALE', then=Value(0)),
-                default=Value(1),
-                output_field=IntegerField()
-            )
-        ).order_by('for_sale_priority', '-created_at')  # FOR_SALE이 우선, 최신순 정렬
-        book_serializer = BookSerializer(books, many=True)
+        """개인 서적 조회 (GET) - ?fields=..."""
+        rows = BookRowSerializer.from_request(request)
+        # JSON/NDJSON 모두 판매 중 우선, 최신순
+        paginator = BookCursorPagination(SELLER_ORDERING, ascending=SELLER_ASCENDING)
+        if wants_ndjson(request):
+            return stream_books_ndjson(request, Book.objects.filter(seller=request.user), rows, paginator)
+
+        # 조건부 GET: 요약 한 행 조회에 서적 최신 수정 시각/건수/카운터 합계를 함께 집계해 변경 여부 확인
+        # 서적 수정/등록은 최신 수정 시각, 삭제는 건수, 채팅방 수 변경은 요약 갱신 시각, 조회수/관심 수는 합계로 감지
+        user = request.user
+        summary = get_seller_summary_with_versions(user.pk)
+        etag = make_etag(
+            request, user.pk, user.name, user.student_id, user.school_email,
+            summary.updated_at, summary.books_updated_at, summary.books_count, summary.books_views, summary.books_interest,
+        )
+        response = not_modified(request, etag)
+        if response is not None:
+            return response
+
+        # (seller, status_rank, created_at, id) 인덱스 범위 스캔 한 번으로 판매 중 우선, 최신순
+        books = rows.queryset(Book.objects.filter(seller=request.user).order_by(*paginator.get_order_by()))
         sellers = UserSerializer(request.user)
-        return Response( {'sellers': sellers.data, 'books': book_serializer.data}, status=status.HTTP_200_OK)  # 200 OK로 응답
+        summary = SellerSummarySerializer(summary)
+        response = Response(
+            {'sellers': sellers.data, 'summary': summary.data, 'books': rows.serialize(books)}, status=status.HTTP_200_OK
+        )  # 200 OK로 응답
+        return set_validators(response, etag)
 
 # 특정 책 조회(GET), 수정(PATCH), 삭제(DELETE)
 class BookDetailView(APIView):
     permission_classes = [IsAuthenticated]  # 인증된 유저만 수정/삭제 가능
 
     def get(self, request, *args, **kwargs):
-        """개별 서적 조회 (GET)"""
-        book = Book.objects.get(pk=kwargs['pk'])
+        """개별 서적 조회 (GET) - If-None-Match/If-Modified-Since 가 일치하면 직렬화 없이 304"""
+        # 이미지 파생본 생성도 updated_at 을 갱신하므로 (수정 시각, 판매자 이름, 카운터) 한 행으로 변경 여부 확인
+        # 응답에 포함된 카운터도 검증자에 포함 (내 서적 목록과 같은 규칙) - 카운터 반영 후에는 200 으로 새 값 전달
+        try:
+            validators = Book.objects.values_list(
+                'updated_at', 'seller__name', 'view_count', 'interest_count'
+            ).get(pk=kwargs['pk'])
+        except Book.DoesNotExist:
+            return Response({"error": "책 정보를 찾을 수 없습니다."}, status=status.HTTP_404_NOT_FOUND)
+        etag = make_etag(request, kwargs['pk'], *validators)
+        response = not_modified(request, etag, validators[0])
+        if response is not None:
+            return response
+        # 조회수는 메모리에 합산 (응답의 조회수는 마지막 반영 시점 값)
+        # 재검증 요청은 이미 본 화면의 갱신이므로 세지 않음 (세면 반영 때마다 자기 조회로 ETag 가 바뀜)
+        if not is_conditional(request):
+            book_counters.view(kwargs['pk'])
+
+        book = Book.objects.with_related().get(pk=kwargs['pk'])
         serializer = BookSerializer(book)
-        return Response(serializer.data)
+        return set_validators(Response(serializer.data), etag, validators[0])
     
     def patch(self, request, *args, **kwargs):
         """개별 서적 수정 (PATCH)"""
@@ -123,38 +254,67 @@ class BookDetailView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
     def delete(self, request, *args, **kwargs):
-        """개별 서적 삭제 (DELETE)"""
-        book = Book.objects.get(pk=kwargs['pk'])
-        book.delete()
+        """개별 서적 삭제 (DELETE) - 즉시 숨기고 채팅 기록/S3 이미지/행 정리는 백그라운드에서 (book.reaper)"""
+        if not soft_delete_book(kwargs['pk']):
+            return Response({"error": "책 정보를 찾을 수 없습니다."}, status=status.HTTP_404_NOT_FOUND)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
-class BookSearchView(APIView):
+class BookSearchView(View):
+    """
+    ASGI(daphne) 네이티브 비동기 뷰: ES 응답을 기다리는 동안 스레드를 점유하지 않음
+    DRF APIView 는 async 핸들러를 지원하지 않으므로 Django View 사용 (인증 불필요한 공개 API)
+    """
+
+    async def get(self, request, *args, **kwargs):
+        """서적 검색 (GET) - q, status, major, min_price, max_price, sort, size, search_after"""
+        params = BookSearchParamsSerializer(data=request.GET)
+        if not params.is_valid():
+            return self.json(params.errors, status_code=status.HTTP_400_BAD_REQUEST)
+
+        # 같은 검색어/필터 반복 요청은 캐시에서 응답 (캐시 조회는 스레드에서 실행해 이벤트 루프를 막지 않음)
+        cached = await search_cache.aget(params.validated_data)
+        if cached is not None:
+            return self.json(cached)
+
+        # 검색 백엔드 실행 (ES 장애/지연 시 인메모리 색인으로 대체)
+        try:
+            data = await get_search_backend().asearch(params.validated_data)
+        except SEARCH_ERRORS as e:
+            return self.json({"error": "검색을 처리할 수 없습니다."}, status_code=search_error_status(e))
+        await search_cache.aset(params.validated_data, data)
+        return self.json(data)
+
+    def json(self, data, status_code=status.HTTP_200_OK):
+        content = dumps(data)  # 기본 렌더러(FastJSONRenderer)와 같은 orjson 직렬화
+        if content is None:
+            return JsonResponse(data, status=status_code, json_dumps_params={'ensure_ascii': False})
+        return HttpResponse(content, status=status_code, content_type='application/json')
+
+# 검색어 자동완성(GET)
+class BookSuggestView(APIView):
     def get(self, request, *args, **kwargs):
-        """서적 검색 (GET)"""
-        query = request.GET.get('q', '').strip()
-        
-        if not query:
-            return Response({"error": 'Query parameter "q" is required.'}, status=400)
-
-        # 제목, 저자, 설명, 전공 중 하나라도 검색어와 일치하면 검색
-        search_query = Bool(
-            should=[
-                MultiMatch(query=query, fields=['title']),
-                MultiMatch(query=query, fields=['description']),
-                MultiMatch(query=query, fields=['major'])
-            ],
-            minimum_should_match=1  # 하나라도 일치하면 검색됨
-        )
+        """제목/전공 자동완성 (GET) - ?q=접두어&k=개수, DB 조회 없음"""
+        params = BookSuggestParamsSerializer(data=request.query_params)
+        if not params.is_valid():
+            return Response(params.errors, status=status.HTTP_400_BAD_REQUEST)
+        prefix, size = ' '.join(params.validated_data['q'].split()), params.validated_data['k']
 
-        # Elasticsearch 검색 실행
-        search = BookDocument.search().query(search_query)
-        results = search.execute()
+        cache_params = {'suggest': prefix.lower(), 'k': size}
+        cached = search_cache.get(cache_params)
+        if cached is not None:
+            return Response(cached)
 
-        # 검색된 책 ID 리스트 가져오기
-        book_ids = [hit.meta.id for hit in results]
+        try:
+            data = get_search_backend().suggest(prefix, size)
+        except SEARCH_ERRORS as e:
+            return Response({"error": "자동완성을 처리할 수 없습니다."}, status=search_error_status(e))
+        search_cache.set(cache_params, data)
+        return Response(data)
 
-        # DB에서 해당 책 정보 조회
-        books = Book.objects.filter(id__in=book_ids)
-        serializer = BookSerializer(books, many=True)
+# 캐시 적중률 조회(GET)
+class CacheStatsView(APIView):
+    permission_classes = [IsAdminUser]
 
-        return Response(serializer.data)
\ No newline at end of file
+    def get(self, request, *args, **kwargs):
+        """캐시 hit/miss 통계 조회 (관리자)"""
+        return Response({'search': search_cache.stats(), 'listing': listing_cache.stats()})
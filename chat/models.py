@@ -13,6 +13,11 @@ class ChatRoom(models.Model):
         constraints = [
             models.UniqueConstraint(fields=['buyer', 'book'], name='unique_chatroom_per_buyer_book')
         ]
+        indexes = [
+            # 채팅방 목록: 구매자/판매자별 최신 대화순
+            models.Index(fields=['buyer', '-updated_at'], name='chatroom_buyer_updated_idx'),
+            models.Index(fields=['seller', '-updated_at'], name='chatroom_seller_updated_idx'),
+        ]
 
     def update_last_message(self, content, time):
         """ 마지막 메시지를 업데이트하는 메서드 (DB 트랜잭션 최소화) """
@@ -34,3 +39,7 @@ class Message(models.Model):
 
     class Meta:
         db_table = 'Message'
+        indexes = [
+            # 채팅방 메시지 시간순 조회
+            models.Index(fields=['chatRoom', 'time'], name='message_room_time_idx'),
+        ]
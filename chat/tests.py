@@ -1,3 +1,87 @@
 from django.test import TestCase
+from rest_framework.test import APIClient
+from book.models import Book
+from config.testing import QueryPlanAssertionsMixin
+from users.models import User
+from .models import ChatRoom, Message
 
-# Create your tests here.
+
+class ChatQueryPlanTests(QueryPlanAssertionsMixin, TestCase):
+    """채팅 API 쿼리가 인덱스로 처리되는지 실행 계획으로 검증"""
+
+    @classmethod
+    def setUpTestData(cls):
+        users = [
+            User.objects.create_user(
+                school_email=f'user{n}@tukorea.ac.kr', name=f'사용자{n}', student_id=f'202000000{n}', major='컴퓨터공학과'
+            )
+            for n in range(4)
+        ]
+        cls.user = users[0]
+        books = Book.objects.bulk_create([
+            Book(title=f'책 {i}', chatLink='https://open.kakao.com/o/test', price=1000, major='컴퓨터공학과',
+                 seller=users[i % 4])
+            for i in range(20)
+        ])
+        rooms = ChatRoom.objects.bulk_create([
+            ChatRoom(buyer=buyer, book=book, seller=book.seller)
+            for book in books for buyer in users if buyer != book.seller
+        ])
+        Message.objects.bulk_create([
+            Message(chatRoom=room, sender=room.buyer, content=f'메시지 {n}') for room in rooms for n in range(3)
+        ])
+        cls.room = next(room for room in rooms if room.buyer == cls.user)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_chatrooms_plan(self):
+        # 구매자 OR 판매자 조건은 두 인덱스 범위를 합친 뒤 정렬 (사용자별 채팅방 수만큼만 정렬)
+        self.assertIndexedPlans(lambda: self.client.get('/api/v1/chatrooms'), allow_sort_on={'chat_chatroom'})
+
+    def test_chatroom_messages_plan(self):
+        self.assertIndexedPlans(lambda: self.client.get(f'/api/v1/chatroom/{self.room.pk}/messages'))
+
+
+class ChatConditionalGetTests(TestCase):
+    """채팅 기록 조건부 GET: 새 메시지가 없으면 쿼리 한 번으로 304"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.seller, cls.buyer = [
+            User.objects.create_user(
+                school_email=f'user{n}@tukorea.ac.kr', name=f'사용자{n}', student_id=f'202000000{n}', major='컴퓨터공학과'
+            )
+            for n in range(2)
+        ]
+        book = Book.objects.create(
+            title='책', chatLink='https://open.kakao.com/o/test', price=1000, major='컴퓨터공학과', seller=cls.seller
+        )
+        cls.room = ChatRoom.objects.create(buyer=cls.buyer, book=book, seller=cls.seller)
+        Message.objects.create(chatRoom=cls.room, sender=cls.buyer, content='안녕하세요')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.buyer)
+        self.url = f'/api/v1/chatroom/{self.room.pk}/messages'
+
+    def test_not_modified_until_new_message(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+        Message.objects.create(chatRoom=self.room, sender=self.seller, content='네 있어요')
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['messages']), 2)
+
+    def test_etag_differs_per_participant(self):
+        etag = self.client.get(self.url)['ETag']
+        self.client.force_authenticate(user=self.seller)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
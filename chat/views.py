@@ -6,6 +6,7 @@ from django.shortcuts import render
 from chat.models import ChatRoom, Message
 from users.models import User
 from book.models import Book
+from config.conditional import make_etag, not_modified, set_validators
 import uuid
 
 
@@ -53,8 +54,8 @@ def get_chatroom_messages(request, chatroom_id):
     current_user = request.user  #`request.user`에서 직접 가져옴
 
     try:
-        # 채팅방 조회
-        chatroom = ChatRoom.objects.get(id=chatroom_id)
+        # 채팅방 조회 (참여자/판매자 이름까지 한 번에 - 변경이 없으면 이 쿼리 하나로 304 응답)
+        chatroom = ChatRoom.objects.select_related('buyer', 'seller', 'book__seller').get(id=chatroom_id)
 
         # UUID 변환 추가 (현재 로그인한 user_id가 UUID인 경우 변환)
         current_user_id = str(current_user.id) if isinstance(current_user.id, uuid.UUID) else current_user.id
@@ -67,6 +68,12 @@ def get_chatroom_messages(request, chatroom_id):
         else:
             return Response({"error": "채팅방에 접근 권한이 없습니다."}, status=status.HTTP_403_FORBIDDEN)
 
+        # 조건부 GET: 메시지가 저장될 때마다 채팅방 updated_at 이 갱신되므로 이를 검증자로 사용
+        etag = make_etag(request, chatroom.id, chatroom.updated_at, current_user_id, opponent.name)
+        response = not_modified(request, etag, chatroom.updated_at)
+        if response is not None:
+            return response
+
         #채팅방 내 메시지 조회
         messages = Message.objects.filter(chatRoom=chatroom).order_by('time')
 
@@ -77,11 +84,12 @@ def get_chatroom_messages(request, chatroom_id):
             "time": msg.time
         } for msg in messages]
 
-        return Response({
+        response = Response({
             "chatroom_id": chatroom.id,
             "opponent_name": opponent.name,
             "messages": message_list
         }, status=status.HTTP_200_OK)
+        return set_validators(response, etag, chatroom.updated_at)
 
     except ChatRoom.DoesNotExist:
         return Response({"error": "채팅방을 찾을 수 없습니다."}, status=status.HTTP_404_NOT_FOUND)
@@ -17,6 +17,8 @@ from django.core.asgi import get_asgi_application
 from channels.routing import ProtocolTypeRouter, URLRouter
 from channels.auth import AuthMiddlewareStack
 from chat.routing import websocket_urlpatterns
+from book.counters import book_counters
+from book.search_backends import warm_search_fallback
 
 # ASGI 애플리케이션 설정
 application = ProtocolTypeRouter({
@@ -26,4 +28,9 @@ application = ProtocolTypeRouter({
             websocket_urlpatterns  # WebSocket URL 라우팅 연결
         )
     ),
-})
\ No newline at end of file
+})
+
+# 조회수/관심 수 증가분을 백그라운드에서 주기적으로 DB 반영
+book_counters.start()
+# ES 장애 시 대체할 인메모리 검색 색인을 백그라운드에서 미리 생성 (BOOK_SEARCH_BACKEND='auto')
+warm_search_fallback()
\ No newline at end of file
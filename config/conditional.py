@@ -0,0 +1,40 @@
+import hashlib
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+
+def make_etag(request, *parts):
+    """
+    검증자 값(수정 시각, 건수 등)으로 ETag 생성 (본문 직렬화 없이 계산)
+    같은 데이터라도 쿼리 파라미터(?fields=)나 응답 형식이 다르면 다른 ETag
+    """
+    renderer = getattr(request, 'accepted_renderer', None)
+    key = repr((request.get_full_path(), renderer.format if renderer else None, *parts))
+    return quote_etag(hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest())
+
+
+def is_conditional(request):
+    """클라이언트가 캐시된 응답을 재검증하는 요청인지 (If-None-Match / If-Modified-Since)"""
+    return 'HTTP_IF_NONE_MATCH' in request.META or 'HTTP_IF_MODIFIED_SINCE' in request.META
+
+
+def not_modified(request, etag, last_modified=None):
+    """If-None-Match / If-Modified-Since 가 현재 검증자와 일치하면 304 응답, 아니면 None"""
+    response = get_conditional_response(
+        request, etag=etag, last_modified=int(last_modified.timestamp()) if last_modified else None
+    )
+    if response is None:
+        return None
+    return set_validators(response, etag, last_modified)
+
+
+def set_validators(response, etag, last_modified=None):
+    """
+    응답에 ETag/Last-Modified 설정, 클라이언트는 매번 재검증 (개인별 응답이므로 private)
+    Last-Modified 는 초 단위라 같은 초 안의 변경이나 삭제는 구분하지 못함 - 클라이언트는 ETag 우선 사용
+    """
+    response.headers['ETag'] = etag
+    if last_modified is not None:
+        response.headers['Last-Modified'] = http_date(last_modified.timestamp())
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
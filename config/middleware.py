@@ -0,0 +1,129 @@
+import zlib
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+try:
+    import brotli
+except ImportError:  # brotli 미설치 시 gzip 만 협상
+    brotli = None
+
+# 압축할 응답 형식 (이미지 등 이미 압축된 형식은 제외)
+COMPRESSIBLE_TYPES = ('application/json', 'application/x-ndjson', 'application/javascript', 'text/')
+
+
+class GzipCompressor:
+    def __init__(self):
+        self.compressor = zlib.compressobj(settings.RESPONSE_COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)  # 31: gzip 헤더
+
+    def compress(self, data):
+        return self.compressor.compress(data)
+
+    def finish(self):
+        return self.compressor.flush()
+
+
+class BrotliCompressor:
+    def __init__(self):
+        self.compressor = brotli.Compressor(quality=settings.RESPONSE_COMPRESSION_BROTLI_QUALITY)
+
+    def compress(self, data):
+        return self.compressor.process(data)
+
+    def finish(self):
+        return self.compressor.finish()
+
+
+# 같은 q 값이면 앞쪽 우선
+COMPRESSORS = {'br': BrotliCompressor, 'gzip': GzipCompressor} if brotli else {'gzip': GzipCompressor}
+
+
+def negotiate_encoding(accept_encoding):
+    """Accept-Encoding 의 q 값 기준으로 사용할 인코딩 선택 (없으면 None)"""
+    qvalues = {}
+    for item in accept_encoding.split(','):
+        coding, *params = [part.strip() for part in item.split(';')]
+        if not coding:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        qvalues[coding.lower()] = q
+
+    best, best_q = None, 0.0
+    for coding in COMPRESSORS:
+        q = qvalues.get(coding, qvalues.get('*', 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def compress_bytes(coding, data):
+    compressor = COMPRESSORS[coding]()
+    return compressor.compress(data) + compressor.finish()
+
+
+def compress_stream(coding, chunks):
+    compressor = COMPRESSORS[coding]()
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+async def acompress_stream(coding, chunks):
+    compressor = COMPRESSORS[coding]()
+    async for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Accept-Encoding 협상으로 br/gzip 응답 압축 (django GZipMiddleware 대체)
+    RESPONSE_COMPRESSION_MIN_BYTES 보다 작거나 JSON/텍스트가 아닌 응답, 압축해도 작아지지 않는 응답은 그대로 반환
+    스트리밍 응답(NDJSON 내보내기)은 청크 단위로 압축
+    """
+
+    def process_response(self, request, response):
+        if response.has_header('Content-Encoding'):
+            return response
+        content_type = response.get('Content-Type', '')
+        if not content_type.startswith(COMPRESSIBLE_TYPES):
+            return response
+        if not response.streaming and len(response.content) < settings.RESPONSE_COMPRESSION_MIN_BYTES:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        coding = negotiate_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if coding is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = acompress_stream(coding, response.streaming_content)
+            else:
+                response.streaming_content = compress_stream(coding, response.streaming_content)
+            # 압축 후 길이는 스트리밍이 끝나야 알 수 있음
+            del response.headers['Content-Length']
+        else:
+            compressed = compress_bytes(coding, response.content)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+
+        # 본문이 바뀌었으므로 강한 ETag 는 약한 ETag 로 (조건부 요청 비교는 계속 가능)
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = coding
+        return response
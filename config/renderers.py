@@ -0,0 +1,42 @@
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # orjson 미설치 시 DRF 기본 JSONRenderer 와 동일하게 동작
+    orjson = None
+
+# datetime/UUID/Decimal 등은 DRF 인코더로 넘겨 기존 JSONRenderer 와 같은 문자열 형식 유지 (예: 밀리초, 'Z')
+_default = JSONEncoder().default
+ORJSON_OPTIONS = (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+
+def dumps(data):
+    """
+    JSON bytes 직렬화 (orjson 사용 가능하면 orjson, 아니면 None)
+    JavaScript 호환을 위해 U+2028/U+2029 는 DRF 와 같이 이스케이프
+    """
+    if orjson is None:
+        return None
+    try:
+        content = orjson.dumps(data, default=_default, option=ORJSON_OPTIONS)
+    except orjson.JSONEncodeError:
+        return None  # 64비트 범위를 넘는 정수 등 - 표준 json 으로 처리
+    return content.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    프로젝트 기본 JSON 렌더러: orjson 으로 직렬화 (DRF JSONRenderer 와 같은 출력)
+    들여쓰기 요청(?format=json; indent=4, Browsable API)이나 orjson 으로 처리할 수 없는 값은 기본 렌더러 사용
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent is None and self.compact and not self.ensure_ascii:
+            content = dumps(data)
+            if content is not None:
+                return content
+        return super().render(data, accepted_media_type, renderer_context)
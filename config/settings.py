@@ -72,6 +72,7 @@ AUTH_USER_MODEL = 'users.User'
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'config.middleware.CompressionMiddleware',  # 응답 압축 (br/gzip)
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -96,8 +97,18 @@ REST_FRAMEWORK = {
         'rest_framework_simplejwt.authentication.JWTAuthentication',
         'rest_framework.authentication.TokenAuthentication',
     ),
+    # 기본 JSON 렌더러: orjson 직렬화 (미설치 시 DRF JSONRenderer 와 동일)
+    'DEFAULT_RENDERER_CLASSES': (
+        'config.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
 }
 
+# 응답 압축 설정 (Accept-Encoding 협상, brotli 미설치 시 gzip 만 사용)
+RESPONSE_COMPRESSION_MIN_BYTES = int(os.getenv('RESPONSE_COMPRESSION_MIN_BYTES', 1024))  # 이보다 작은 응답은 압축 안 함
+RESPONSE_COMPRESSION_GZIP_LEVEL = int(os.getenv('RESPONSE_COMPRESSION_GZIP_LEVEL', 6))  # 1~9
+RESPONSE_COMPRESSION_BROTLI_QUALITY = int(os.getenv('RESPONSE_COMPRESSION_BROTLI_QUALITY', 4))  # 0~11, 높을수록 느림
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=30),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
@@ -212,6 +223,16 @@ AWS_SECRET_ACCESS_KEY = env('AWS_SECRET_ACCESS_KEY')
 AWS_STORAGE_BUCKET_NAME = env('IMAGE_BUCKET_NAME')
 AWS_S3_REGION_NAME = env('AWS_S3_REGION_NAME', default='us-east-1')
 AWS_S3_SIGNATURE_VERSION = env('AWS_S3_SIGNATURE_VERSION', default='s3v4')
+AWS_S3_ENDPOINT_URL = env('AWS_S3_ENDPOINT_URL', default=None)  # MinIO 등 로컬 S3 호환 서버 사용 시
+BOOK_UPLOAD_WORKERS = env.int('BOOK_UPLOAD_WORKERS', default=8)  # 이미지 동시 업로드 스레드 수
+BOOK_MAX_IMAGES = 10  # 서적 한 권당 최대 이미지 수
+BOOK_UPLOAD_MAX_BYTES = 10 * 1024 * 1024  # 직접 업로드 이미지 최대 크기
+BOOK_UPLOAD_URL_EXPIRES = 600  # presigned URL 유효 시간(초)
+BOOK_UPLOAD_TTL = timedelta(hours=24)  # 이 시간 안에 서적 등록에 쓰이지 않은 업로드는 정리
+BOOK_DERIVATIVE_WORKERS = env.int('BOOK_DERIVATIVE_WORKERS', default=2)  # 썸네일 생성 백그라운드 스레드 수
+BOOK_IMAGE_DERIVATIVES = {'thumbnail': 320, 'medium': 1024}  # 파생 이미지 이름: 긴 변 최대 픽셀
+BOOK_REAPER_MESSAGE_BATCH = env.int('BOOK_REAPER_MESSAGE_BATCH', default=1000)  # 삭제된 서적 정리 시 한 번에 지울 채팅 메시지 수
+BOOK_REAPER_BATCH_PAUSE = env.float('BOOK_REAPER_BATCH_PAUSE', default=0.05)  # 메시지 삭제 배치 사이 대기(초), 다른 쓰기에 락 양보
 
 # S3에 static 파일 저장하기
 STATIC_URL = f'https://{AWS_STORAGE_BUCKET_NAME}.s3.{AWS_S3_REGION_NAME}.amazonaws.com/django/'
@@ -226,6 +247,87 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # Elasticsearch 설정 추가
 ELASTICSEARCH_DSL = {
     'default': {
-        'hosts': ['http://localhost:9200'],  # Elasticsearch 서버 URL
+        'hosts': [os.getenv('ELASTICSEARCH_URL', 'http://localhost:9200')],  # Elasticsearch 서버 URL
+        'request_timeout': float(os.getenv('ELASTICSEARCH_TIMEOUT', 5)),  # 인덱싱/관리 명령 기본 타임아웃(초)
     }
-}
\ No newline at end of file
+}
+# 검색 분석기 프로필 ('lean' | 'full', book/search.py 참고) - 변경 시 manage.py reindex_books 필요
+BOOK_SEARCH_ANALYZER_PROFILE = os.getenv('BOOK_SEARCH_ANALYZER_PROFILE', 'lean')
+BOOK_SUGGEST_TIMEOUT = float(os.getenv('BOOK_SUGGEST_TIMEOUT', 0.2))  # 자동완성 ES 요청 타임아웃(초)
+# 검색 백엔드 ('auto': ES 우선 + 장애 시 인메모리 색인 | 'elasticsearch' | 'memory': ES 없이 실행, book/search_backends.py)
+BOOK_SEARCH_BACKEND = os.getenv('BOOK_SEARCH_BACKEND', 'auto')
+BOOK_SEARCH_TIMEOUT = float(os.getenv('BOOK_SEARCH_TIMEOUT', 0.5))  # 검색 ES 요청 타임아웃 = 지연 예산(초)
+BOOK_SEARCH_BREAKER_THRESHOLD = int(os.getenv('BOOK_SEARCH_BREAKER_THRESHOLD', 5))  # 연속 실패 시 ES 차단
+BOOK_SEARCH_BREAKER_RESET_TIMEOUT = float(os.getenv('BOOK_SEARCH_BREAKER_RESET_TIMEOUT', 30))  # 차단 후 재시도까지(초)
+# 비동기 검색(BookSearchView): 이 시간(초) 안에 응답이 없으면 같은 요청을 한 번 더 보냄, 비우면 사용 안 함
+BOOK_SEARCH_HEDGE_DELAY = float(os.getenv('BOOK_SEARCH_HEDGE_DELAY')) if os.getenv('BOOK_SEARCH_HEDGE_DELAY') else None
+# async ES 클라이언트의 노드당 최대 연결 수 (기본 10개면 동시 검색이 연결 대기로 막힘)
+BOOK_SEARCH_ASYNC_CONNECTIONS = int(os.getenv('BOOK_SEARCH_ASYNC_CONNECTIONS', 100))
+# 모델 저장 시 동기 인덱싱 대신 book.indexer 의 백그라운드 bulk 인덱서 사용
+ELASTICSEARCH_DSL_AUTOSYNC = False
+
+# 백그라운드 인덱서 설정
+BOOK_INDEXER_ENABLED = os.getenv('BOOK_INDEXER_ENABLED', 'true').lower() == 'true'
+BOOK_INDEXER_BATCH_SIZE = int(os.getenv('BOOK_INDEXER_BATCH_SIZE', 500))  # 이 개수가 모이면 즉시 전송
+BOOK_INDEXER_FLUSH_INTERVAL = float(os.getenv('BOOK_INDEXER_FLUSH_INTERVAL', 1.0))  # 첫 항목 후 최대 대기(초)
+BOOK_INDEXER_MAX_RETRIES = int(os.getenv('BOOK_INDEXER_MAX_RETRIES', 5))
+BOOK_INDEXER_RETRY_BACKOFF = float(os.getenv('BOOK_INDEXER_RETRY_BACKOFF', 0.5))  # 재시도 간격(초, 지수 증가)
+BOOK_INDEXER_QUEUE_SIZE = int(os.getenv('BOOK_INDEXER_QUEUE_SIZE', 10000))
+
+# 인덱싱 최종 실패 항목(dead-letter) 로그
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+        'deadletter': {
+            'class': 'logging.FileHandler',
+            'filename': os.getenv('BOOK_INDEXER_DEADLETTER_LOG', str(BASE_DIR / 'indexer-deadletter.log')),
+            'delay': True,
+        },
+    },
+    'loggers': {
+        'book.indexer.deadletter': {'handlers': ['deadletter', 'console'], 'level': 'ERROR', 'propagate': False},
+    },
+}
+
+# 캐시 설정 (search: 검색 결과 캐시, 백엔드 교체 가능 - 기본은 프로세스 로컬 메모리 LRU)
+# search/listing 캐시의 무효화는 캐시에 저장된 세대 번호 증가(book.cache.GenerationalCache)로 처리하므로
+# 세대 번호도 캐시 백엔드에 있음: 기본 LocMem 은 프로세스별이라 다른 워커의 변경은 TTL 이 지나야 반영됨
+# 여러 워커/서버로 운영할 때는 SEARCH_CACHE_BACKEND/LISTING_CACHE_BACKEND 를 Redis/Memcached 등 공유 백엔드로 설정
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'search': {
+        'BACKEND': os.getenv('SEARCH_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('SEARCH_CACHE_LOCATION', 'book-search'),
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.getenv('SEARCH_CACHE_MAX_ENTRIES', 2000)),  # 초과 시 오래 안 쓰인 항목부터 제거
+        },
+    },
+    'listing': {
+        'BACKEND': os.getenv('LISTING_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('LISTING_CACHE_LOCATION', 'book-listing'),
+    },
+}
+BOOK_SEARCH_CACHE_ALIAS = 'search'
+BOOK_SEARCH_CACHE_TIMEOUT = int(os.getenv('BOOK_SEARCH_CACHE_TIMEOUT', 60))  # 검색 결과 캐시 TTL(초)
+
+# 공개 서적 목록 캐시 (listing: 여러 워커가 공유하려면 Redis/Memcached 등으로 교체, 위 CACHES 참고)
+BOOK_LISTING_CACHE_ALIAS = 'listing'
+BOOK_LISTING_CACHE_PAGES = int(os.getenv('BOOK_LISTING_CACHE_PAGES', 5))  # 앞쪽 몇 페이지까지 캐시할지 (0이면 사용 안 함)
+BOOK_LISTING_CACHE_TIMEOUT = int(os.getenv('BOOK_LISTING_CACHE_TIMEOUT', 30))  # 신선도 TTL(초)
+BOOK_LISTING_CACHE_STALE_TIMEOUT = int(os.getenv('BOOK_LISTING_CACHE_STALE_TIMEOUT', 30))  # 만료 후 재계산 중 이전 값 응답 허용(초)
+BOOK_LISTING_CACHE_LOCK_TIMEOUT = int(os.getenv('BOOK_LISTING_CACHE_LOCK_TIMEOUT', 5))  # 재계산 락 만료/최대 대기(초)
+BOOK_LISTING_CACHE_REFRESH_AHEAD = float(os.getenv('BOOK_LISTING_CACHE_REFRESH_AHEAD', 0))  # TTL 의 이 비율 경과 시 백그라운드 갱신 (0~1, 0이면 사용 안 함)
+
+# 서적 목록 커서 페이지네이션 설정
+BOOK_PAGE_SIZE = int(os.getenv('BOOK_PAGE_SIZE', 20))
+BOOK_MAX_PAGE_SIZE = int(os.getenv('BOOK_MAX_PAGE_SIZE', 100))
+BOOK_EXPORT_CHUNK_SIZE = int(os.getenv('BOOK_EXPORT_CHUNK_SIZE', 1000))  # NDJSON 내보내기 시 한 번에 조회할 행 수
+BOOK_BATCH_MAX_IDS = int(os.getenv('BOOK_BATCH_MAX_IDS', 100))  # 여러 서적 조회/일괄 상태 변경 최대 건수
+
+# 조회수/관심 수 카운터 (프로세스 메모리에 합산 후 일괄 UPDATE)
+BOOK_COUNTER_FLUSH_INTERVAL = float(os.getenv('BOOK_COUNTER_FLUSH_INTERVAL', 5))  # DB 반영 주기(초)
+BOOK_COUNTER_MAX_PENDING = int(os.getenv('BOOK_COUNTER_MAX_PENDING', 10000))  # 이만큼의 서적별 증가분이 모이면 즉시 반영
@@ -0,0 +1,62 @@
+import re
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+# 실행 계획을 확인할 쿼리 (트랜잭션/SAVEPOINT, INSERT 제외)
+EXPLAINABLE = re.compile(r'^\s*(SELECT|UPDATE|DELETE)\b', re.IGNORECASE)
+MAIN_TABLE = re.compile(r'\bFROM\s+["`]?(\w+)["`]?', re.IGNORECASE)
+
+
+class QueryPlanAssertionsMixin:
+    """
+    엔드포인트가 실행한 쿼리마다 EXPLAIN 을 실행해 인덱스를 타는지 검증
+    - 전체 테이블 스캔 (SQLite: 'SCAN 테이블', MySQL: type=ALL)
+    - 인덱스 없는 정렬 (SQLite: 'USE TEMP B-TREE FOR ORDER BY', MySQL: 'Using filesort')
+    """
+
+    def capture_queries(self, request):
+        """request() 실행 중 발생한 쿼리 SQL 목록 (스트리밍 응답은 끝까지 소비)"""
+        with CaptureQueriesContext(connection) as ctx:
+            response = request()
+            if getattr(response, 'streaming', False):
+                b''.join(response.streaming_content)
+        self.assertLess(response.status_code, 400, getattr(response, 'content', b'')[:500])
+        return [query['sql'] for query in ctx.captured_queries if EXPLAINABLE.match(query['sql'])]
+
+    def explain(self, sql):
+        """쿼리 실행 계획 -> [(전체 스캔 여부, 인덱스 없는 정렬 여부, 원문)]"""
+        with connection.cursor() as cursor:
+            if connection.vendor == 'sqlite':
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+                return [
+                    (
+                        bool(re.match(r'^SCAN \S+$', detail)),  # 'SCAN t USING INDEX ...' 은 인덱스 순서 탐색
+                        'USE TEMP B-TREE FOR ORDER BY' in detail,
+                        detail,
+                    )
+                    for *_, detail in cursor.fetchall()
+                ]
+            if connection.vendor == 'mysql':
+                cursor.execute(f'EXPLAIN {sql}')
+                columns = [column[0].lower() for column in cursor.description]
+                rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+                return [
+                    (row['type'] == 'ALL', 'Using filesort' in (row['extra'] or ''), str(row))
+                    for row in rows
+                ]
+        self.skipTest(f'{connection.vendor} 실행 계획 검사는 지원하지 않음')
+
+    def assertIndexedPlans(self, request, allow_sort_on=()):
+        """
+        request() 의 모든 쿼리가 전체 스캔/인덱스 없는 정렬 없이 실행되는지 검증
+        allow_sort_on: 인덱스로 처리할 수 없는 정렬을 허용할 테이블 (범위 스캔 이후 정렬만 허용)
+        """
+        queries = self.capture_queries(request)
+        self.assertTrue(queries, '실행된 쿼리가 없음')
+        for sql in queries:
+            table = MAIN_TABLE.search(sql)
+            for full_scan, filesort, detail in self.explain(sql):
+                self.assertFalse(full_scan, f'전체 테이블 스캔: {detail}\n{sql}')
+                if not (table and table.group(1) in allow_sort_on):
+                    self.assertFalse(filesort, f'인덱스 없는 정렬: {detail}\n{sql}')
+        return queries
@@ -16,15 +16,18 @@
 # """
 from django.contrib import admin
 from django.urls import path, include
-from book.views import BookListCreateView, BookDetailView, BookListByUser, BookSearchView, BookListAllView
+from book.views import BookListCreateView, BookDetailView, BookListByUser, BookSearchView, BookListAllView, ImageUploadView, CacheStatsView, BookSuggestView
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/v1/books/all', BookListAllView.as_view(), name='all-book-list'),
     path('api/v1/books/', BookListCreateView.as_view(), name='book-list-create'),
+    path('api/v1/books/uploads/', ImageUploadView.as_view(), name='book-image-upload'),
     path('api/v1/books/<int:pk>/', BookDetailView.as_view(), name='book-detail'),
     path('api/v1/books/user/', BookListByUser.as_view(), name='book-by-user'),
     path('api/v1/search/', BookSearchView.as_view(), name='search_books'),
+    path('api/v1/search/suggest', BookSuggestView.as_view(), name='search-suggest'),
+    path('api/v1/cache-stats/', CacheStatsView.as_view(), name='cache-stats'),
     path('api/v1/users/', include('users.urls')),
     path('', include('chat.urls')),
 ]
\ No newline at end of file
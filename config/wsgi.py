@@ -14,3 +14,11 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
 application = get_wsgi_application()
+
+# 조회수/관심 수 증가분을 백그라운드에서 주기적으로 DB 반영
+from book.counters import book_counters  # noqa: E402
+from book.search_backends import warm_search_fallback  # noqa: E402
+
+book_counters.start()
+# ES 장애 시 대체할 인메모리 검색 색인을 백그라운드에서 미리 생성 (BOOK_SEARCH_BACKEND='auto')
+warm_search_fallback()
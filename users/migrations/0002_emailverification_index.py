@@ -0,0 +1,17 @@
+# Generated by Django 5.1.3 on 2026-10-18 17:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='emailverification',
+            index=models.Index(fields=['user_email', 'verification_type', 'verification_code'], name='verification_email_idx'),
+        ),
+    ]
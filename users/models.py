@@ -55,6 +55,12 @@ class EmailVerification(models.Model):
     expires_at = models.DateTimeField()
     verification_type = models.CharField(max_length=20, choices=TYPE_CHOICES, default='registration')
 
+    class Meta:
+        indexes = [
+            # 이메일 + 유형/코드로 조회·삭제
+            models.Index(fields=['user_email', 'verification_type', 'verification_code'], name='verification_email_idx'),
+        ]
+
     def __str__(self):
         return f"{self.user_email} - {self.verification_code}"
 
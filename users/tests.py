@@ -1,3 +1,49 @@
+from datetime import timedelta
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from config.testing import QueryPlanAssertionsMixin
+from .models import EmailVerification
 
-# Create your tests here.
+
+class EmailVerificationQueryPlanTests(QueryPlanAssertionsMixin, TestCase):
+    """이메일 인증 API 쿼리가 인덱스로 처리되는지 실행 계획으로 검증"""
+    EMAIL = 'student@tukorea.ac.kr'
+
+    @classmethod
+    def setUpTestData(cls):
+        EmailVerification.objects.bulk_create([
+            EmailVerification(
+                user_email=f'other{n}@tukorea.ac.kr', verification_code=f'CODE{n:02d}',
+                expires_at=timezone.now() + timedelta(minutes=10),
+            )
+            for n in range(30)
+        ])
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def create_code(self, code='ABC123'):
+        EmailVerification.objects.create(
+            user_email=self.EMAIL, verification_code=code, expires_at=timezone.now() + timedelta(minutes=10)
+        )
+        return code
+
+    def test_send_verification_email_plan(self):
+        self.create_code()
+        self.assertIndexedPlans(
+            lambda: self.client.post('/api/v1/users/send-verification-email/', {'school_email': self.EMAIL})
+        )
+
+    def test_verify_code_plan(self):
+        code = self.create_code()
+        self.assertIndexedPlans(lambda: self.client.post(
+            '/api/v1/users/verify-email-code/', {'school_email': self.EMAIL, 'verification_code': code}
+        ))
+
+    def test_register_plan(self):
+        code = self.create_code()
+        self.assertIndexedPlans(lambda: self.client.post('/api/v1/users/register/', {
+            'name': '학생', 'student_id': '2020123456', 'major': '컴퓨터공학과', 'school_email': self.EMAIL,
+            'password': 'password1234', 'verification_code': code,
+        }))